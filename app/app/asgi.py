@@ -9,8 +9,34 @@ https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler as BaseASGIHandler
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
 
-application = get_asgi_application()
+
+class ASGIHandler(BaseASGIHandler):
+    """
+    Resolves requests with `app.urls_asgi`, which routes signup & login
+    to async views (see user/async_views.py)
+    """
+
+    urlconf = "app.urls_asgi"
+
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        if request is not None:
+            request.urlconf = self.urlconf
+        return request, error_response
+
+
+# Same as ``get_asgi_application()`` but with our handler
+django.setup(set_prefix=False)
+
+# ``/api/jobtitle/stream/`` (Server-Sent Events) is served in front of
+# Django's handler, see job/stream.py, and identical concurrent GETs of job
+# titles are joined before they reach it, see job/coalesce.py
+from job.coalesce import CoalescedGets  # noqa: E402
+from job.stream import JobTitleStream  # noqa: E402
+
+application = JobTitleStream(CoalescedGets(ASGIHandler()))
@@ -46,6 +46,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # first, so latency & SQL statistics cover every other middleware as well
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.query_instrumentation_middleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -144,3 +147,176 @@ AUTH_USER_MODEL = "core.user"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
+
+# Cache shared by all worker processes, e.g.
+#   CACHE_BACKEND=django.core.cache.backends.memcached.PyMemcacheCache
+#   CACHE_LOCATION=memcached:11211
+# Without it Django's default local memory cache is per process and the caches
+# which must be shared (RESPONSE_CACHE, SIGNED_AUTH_TOKENS) are disabled
+# (checked by ``manage.py check``, see core/checks.py)
+if os.environ.get("CACHE_BACKEND"):
+    CACHES = {
+        "default": {
+            "BACKEND": os.environ["CACHE_BACKEND"],
+            "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+        }
+    }
+
+# Token -> user cache of `user.authentication.CachedTokenAuthentication`
+TOKEN_AUTH_CACHE = {
+    "MAX_ENTRIES": 10_000,
+    # seconds, also the upper bound for serving a stale user in other worker processes
+    "TTL": 60,
+    # Name of a `CACHES` alias (e.g. "default") to share resolved tokens between processes
+    "CACHE_ALIAS": None,
+}
+
+# Stateless HMAC-signed access/refresh tokens, see user/tokens.py
+SIGNED_AUTH_TOKENS = {
+    # When True `/api/user/token/` issues signed tokens (``Authorization: Bearer ...``)
+    # instead of DB tokens (``Authorization: Token ...``)
+    "ENABLED": False,
+    "ACCESS_TTL": 5 * 60,
+    "REFRESH_TTL": 7 * 24 * 60 * 60,
+    # Cache holding each user's (revocation generation, is_active),
+    # must be shared by all worker processes (see CACHES)
+    "CACHE_ALIAS": "default",
+    "STATE_TTL": 30,
+}
+
+# Password hashing/verification pool, see core/hashing.py
+PASSWORD_HASHING_POOL = {
+    # worker processes, 0 hashes inline on the request thread
+    "WORKERS": 2,
+    # hashes waiting or running at once, above this signup/login return 503
+    "MAX_QUEUE": 32,
+    # seconds to wait for a hash before giving up with 503
+    "TIMEOUT": 10,
+}
+
+# `POST /api/jobtitle/jobtitles/bulk/`
+BULK_JOB_TITLES = {
+    # rows accepted in one request
+    "MAX_ITEMS": 10_000,
+    # rows per INSERT statement
+    "BATCH_SIZE": 1000,
+}
+
+# `GET /api/jobtitle/jobtitles/export/` (job/export.py)
+EXPORT_JOB_TITLES = {
+    # rows per query & per chunk of the streamed response
+    "BATCH_SIZE": 2000,
+}
+
+# Change feed ``/api/jobtitle/jobtitles/changes/?since=`` (see job/changes.py)
+JOB_TITLE_CHANGES = {
+    # changes read per call (``?limit=`` default & maximum)
+    "LIMIT": 500,
+    "MAX_LIMIT": 5000,
+}
+
+# Rendered job title list & detail responses (see job/response_cache.py)
+RESPONSE_CACHE = {
+    # only with a shared cache, see CACHES
+    "ENABLED": bool(os.environ.get("CACHE_BACKEND")),
+    # holds the versions & the shared copies of the responses,
+    # use a cache shared by all worker processes (memcached, redis)
+    "CACHE_ALIAS": "default",
+    "SHARED": True,
+    "TTL": 300,
+    # per-process LRU limits
+    "MAX_ENTRIES": 10_000,
+    "MAX_BYTES": 64 * 2**20,
+}
+
+# Identical concurrent GETs of job titles computed once (see job/coalesce.py)
+SINGLE_FLIGHT = {
+    "ENABLED": True,
+    # seconds a request waits for the identical one in flight
+    # before running on its own
+    "TIMEOUT": 5,
+    # bigger responses aren't shared (ASGI)
+    "MAX_BYTES": 2**20,
+}
+
+# Server-Sent Events ``/api/jobtitle/stream/`` of the ASGI app (see job/stream.py)
+JOB_TITLE_STREAM = {
+    # events kept per client, the oldest are dropped for slow readers
+    "MAX_QUEUED": 100,
+    # seconds between keep-alive comments of an idle stream
+    "HEARTBEAT": 15,
+}
+
+# Per-request SQL statistics (core/middleware.py)
+SQL_INSTRUMENTATION = {
+    # send `X-DB-Queries` & `Server-Timing` response headers
+    "HEADERS": True,
+    # log a warning when the same SELECT runs this many times in one request
+    "N_PLUS_ONE_THRESHOLD": 10,
+}
+
+# `?q=` full-text search of job titles (job/search.py)
+FULL_TEXT_SEARCH = {
+    # posting lists of common words read whole, kept in each process
+    "CACHE_MAX_ENTRIES": 1000,
+    "CACHE_MAX_BYTES": 64 * 2**20,
+}
+
+# `GET /api/jobtitle/suggest/` autocomplete index (job/suggest.py)
+SUGGEST_INDEX = {
+    # directory of the snapshot files mmap-ed by every worker process,
+    # None keeps the index in the memory of each process
+    "PATH": os.environ.get("SUGGEST_INDEX_PATH", str(BASE_DIR / "var" / "suggest")),
+    # largest `?limit=`, top completions precomputed for short prefixes
+    "TOP_K": 50,
+    # prefixes matching more keys than this use the precomputed top completions
+    "SCAN_LIMIT": 1024,
+    # local changes kept before the snapshot is rebuilt
+    "MAX_DELTA": 1000,
+    # seconds before the snapshot is rebuilt anyway (writes of other workers),
+    # by one worker at a time
+    "MAX_AGE": 300,
+    # seconds between checks for a snapshot written by another worker
+    "CHECK_INTERVAL": 1,
+    # (re)build in a background thread instead of the request thread,
+    # `suggest/` has no completions until the first snapshot is built
+    "BACKGROUND": True,
+}
+
+# `GET /api/jobtitle/jobtitles/<id>/similar/` TF-IDF matrix (job/similar.py)
+SIMILAR_JOBS = {
+    # saved postings scored apart before they are merged into the matrix
+    "MAX_DELTA": 5000,
+    # seconds before the matrix is rebuilt from the database (idf, other workers)
+    "MAX_AGE": 3600,
+    # words found in a bigger share of the postings are ignored
+    "MAX_DF": 0.5,
+    # postings read per query while building
+    "BATCH_SIZE": 2000,
+    # (re)build in a background thread instead of the request thread,
+    # `similar/` answers 503 until the first build of the process is done
+    "BACKGROUND": True,
+}
+
+# Near-duplicate job descriptions (job/duplicates.py),
+# run `python manage.py find_duplicates` after changing these
+NEAR_DUPLICATES = {
+    # words per shingle
+    "SHINGLE_SIZE": 3,
+    # MinHash hash functions, signature length
+    "NUM_PERM": 128,
+    # LSH bands of NUM_PERM / BANDS rows, pairs above ~(1 / BANDS) ** (BANDS / NUM_PERM)
+    # Jaccard similarity (0.7 here) are likely to share a bucket
+    "BANDS": 16,
+    # share of equal signature positions for a near-duplicate
+    "THRESHOLD": 0.8,
+}
+
+# `/metrics` Prometheus scrape endpoint (core/metrics.py)
+METRICS = {
+    # ``Authorization: Bearer <token>`` of the scraper, None disables tokens
+    "TOKEN": os.environ.get("METRICS_TOKEN") or None,
+    # addresses or networks (CIDR) allowed without the token, matched against
+    # REMOTE_ADDR so behind a proxy list the proxy only if it's internal
+    "ALLOWED_IPS": ["127.0.0.1", "::1"],
+}
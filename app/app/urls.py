@@ -16,6 +16,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from core.views import metrics
 
 
 urlpatterns = [
@@ -30,4 +31,6 @@ urlpatterns = [
     ),
     path("api/user/", include("user.urls")),
     path("api/jobtitle/", include("job.urls")),
+    # Prometheus scrape endpoint, allowed addresses or token only (METRICS setting)
+    path("metrics", metrics, name="metrics"),
 ]
@@ -0,0 +1,15 @@
+"""
+URL configuration used by the ASGI application (app/asgi.py)
+
+Same as `app.urls` except signup & login, which are served by async views
+that don't block the event loop while passwords are hashed.
+"""
+from django.urls import path, include
+
+from user.async_views import AsyncCreateTokenView, AsyncCreateUserView
+
+urlpatterns = [
+    path("api/user/create/", AsyncCreateUserView.as_view(), name="create"),
+    path("api/user/token/", AsyncCreateTokenView.as_view(), name="token"),
+    path("", include("app.urls")),
+]
@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for the API
+
+Not part of the unit tests - each module is a standalone script, see `common.py`
+"""
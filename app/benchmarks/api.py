@@ -0,0 +1,440 @@
+"""
+Benchmark: HTTP latency & throughput of the user and job title endpoints
+
+Sends real HTTP requests with `--concurrency` clients (threads or asyncio tasks)
+to each scenario and reports p50/p95/p99 latency, throughput and SQL queries
+per request. Without `--base-url` a threaded WSGI server is started in-process
+on a throw-away test database filled by `manage.py seed_data`.
+
+    python -m benchmarks.api --mode threads --concurrency 16 --output run.json
+    python -m benchmarks.api --mode asyncio --baseline baseline.json
+    python -m benchmarks.api --base-url http://localhost:8000 \\
+        --email user1@seed.example.com --password seed@123
+
+With `--baseline` the run exits with status 1 when a scenario got slower
+(p50/p95/p99 or throughput) by more than `--tolerance` or runs more queries.
+Queries per request are read from the ``X-DB-Queries`` response header
+(added by `core.middleware.query_instrumentation_middleware`).
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+from io import StringIO
+from urllib.parse import urlparse
+
+from benchmarks.common import print_table, setup_django, summarize, test_database
+
+SCENARIOS = [
+    "user-create",
+    "user-token",
+    "user-me",
+    "jobtitle-list",
+    "jobtitle-detail",
+    "jobtitle-create",
+]
+
+# Compared against the baseline, lower is better for all of them
+LATENCY_KEYS = ["p50_ms", "p95_ms", "p99_ms"]
+
+
+class Context:
+    """
+    Everything scenarios need: credentials, auth header & existing ids
+    """
+
+    def __init__(self, email, password):
+        self.email = email
+        self.password = password
+        self.run_id = int(time.time())
+        self.auth = {}
+        self.job_title_ids = []
+        self.portal_id = None
+
+
+def scenario_request(name, context, index):
+    """
+    ``(method, path, json body, headers)`` of request number `index` of a scenario
+    """
+    if name == "user-create":
+        email = f"bench-{context.run_id}-{index}@example.com"
+        body = {"email": email, "password": "bench@123", "name": "Bench"}
+        return "POST", "/api/user/create/", body, {}
+    if name == "user-token":
+        body = {"email": context.email, "password": context.password}
+        return "POST", "/api/user/token/", body, {}
+    if name == "user-me":
+        return "GET", "/api/user/me/", None, context.auth
+    if name == "jobtitle-list":
+        return "GET", "/api/jobtitle/jobtitles/", None, context.auth
+    if name == "jobtitle-detail":
+        pk = context.job_title_ids[index % len(context.job_title_ids)]
+        return "GET", f"/api/jobtitle/jobtitles/{pk}/", None, context.auth
+    if name == "jobtitle-create":
+        body = {
+            "title": f"Bench {index}",
+            "portal": context.portal_id,
+            "job_description": {"role": "Developer", "description_text": "Bench"},
+        }
+        return "POST", "/api/jobtitle/jobtitles/", body, context.auth
+    raise ValueError(f"Unknown scenario {name}")
+
+
+def encode(body, headers):
+    headers = {"Accept": "application/json", **headers}
+    if body is None:
+        return None, headers
+    headers["Content-Type"] = "application/json"
+    return json.dumps(body).encode(), headers
+
+
+class ThreadClient:
+    """
+    Blocking client, one keep-alive connection per thread
+    """
+
+    def __init__(self, base_url):
+        url = urlparse(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.local = threading.local()
+
+    def request(self, method, path, body=None, headers=None):
+        """
+        Returns ``(status, headers, body)``
+        """
+        if not hasattr(self.local, "connection"):
+            self.local.connection = HTTPConnection(self.host, self.port, timeout=60)
+        payload, headers = encode(body, headers or {})
+        connection = self.local.connection
+        try:
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            return response.status, dict(response.getheaders()), response.read()
+        except Exception:
+            # start over with a fresh connection next time
+            connection.close()
+            del self.local.connection
+            raise
+
+
+class AsyncClient:
+    """
+    Minimal HTTP/1.1 client on asyncio streams (one connection per request)
+    """
+
+    def __init__(self, base_url):
+        url = urlparse(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+
+    async def request(self, method, path, body=None, headers=None):
+        payload, headers = encode(body, headers or {})
+        headers = {
+            "Host": f"{self.host}:{self.port}",
+            "Connection": "close",
+            "Content-Length": str(len(payload or b"")),
+            **headers,
+        }
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            head = f"{method} {path} HTTP/1.1\r\n" + "".join(
+                f"{key}: {value}\r\n" for key, value in headers.items()
+            )
+            writer.write(head.encode("latin-1") + b"\r\n" + (payload or b""))
+            await writer.drain()
+            raw = await reader.read()
+        finally:
+            writer.close()
+
+        head, _, content = raw.partition(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        response_headers = dict(line.split(": ", 1) for line in header_lines)
+        return int(status_line.split()[1]), response_headers, content
+
+
+def record(samples, errors, queries, start, response):
+    status, headers, _ = response
+    samples.append(time.perf_counter() - start)
+    if status >= 400:
+        errors.append(status)
+    header = {key.lower(): value for key, value in headers.items()}.get("x-db-queries")
+    if header is not None:
+        queries.append(int(header))
+
+
+def run_threads(base_url, build, requests, concurrency):
+    """
+    `concurrency` threads send `requests` requests in total
+    Returns ``(latency samples, error statuses, query counts, wall seconds)``
+    """
+    client = ThreadClient(base_url)
+    counter = itertools.count()
+    lock = threading.Lock()
+    samples, errors, queries = [], [], []
+
+    def worker():
+        while True:
+            with lock:
+                index = next(counter)
+            if index >= requests:
+                return
+            start = time.perf_counter()
+            try:
+                response = client.request(*build(index))
+            except Exception as exc:
+                errors.append(type(exc).__name__)
+                continue
+            record(samples, errors, queries, start, response)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return samples, errors, queries, time.perf_counter() - start
+
+
+def run_asyncio(base_url, build, requests, concurrency):
+    """
+    Same as `run_threads` with `concurrency` tasks on one event loop
+    """
+    client = AsyncClient(base_url)
+    counter = itertools.count()
+    samples, errors, queries = [], [], []
+
+    async def worker():
+        # no lock needed, tasks only switch at `await`
+        while (index := next(counter)) < requests:
+            start = time.perf_counter()
+            try:
+                response = await client.request(*build(index))
+            except Exception as exc:
+                errors.append(type(exc).__name__)
+                continue
+            record(samples, errors, queries, start, response)
+
+    async def main():
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    return samples, errors, queries, time.perf_counter() - start
+
+
+def prepare(base_url, context):
+    """
+    Log in and find job titles & a portal of the benchmark user over HTTP
+    """
+    client = ThreadClient(base_url)
+
+    status, _, body = client.request(
+        "POST",
+        "/api/user/token/",
+        {"email": context.email, "password": context.password},
+    )
+    if status != 200:
+        raise SystemExit(f"Login failed ({status}): {body[:200]}")
+    data = json.loads(body)
+    # Signed tokens (user/tokens.py) come with a refresh token
+    keyword = "Bearer" if "refresh" in data else "Token"
+    context.auth = {"Authorization": f"{keyword} {data['token']}"}
+
+    _, _, body = client.request(
+        "GET", "/api/jobtitle/jobtitles/?page_size=500", None, context.auth
+    )
+    context.job_title_ids = [row["id"] for row in json.loads(body)["results"]]
+    if not context.job_title_ids:
+        raise SystemExit("Benchmark user has no job titles")
+
+    _, _, body = client.request(
+        "GET",
+        f"/api/jobtitle/jobtitles/{context.job_title_ids[0]}/",
+        None,
+        context.auth,
+    )
+    context.portal_id = json.loads(body)["portal"]
+
+
+def run(args, base_url, context):
+    runner = run_threads if args.mode == "threads" else run_asyncio
+    results = {}
+    for name in args.scenarios:
+
+        def build(index, name=name):
+            return scenario_request(name, context, index)
+
+        # warm up connections, caches & the hashing pool, not recorded
+        runner(base_url, lambda index: build(-1 - index), args.warmup, args.concurrency)
+
+        samples, errors, queries, seconds = runner(
+            base_url, build, args.requests, args.concurrency
+        )
+        results[name] = {
+            **summarize(samples),
+            "errors": len(errors),
+            "throughput_rps": round(len(samples) / seconds, 1) if seconds else 0.0,
+            "queries_per_request": round(sum(queries) / len(queries), 2)
+            if queries
+            else None,
+        }
+    return results
+
+
+def compare(baseline, results, tolerance):
+    """
+    Returns list of regressions of `results` against `baseline` results
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for key in LATENCY_KEYS:
+            if current[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {previous[key]} -> {current[key]}")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput_rps "
+                f"{previous['throughput_rps']} -> {current['throughput_rps']}"
+            )
+        if (
+            current["queries_per_request"] is not None
+            and previous["queries_per_request"] is not None
+            and current["queries_per_request"] > previous["queries_per_request"]
+        ):
+            regressions.append(
+                f"{name}: queries_per_request "
+                f"{previous['queries_per_request']} -> {current['queries_per_request']}"
+            )
+        if current["errors"] > previous["errors"]:
+            regressions.append(
+                f"{name}: errors {previous['errors']} -> {current['errors']}"
+            )
+    return regressions
+
+
+def serve():
+    """
+    Start threaded WSGI server (like `runserver`) on a free port, returns its url
+    """
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.core.servers.basehttp import (
+        ThreadedWSGIServer,
+        WSGIRequestHandler,
+    )
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    # test environment runs with DEBUG off, where localhost isn't allowed implicitly
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "127.0.0.1"]
+
+    server = ThreadedWSGIServer(
+        ("127.0.0.1", 0), QuietHandler, allow_reuse_address=True
+    )
+    server.set_app(WSGIHandler())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=["threads", "asyncio"], default="threads")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--base-url", help="benchmark a running server instead")
+    parser.add_argument("--email", help="user to log in as (with --base-url)")
+    parser.add_argument("--password", default="seed@123")
+    parser.add_argument("--seed-job-titles", type=int, default=20_000)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of a previous run to compare")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.base_url:
+        if not args.email:
+            parser.error("--email is required with --base-url")
+        context = Context(args.email, args.password)
+        prepare(args.base_url, context)
+        results = run(args, args.base_url, context)
+    else:
+        setup_django()
+
+        from django.core.management import call_command
+        from core.models import User
+
+        with test_database():
+            call_command(
+                "seed_data",
+                users=max(1, args.seed_job_titles // 100),
+                job_titles=args.seed_job_titles,
+                applicants=args.seed_job_titles // 10,
+                password=args.password,
+                stdout=StringIO(),
+            )
+            # first seeded user owns the most job titles
+            email = User.objects.order_by("id").values_list("email", flat=True)[0]
+            base_url, server = serve()
+            try:
+                context = Context(email, args.password)
+                prepare(base_url, context)
+                results = run(args, base_url, context)
+            finally:
+                server.shutdown()
+                server.server_close()
+
+    report = {
+        "meta": {
+            "mode": args.mode,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "base_url": args.base_url or "in-process",
+            "seed_job_titles": None if args.base_url else args.seed_job_titles,
+            "python": platform.python_version(),
+            "timestamp": int(time.time()),
+        },
+        "results": results,
+    }
+
+    print(f"{args.requests} requests per scenario, {args.concurrency} {args.mode}")
+    print_table(
+        ["scenario", "p50 ms", "p95 ms", "p99 ms", "req/s", "queries/req", "errors"],
+        [
+            [
+                name,
+                row["p50_ms"],
+                row["p95_ms"],
+                row["p99_ms"],
+                row["throughput_rps"],
+                row["queries_per_request"],
+                row["errors"],
+            ]
+            for name, row in results.items()
+        ],
+    )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(json.load(file)["results"], results, args.tolerance)
+        if regressions:
+            print("\nRegressions against", args.baseline)
+            print("\n".join(regressions))
+            sys.exit(1)
+        print("\nNo regressions against", args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: TokenAuthentication vs CachedTokenAuthentication
+
+Sends `--requests` authenticated GET requests to `/api/user/me/` and to the
+job title list with each authentication class and reports requests/sec and
+SQL queries per request.
+
+    python -m benchmarks.auth --requests 5000
+"""
+
+import argparse
+import time
+
+from benchmarks.common import print_table, setup_django, test_database
+
+
+def run(view, path, token, requests):
+    """
+    Returns (requests/sec, queries per request) for `requests` calls of `view`
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIRequestFactory
+
+    factory = APIRequestFactory()
+    auth_header = f"Token {token.key}"
+
+    start = time.perf_counter()
+    with CaptureQueriesContext(connection) as context:
+        for _ in range(requests):
+            request = factory.get(path, HTTP_AUTHORIZATION=auth_header)
+            view(request).render()
+    elapsed = time.perf_counter() - start
+
+    return round(requests / elapsed, 1), round(len(context) / requests, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+    from rest_framework.authentication import TokenAuthentication
+    from rest_framework.authtoken.models import Token
+    from job.views import JobTitleViewSet
+    from user.authentication import CachedTokenAuthentication, token_cache
+    from user.views import ManageUserView
+
+    endpoints = {
+        "/api/user/me/": lambda classes: ManageUserView.as_view(
+            authentication_classes=classes
+        ),
+        "/api/jobtitle/jobtitles/": lambda classes: JobTitleViewSet.as_view(
+            {"get": "list"}, authentication_classes=classes
+        ),
+    }
+
+    with test_database():
+        user = get_user_model().objects.create_user(
+            email="benchmark@example.com", password="benchmark"
+        )
+        token = Token.objects.create(user=user)
+
+        rows = []
+        for path, make_view in endpoints.items():
+            for auth_class in (TokenAuthentication, CachedTokenAuthentication):
+                token_cache.clear()
+                view = make_view([auth_class])
+                rps, queries = run(view, path, token, args.requests)
+                rows.append([path, auth_class.__name__, rps, queries])
+
+    print(f"{args.requests} requests per row (single thread, in-process)")
+    print_table(["endpoint", "authentication", "req/s", "queries/req"], rows)
+
+
+if __name__ == "__main__":
+    main()
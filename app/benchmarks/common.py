@@ -0,0 +1,92 @@
+"""
+Shared helpers for benchmark scripts
+
+Benchmarks are plain python modules run from the Django project root
+(directory with `manage.py`) like
+    python -m benchmarks.pagination --rows 200000
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+
+def setup_django():
+    """
+    Configure settings & app registry so ORM can be used outside manage.py
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database(keepdb=False):
+    """
+    Create a throw-away test database (same as `manage.py test` does)
+    so benchmarks never touch real data and always start from an empty table
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, keepdb=keepdb
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+
+
+def timed(func, *args, **kwargs):
+    """
+    Call `func` and return ``(result, seconds taken)``
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def percentile(samples, pct):
+    """
+    Nearest-rank percentile of `samples` (pct between 0 and 100)
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """
+    Summary statistics in milliseconds for a list of durations in seconds
+    """
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+    }
+
+
+def print_table(headers, rows):
+    """
+    Print rows as a fixed width text table
+    """
+    rows = [[str(cell) for cell in row] for row in rows]
+    widths = [
+        max(len(str(header)), *(len(row[index]) for row in rows))
+        if rows
+        else len(str(header))
+        for index, header in enumerate(headers)
+    ]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(cell.ljust(w) for cell, w in zip(row, widths)))
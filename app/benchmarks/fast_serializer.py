@@ -0,0 +1,112 @@
+"""
+Benchmark: DRF ModelSerializer vs compiled read-only serializer
+
+Fills a throw-away test database with `seed_data` and serializes `--rows`
+postings of the user owning the most of them, with the ModelSerializer
+(model instances, field machinery) and with its compiled form
+(``values_list()`` tuples, see job/fastpath.py). Measured with & without
+the query and the JSON rendering.
+
+    python -m benchmarks.fast_serializer --rows 10000
+"""
+
+import argparse
+from io import StringIO
+
+from benchmarks.common import (
+    print_table,
+    setup_django,
+    summarize,
+    test_database,
+    timed,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+    from django.db.models import Count
+    from rest_framework import serializers
+    from rest_framework.renderers import JSONRenderer
+
+    from core.models import JobTitle
+    from job.fastpath import CompiledSerializer
+    from job.serializers import JobTitleSerializer
+
+    class JobTitleRowSerializer(serializers.ModelSerializer):
+        # wider row, datetimes & FK ids like the export
+        class Meta:
+            model = JobTitle
+            fields = ["id", "title", "last_updated", "portal", "job_description"]
+
+    with test_database():
+        call_command(
+            "seed_data",
+            users=args.users,
+            job_titles=args.rows * args.users * 2,
+            applicants=0,
+            stdout=StringIO(),
+        )
+        user_id = (
+            JobTitle.objects.values_list("user")
+            .annotate(total=Count("id"))
+            .order_by("-total")
+            .first()[0]
+        )
+        queryset = JobTitle.objects.filter(user_id=user_id).order_by("-id")
+        renderer = JSONRenderer()
+
+        rows = []
+        for serializer_class in (JobTitleSerializer, JobTitleRowSerializer):
+            compiled = CompiledSerializer(serializer_class)
+            instances = list(queryset[: args.rows])
+            tuples = list(compiled.values_list(queryset)[: args.rows])
+            assert (
+                compiled.serialize(tuples)
+                == serializer_class(instances, many=True).data
+            )
+
+            cases = {
+                "serialize": (
+                    lambda: serializer_class(instances, many=True).data,
+                    lambda: compiled.serialize(tuples),
+                ),
+                "query + serialize + render": (
+                    lambda: renderer.render(
+                        serializer_class(list(queryset[: args.rows]), many=True).data
+                    ),
+                    lambda: renderer.render(
+                        compiled.serialize(compiled.values_list(queryset)[: args.rows])
+                    ),
+                ),
+            }
+            for case, (drf, fast) in cases.items():
+                drf_stats = summarize([timed(drf)[1] for _ in range(args.repeat)])
+                fast_stats = summarize([timed(fast)[1] for _ in range(args.repeat)])
+                rows.append(
+                    [
+                        serializer_class.__name__,
+                        case,
+                        drf_stats["p50_ms"],
+                        fast_stats["p50_ms"],
+                        f"{args.rows / fast_stats['p50_ms'] * 1000:,.0f}",
+                        f"{drf_stats['p50_ms'] / fast_stats['p50_ms']:.1f}x",
+                    ]
+                )
+
+    print(f"{args.rows} rows per response, median of {args.repeat} runs")
+    print_table(
+        ["serializer", "measured", "DRF ms", "compiled ms", "rows/s", "speedup"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
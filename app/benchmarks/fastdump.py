@@ -0,0 +1,109 @@
+"""
+Benchmark: `fastdump`/`fastload` against `dumpdata`/`loaddata` of the core tables
+
+Fills a throw-away test database with `seed_data` (the default is ~5M rows:
+users, portals, job descriptions, job titles & applicants), dumps the `core`
+app with both commands, then flushes and loads each dump back.
+
+    python -m benchmarks.fastdump --job-titles 2400000 --users 100000
+
+`loaddata` runs with the signal receivers disconnected, otherwise every row
+would also be indexed (search, duplicates, ...) and it would be even slower.
+"""
+
+import argparse
+import os
+import tempfile
+from contextlib import contextmanager
+from io import StringIO
+
+from benchmarks.common import print_table, setup_django, test_database, timed
+
+
+def size_of(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+@contextmanager
+def signals_disconnected():
+    from django.db.models import signals
+
+    saved = {}
+    for signal in (signals.pre_save, signals.post_save):
+        saved[signal] = signal.receivers
+        signal.receivers = []
+        signal.sender_receivers_cache.clear()
+    try:
+        yield
+    finally:
+        for signal, receivers in saved.items():
+            signal.receivers = receivers
+            signal.sender_receivers_cache.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--job-titles", type=int, default=2_400_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--applicants", type=int, default=50_000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+
+    from core import fastdump
+
+    def flush():
+        call_command("flush", interactive=False, verbosity=0)
+
+    rows = []
+    with test_database(), tempfile.TemporaryDirectory() as directory:
+        call_command(
+            "seed_data",
+            users=args.users,
+            job_titles=args.job_titles,
+            applicants=args.applicants,
+            stdout=StringIO(),
+        )
+        fixture = os.path.join(directory, "core.json")
+        dump_path = os.path.join(directory, "fastdump")
+
+        _, dumpdata_seconds = timed(
+            call_command, "dumpdata", "core", output=fixture, verbosity=0
+        )
+        tables, fastdump_seconds = timed(fastdump.dump, dump_path)
+        total = sum(count for _, count in tables)
+
+        flush()
+        with signals_disconnected():
+            _, loaddata_seconds = timed(call_command, "loaddata", fixture, verbosity=0)
+        flush()
+        _, fastload_seconds = timed(fastdump.load, dump_path)
+
+        for name, path, dump_seconds, load_seconds in (
+            ("dumpdata/loaddata", fixture, dumpdata_seconds, loaddata_seconds),
+            ("fastdump/fastload", dump_path, fastdump_seconds, fastload_seconds),
+        ):
+            rows.append(
+                [
+                    name,
+                    f"{size_of(path) / 2**20:.1f}",
+                    f"{dump_seconds:.1f}",
+                    f"{total / dump_seconds:.0f}",
+                    f"{load_seconds:.1f}",
+                    f"{total / load_seconds:.0f}",
+                ]
+            )
+
+    print(f"{total} rows in {len(tables)} tables")
+    print_table(
+        ["commands", "size MB", "dump s", "dump rows/s", "load s", "load rows/s"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark: cursor pagination vs LIMIT/OFFSET on JobTitle list endpoint
+
+Fills a throw-away test database with `--rows` job titles for one user and
+measures list latency at increasing page depths. With cursors the latency
+should stay flat, with OFFSET it grows linearly with the depth.
+
+    python -m benchmarks.pagination --rows 200000 --page-size 50
+"""
+
+import argparse
+
+from benchmarks.common import (
+    print_table,
+    setup_django,
+    summarize,
+    test_database,
+    timed,
+)
+
+
+def seed(user, rows, batch_size=5000):
+    """
+    Bulk insert `rows` job titles (with their 1:1 description) for `user`
+    Primary keys are assigned here because MySQL doesn't return them from bulk_create
+    """
+    from django.utils import timezone
+    from core.models import JobDescription, JobTitle, Portal
+
+    portal = Portal.objects.create(user=user, name="Benchmark", description="")
+    now = timezone.now()
+    for start in range(1, rows + 1, batch_size):
+        ids = range(start, min(start + batch_size, rows + 1))
+        JobDescription.objects.bulk_create(
+            JobDescription(
+                id=pk, user=user, role="Developer", description_text="Benchmark"
+            )
+            for pk in ids
+        )
+        JobTitle.objects.bulk_create(
+            JobTitle(
+                id=pk,
+                user=user,
+                title=f"Job {pk}",
+                last_updated=now,
+                portal=portal,
+                job_description_id=pk,
+            )
+            for pk in ids
+        )
+
+
+def measure(view, user, params, repeat):
+    """
+    Latency samples for `repeat` GET requests against `view` with query `params`
+    """
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    factory = APIRequestFactory()
+    samples = []
+    response = None
+    for _ in range(repeat):
+        request = factory.get("/api/jobtitle/jobtitles/", params)
+        force_authenticate(request, user=user)
+        response, seconds = timed(lambda: view(request).render())
+        samples.append(seconds)
+    return samples, response
+
+
+def cursor_at_depths(view, user, page_size, depths):
+    """
+    Walk `next` cursors page by page and remember the cursor of each wanted depth
+    """
+    from urllib.parse import parse_qs, urlparse
+
+    cursors = {1: None}
+    params = {"page_size": page_size}
+    for page in range(2, max(depths) + 1):
+        _, response = measure(view, user, params, repeat=1)
+        next_url = response.data["next"]
+        if next_url is None:
+            break
+        params = {
+            key: value[0] for key, value in parse_qs(urlparse(next_url).query).items()
+        }
+        cursors[page] = params["cursor"]
+    return cursors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--depths", type=int, nargs="+", default=[1, 10, 100, 500, 1000]
+    )
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+    from rest_framework.pagination import LimitOffsetPagination
+    from job.views import JobTitleViewSet
+
+    with test_database():
+        user = get_user_model().objects.create_user(
+            email="benchmark@example.com", password="benchmark"
+        )
+        seed(user, args.rows)
+        depths = [d for d in args.depths if (d - 1) * args.page_size < args.rows]
+
+        cursor_view = JobTitleViewSet.as_view({"get": "list"})
+        offset_view = JobTitleViewSet.as_view(
+            {"get": "list"}, pagination_class=LimitOffsetPagination
+        )
+        cursors = cursor_at_depths(cursor_view, user, args.page_size, depths)
+
+        rows = []
+        for depth in depths:
+            params = {"page_size": args.page_size}
+            if cursors.get(depth):
+                params["cursor"] = cursors[depth]
+            cursor_stats = summarize(measure(cursor_view, user, params, args.repeat)[0])
+
+            params = {"limit": args.page_size, "offset": (depth - 1) * args.page_size}
+            offset_stats = summarize(measure(offset_view, user, params, args.repeat)[0])
+
+            rows.append(
+                [
+                    depth,
+                    cursor_stats["p50_ms"],
+                    cursor_stats["p95_ms"],
+                    offset_stats["p50_ms"],
+                    offset_stats["p95_ms"],
+                ]
+            )
+
+    print(f"{args.rows} rows, {args.page_size} per page, {args.repeat} requests each")
+    print_table(
+        ["page", "cursor p50 ms", "cursor p95 ms", "offset p50 ms", "offset p95 ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
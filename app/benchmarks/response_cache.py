@@ -0,0 +1,132 @@
+"""
+Benchmark: job title list & detail with and without the response cache
+
+Fills a throw-away test database with `seed_data` and replays the same
+read-heavy traffic (`--requests` GETs, `--detail-share` of them detail views,
+popular postings requested much more often) for the user owning the most
+postings, once with ``RESPONSE_CACHE["ENABLED"] = False`` and once with the
+cache (see job/response_cache.py). One write every `--write-every` requests
+invalidates the user's list.
+
+    python -m benchmarks.response_cache --job-titles 200000 --requests 5000
+"""
+
+import argparse
+import random
+from io import StringIO
+
+from benchmarks.common import (
+    print_table,
+    setup_django,
+    summarize,
+    test_database,
+    timed,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--job-titles", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--detail-share", type=float, default=0.8)
+    parser.add_argument("--write-every", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+    from django.db.models import Count
+    from django.test import override_settings
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from core.models import JobTitle, User
+    from job.response_cache import response_cache
+    from job.views import JobTitleViewSet
+
+    list_view = JobTitleViewSet.as_view({"get": "list"})
+    detail_view = JobTitleViewSet.as_view(
+        {"get": "retrieve", "patch": "partial_update"}
+    )
+    factory = APIRequestFactory()
+
+    with test_database():
+        call_command(
+            "seed_data",
+            users=args.users,
+            job_titles=args.job_titles,
+            applicants=0,
+            stdout=StringIO(),
+        )
+        user_id, owned = (
+            JobTitle.objects.values_list("user")
+            .annotate(total=Count("id"))
+            .order_by("-total")
+            .first()
+        )
+        user = User.objects.get(pk=user_id)
+        ids = list(
+            JobTitle.objects.filter(user=user)
+            .order_by("-id")
+            .values_list("id", flat=True)[:1000]
+        )
+
+        def traffic():
+            rng = random.Random(args.seed)
+            for number in range(args.requests):
+                if number and number % args.write_every == 0:
+                    yield "write", ids[0]
+                elif rng.random() < args.detail_share:
+                    # popular postings get most of the views
+                    yield "detail", ids[
+                        min(len(ids) - 1, int(len(ids) * rng.random() ** 4))
+                    ]
+                else:
+                    yield "list", None
+
+        def replay():
+            samples = {"list": [], "detail": []}
+            for kind, pk in traffic():
+                if kind == "write":
+                    request = factory.patch(
+                        f"/api/jobtitle/jobtitles/{pk}/",
+                        {"title": f"Title {len(samples['detail'])}"[:25]},
+                        format="json",
+                    )
+                    force_authenticate(request, user=user)
+                    detail_view(request, pk=pk).render()
+                    continue
+                if kind == "list":
+                    request = factory.get("/api/jobtitle/jobtitles/")
+                    force_authenticate(request, user=user)
+                    _, seconds = timed(lambda: list_view(request).render())
+                else:
+                    request = factory.get(f"/api/jobtitle/jobtitles/{pk}/")
+                    force_authenticate(request, user=user)
+                    _, seconds = timed(lambda: detail_view(request, pk=pk).render())
+                samples[kind].append(seconds)
+            return samples
+
+        rows = []
+        for name, enabled in (("no cache", False), ("cache", True)):
+            response_cache.clear()
+            with override_settings(RESPONSE_CACHE={"ENABLED": enabled}):
+                samples, seconds = timed(replay)
+            for kind, durations in samples.items():
+                stats = summarize(durations)
+                rows.append(
+                    [name, kind, stats["count"], stats["p50_ms"], stats["p95_ms"]]
+                )
+            rows.append(
+                [name, "all", args.requests, "", f"{args.requests / seconds:.0f} req/s"]
+            )
+
+        stats = response_cache.stats()
+
+    print(f"user with most postings owns {owned}, local tier {stats}")
+    print_table(["cache", "view", "requests", "p50 ms", "p95 ms / throughput"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark: full-text search (``?q=``) over seeded job postings
+
+Fills a throw-away test database with `seed_data`, builds the inverted index
+and measures `job.search.search` plus the whole list request for the user
+owning the most postings (worst case, longest posting lists), for every
+`--max-term-postings` (postings of a term read block by block before the rest
+is read whole & cached, job/search.py). ``cold`` searches start with an
+empty posting list cache, ``warm`` ones find the long lists cached. Every
+first page is checked against the exhaustive ranking.
+
+    python -m benchmarks.search --job-titles 1000000
+"""
+
+import argparse
+from io import StringIO
+
+from benchmarks.common import (
+    print_table,
+    setup_django,
+    summarize,
+    test_database,
+    timed,
+)
+
+QUERIES = [
+    "python",
+    "senior python developer",
+    "django rest apis",
+    "kubernetes aws monitoring",
+    "rust",
+    "data engineer kafka pipelines",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--job-titles", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-term-postings", type=int, nargs="+")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+    from django.db.models import Count
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from core.models import JobTitle, JobTitleSearchTerm, User
+    from job import search
+    from job.views import JobTitleViewSet
+
+    with test_database():
+        call_command(
+            "seed_data",
+            users=args.users,
+            job_titles=args.job_titles,
+            applicants=0,
+            stdout=StringIO(),
+        )
+        indexed, seconds = timed(search.rebuild)
+        print(
+            f"Indexed {indexed} postings ({JobTitleSearchTerm.objects.count()} terms)"
+            f" in {seconds:.1f}s"
+        )
+
+        user_id, owned = (
+            JobTitle.objects.values_list("user")
+            .annotate(total=Count("id"))
+            .order_by("-total")
+            .first()
+        )
+        user = User.objects.get(pk=user_id)
+
+        view = JobTitleViewSet.as_view({"get": "list"})
+        factory = APIRequestFactory()
+
+        rows = []
+        cases = [
+            (max_term_postings, query)
+            for max_term_postings in args.max_term_postings
+            or [search.MAX_TERM_POSTINGS]
+            for query in QUERIES
+        ]
+        for max_term_postings, query in cases:
+            search.MAX_TERM_POSTINGS = max_term_postings
+            # a page as long as every posting reads every list whole
+            ranked = search.search(user, query, limit=owned)
+            assert search.search(user, query) == ranked[:50], query
+
+            def cold():
+                search.clear_cache()
+                return search.search(user, query)
+
+            cold_stats = summarize([timed(cold)[1] for _ in range(args.repeat)])
+            warm_stats = summarize(
+                [timed(search.search, user, query)[1] for _ in range(args.repeat)]
+            )
+
+            samples = []
+            for _ in range(args.repeat):
+                request = factory.get("/api/jobtitle/jobtitles/", {"q": query})
+                force_authenticate(request, user=user)
+                samples.append(timed(lambda: view(request).render())[1])
+            request_stats = summarize(samples)
+
+            rows.append(
+                [
+                    query,
+                    max_term_postings,
+                    len(ranked),
+                    cold_stats["p50_ms"],
+                    cold_stats["p95_ms"],
+                    warm_stats["p50_ms"],
+                    warm_stats["p95_ms"],
+                    request_stats["p50_ms"],
+                    request_stats["p95_ms"],
+                ]
+            )
+
+    print(f"user with most postings owns {owned}, {args.repeat} runs per query")
+    print_table(
+        [
+            "query",
+            "max term postings",
+            "matches",
+            "cold p50",
+            "cold p95",
+            "warm p50",
+            "warm p95",
+            "request p50",
+            "request p95",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
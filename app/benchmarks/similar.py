@@ -0,0 +1,95 @@
+"""
+Benchmark: "similar jobs" scoring (job/similar.py) at 100k and 1M postings
+
+Builds the TF-IDF matrix from synthetic postings (Zipf distributed words,
+like real job texts a few words are in most postings) without a database,
+then times `SimilarJobs.similar` for random postings with an empty delta and
+with a full one (``MAX_DELTA`` saved postings not merged yet).
+
+    python -m benchmarks.similar --postings 100000 1000000
+"""
+
+import argparse
+from collections import Counter
+
+from benchmarks.common import print_table, setup_django, summarize, timed
+
+
+def documents(count, vocabulary, words, users, seed):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    for pk in range(1, count + 1):
+        terms = rng.zipf(1.3, size=words) % vocabulary
+        yield pk, int(rng.integers(users)), Counter(f"w{term}" for term in terms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--postings", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--words", type=int, default=40, help="words per posting")
+    parser.add_argument("--users", type=int, default=1, help="1 = worst case")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.test.utils import override_settings
+    from job import similar
+
+    rows = []
+    for count in args.postings:
+        source = lambda: documents(  # noqa: E731
+            count, args.vocabulary, args.words, args.users, seed=1
+        )
+        index = similar.SimilarJobs(source)
+        _, build_seconds = timed(index.rebuild)
+        matrix = index.matrix
+        megabytes = (
+            matrix.rows.nbytes + matrix.values.nbytes + matrix.indptr.nbytes
+        ) / 2**20
+
+        queries = list(
+            documents(args.repeat, args.vocabulary, args.words, args.users, seed=2)
+        )
+
+        def run():
+            return summarize(
+                [
+                    timed(index.rank, terms, owner, pk, args.k)[1]
+                    for pk, owner, terms in queries
+                ]
+            )
+
+        empty = run()
+        max_delta = similar.get_config()["MAX_DELTA"]
+        with override_settings(SIMILAR_JOBS={"MAX_DELTA": max_delta + 1}):
+            for pk, owner, document in documents(
+                max_delta, args.vocabulary, args.words, args.users, seed=3
+            ):
+                index.change(count + pk, (owner, document))
+        full = run()
+
+        for delta, stats in ((0, empty), (max_delta, full)):
+            rows.append(
+                [
+                    count,
+                    matrix.rows.size,
+                    f"{megabytes:.0f}",
+                    f"{build_seconds:.1f}",
+                    delta,
+                    stats["p50_ms"],
+                    stats["p95_ms"],
+                ]
+            )
+
+    print(f"{args.words} words per posting, {args.repeat} queries, top {args.k}")
+    print_table(
+        ["postings", "non-zeros", "MB", "build s", "delta", "p50 ms", "p95 ms"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,15 @@ from django.contrib import admin  # noqa
 # Register your models here.
 from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from core.models import JobTitle, JobDescription, Applicant, Portal
+from django.db.models import Count, OuterRef, Subquery
+from core.models import (
+    JobTitle,
+    JobDescription,
+    JobDescriptionSignature,
+    Applicant,
+    Portal,
+)
+from job import duplicates
 
 # TODO
 # refer
@@ -56,8 +64,48 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
+class JobDescriptionSignatureAdmin(admin.ModelAdmin):
+    """
+    Near-duplicate clusters of job descriptions (see job/duplicates.py),
+    searching a cluster id lists the members of that cluster
+    """
+
+    list_display = ("job_description", "user", "cluster", "cluster_size")
+    list_select_related = ("job_description", "user")
+    search_fields = ("=cluster", "=job_description__id")
+    ordering = ("user", "-cluster", "job_description")
+    readonly_fields = ("job_description", "user", "cluster")
+    exclude = ("signature",)
+    actions = ["recompute"]
+
+    def get_queryset(self, request):
+        sizes = (
+            JobDescriptionSignature.objects.filter(
+                user=OuterRef("user"), cluster=OuterRef("cluster")
+            )
+            .values("cluster")
+            .annotate(size=Count("job_description"))
+            .values("size")
+        )
+        return super().get_queryset(request).annotate(cluster_size=Subquery(sizes))
+
+    @admin.display(ordering="cluster_size")
+    def cluster_size(self, obj):
+        return obj.cluster_size
+
+    @admin.action(description=_("Check selected descriptions for duplicates again"))
+    def recompute(self, request, queryset):
+        duplicates.index_descriptions(
+            JobDescription.objects.filter(pk__in=queryset.values("job_description"))
+        )
+
+    def has_add_permission(self, request):
+        return False
+
+
 admin.site.register(get_user_model(), UserAdmin)  # registering the custom user model
 admin.site.register(Portal)
 admin.site.register(JobDescription)
 admin.site.register(JobTitle)
 admin.site.register(Applicant)
+admin.site.register(JobDescriptionSignature, JobDescriptionSignatureAdmin)
@@ -0,0 +1,41 @@
+"""
+System checks shared by the apps, run by ``manage.py check``, ``runserver``,
+``migrate`` & ``test`` before anything else
+
+TODO - Refer
+https://docs.djangoproject.com/en/4.1/topics/checks/
+"""
+
+from django.conf import settings
+from django.core import checks
+
+# entries of these cache backends live in one worker process
+PROCESS_LOCAL_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def check_shared_cache(setting, alias, id):
+    """
+    Error when the ``CACHES`` `alias` used by `setting` isn't shared by all
+    worker processes (writes of one process must be seen by the others)
+    """
+    if alias not in settings.CACHES:
+        return [
+            checks.Error(f'{setting}["CACHE_ALIAS"] "{alias}" is not in CACHES.', id=id)
+        ]
+    backend = settings.CACHES[alias].get("BACKEND")
+    if backend in PROCESS_LOCAL_BACKENDS:
+        return [
+            checks.Error(
+                f'{setting}["CACHE_ALIAS"] "{alias}" uses {backend}, '
+                "which is local to each worker process.",
+                hint=(
+                    "Set the CACHE_BACKEND & CACHE_LOCATION environment variables "
+                    f"to a cache shared by all processes or disable {setting}."
+                ),
+                id=id,
+            )
+        ]
+    return []
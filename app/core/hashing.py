@@ -0,0 +1,261 @@
+"""
+Password hashing & verification on a bounded worker process pool
+
+PBKDF2 is deliberately slow (hundreds of ms of pure CPU). Running it inline
+means a burst of signups/logins keeps the request threads busy and starves
+every other endpoint of the same worker. Here the work is sent to a small
+process pool instead and the number of hashes waiting or running is capped
+by ``PASSWORD_HASHING_POOL["MAX_QUEUE"]``; once full, new requests fail fast
+with 503 instead of queueing up behind each other.
+
+TODO - Refer
+https://docs.python.org/3/library/concurrent.futures.html#processpoolexecutor
+https://docs.djangoproject.com/en/4.1/topics/auth/passwords/
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework.exceptions import APIException
+
+from core.metrics import (
+    PASSWORD_HASH_REJECTED,
+    PASSWORD_HASH_TIME,
+    PASSWORD_HASH_WAIT,
+)
+
+
+class HashingPoolSaturated(APIException):
+    """
+    Raised when too many hashes are already queued, DRF returns it as 503
+    """
+
+    status_code = 503
+    default_detail = "Server is busy, please retry shortly."
+    default_code = "hashing_pool_saturated"
+
+
+def get_config():
+    return {
+        "WORKERS": 2,
+        "MAX_QUEUE": 32,
+        "TIMEOUT": 10,
+        **getattr(settings, "PASSWORD_HASHING_POOL", {}),
+    }
+
+
+class HashMetrics:
+    """
+    Counters of hashing work (wait = time spent queued before a worker picked it up)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.rejected = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.hash_seconds_total = 0.0
+
+    def observe(self, wait_seconds, hash_seconds):
+        with self._lock:
+            self.count += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+            self.hash_seconds_total += hash_seconds
+        PASSWORD_HASH_WAIT.observe(wait_seconds)
+        PASSWORD_HASH_TIME.observe(hash_seconds)
+
+    def reject(self):
+        with self._lock:
+            self.rejected += 1
+        PASSWORD_HASH_REJECTED.inc()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "count": self.count,
+                "rejected": self.rejected,
+                "in_flight": pool.in_flight,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "wait_seconds_avg": self.wait_seconds_total / self.count
+                if self.count
+                else 0.0,
+                "hash_seconds_total": self.hash_seconds_total,
+            }
+
+
+metrics = HashMetrics()
+
+
+def _init_worker():
+    """
+    Worker processes are spawned, so they need their own settings for PASSWORD_HASHERS
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def _timed_call(func, *args):
+    """
+    Runs inside the worker, returns result with the seconds spent hashing
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+class HashingPool:
+    """
+    Lazily created process pool with a cap on work in flight
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            # A forked web worker (gunicorn --preload) must not reuse its parent's pool
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=get_config()["WORKERS"],
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def _acquire(self):
+        with self._lock:
+            if self.in_flight >= get_config()["MAX_QUEUE"]:
+                metrics.reject()
+                raise HashingPoolSaturated()
+            self.in_flight += 1
+
+    def _release(self, future=None):
+        with self._lock:
+            self.in_flight -= 1
+
+    def submit(self, func, *args):
+        """
+        Returns concurrent future of ``(result, hash seconds)``
+        """
+        self._acquire()
+        try:
+            future = self._get_executor().submit(_timed_call, func, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, func, *args):
+        """
+        Runs `func(*args)` in the pool and blocks until it's done
+        """
+        if not get_config()["WORKERS"]:
+            result, hash_seconds = _timed_call(func, *args)
+            metrics.observe(0.0, hash_seconds)
+            return result
+
+        start = time.perf_counter()
+        future = self.submit(func, *args)
+        try:
+            result, hash_seconds = future.result(timeout=get_config()["TIMEOUT"])
+        except TimeoutError:
+            future.cancel()
+            metrics.reject()
+            raise HashingPoolSaturated()
+
+        metrics.observe(
+            max(0.0, time.perf_counter() - start - hash_seconds), hash_seconds
+        )
+        return result
+
+    async def arun(self, func, *args):
+        """
+        Same as `run` but awaits the result instead of blocking the event loop
+        """
+        if not get_config()["WORKERS"]:
+            return self.run(func, *args)
+
+        start = time.perf_counter()
+        future = self.submit(func, *args)
+        try:
+            result, hash_seconds = await asyncio.wait_for(
+                asyncio.wrap_future(future), get_config()["TIMEOUT"]
+            )
+        except asyncio.TimeoutError:
+            metrics.reject()
+            raise HashingPoolSaturated()
+
+        metrics.observe(
+            max(0.0, time.perf_counter() - start - hash_seconds), hash_seconds
+        )
+        return result
+
+
+pool = HashingPool()
+
+
+def make_password(raw_password):
+    """
+    `django.contrib.auth.hashers.make_password` on the pool
+    """
+    if raw_password is None:
+        # Unusable password, nothing expensive to compute
+        return hashers.make_password(None)
+    return pool.run(hashers.make_password, raw_password)
+
+
+def check_password(raw_password, encoded):
+    """
+    `django.contrib.auth.hashers.check_password` on the pool (without setter)
+    """
+    if raw_password is None or not hashers.is_password_usable(encoded):
+        return False
+    return pool.run(hashers.check_password, raw_password, encoded)
+
+
+async def amake_password(raw_password):
+    if raw_password is None:
+        return hashers.make_password(None)
+    return await pool.arun(hashers.make_password, raw_password)
+
+
+async def acheck_password(raw_password, encoded):
+    if raw_password is None or not hashers.is_password_usable(encoded):
+        return False
+    return await pool.arun(hashers.check_password, raw_password, encoded)
+
+
+def must_update(encoded):
+    """
+    True if `encoded` was made by an old hasher or with fewer iterations,
+    same rule as `hashers.check_password` uses to upgrade a hash
+    """
+    preferred = hashers.get_hasher("default")
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
@@ -0,0 +1,108 @@
+"""
+Small in-process LRU cache shared by the apps
+
+Used where a Django cache round trip (or a DB query) on every request is too
+expensive and a bounded, per-process copy is good enough.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with optional per-entry TTL
+
+    Once `max_entries` is reached the least recently used entry is evicted.
+    With `max_size` entries are also evicted while the total ``sizeof(value)``
+    is above it (e.g. bytes of cached response bodies), a value bigger than
+    `max_size` is never stored.
+    Expired entries are dropped lazily when they are looked up.
+    """
+
+    def __init__(self, max_entries=1024, ttl=None, max_size=None, sizeof=len):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key, default=None):
+        """
+        Returns cached value for `key` (and marks it as recently used)
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+
+            value, expires_at, size = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.size -= size
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Stores `value` under `key`, `ttl` in seconds overrides the default TTL
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        size = self.sizeof(value) if self.max_size is not None else 0
+
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self.size -= previous[2]
+            if self.max_size is not None and size > self.max_size:
+                return
+
+            self._data[key] = (value, expires_at, size)
+            self.size += size
+            while len(self._data) > self.max_entries or (
+                self.max_size is not None and self.size > self.max_size
+            ):
+                _, (_, _, evicted_size) = self._data.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            item = self._data.pop(key, None)
+            if item is not None:
+                self.size -= item[2]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+    def stats(self):
+        return {
+            "size": len(self._data),
+            "total_size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_MISSING = object()
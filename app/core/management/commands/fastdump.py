@@ -0,0 +1,57 @@
+"""
+Django command to dump tables in the compact columnar format of core/fastdump.py
+
+    python manage.py fastdump backup/
+    python manage.py fastdump backup/ core.JobTitle core.Portal
+
+Restore with `fastload`. Much faster & smaller than `dumpdata` on big tables,
+but only meant to be loaded back into the same schema.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import fastdump
+
+
+class Command(BaseCommand):
+    """Django command to dump tables"""
+
+    help = "Dump tables of apps/models into a directory of compressed column files"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Directory to write the dump into")
+        parser.add_argument(
+            "labels",
+            nargs="*",
+            default=["core"],
+            help="app_label or app_label.ModelName (default: core)",
+        )
+        parser.add_argument("--block-rows", type=int, default=10_000)
+        parser.add_argument("--level", type=int, default=6, help="zlib level, 0-9")
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+
+        start = time.perf_counter()
+        try:
+            tables = fastdump.dump(
+                options["path"],
+                options["labels"],
+                block_rows=options["block_rows"],
+                level=options["level"],
+                using=options["database"],
+            )
+        except LookupError as error:
+            raise CommandError(error)
+
+        for label, rows in tables:
+            self.stdout.write(f"{label}: {rows} rows")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Dumped {sum(rows for _, rows in tables)} rows in "
+                f"{time.perf_counter() - start:.1f}s"
+            )
+        )
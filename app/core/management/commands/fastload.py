@@ -0,0 +1,49 @@
+"""
+Django command to load a dump made by `fastdump` into empty tables
+
+    python manage.py migrate && python manage.py fastload backup/
+
+Everything is loaded in one transaction, nothing is left behind on error.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from core import fastdump
+
+
+class Command(BaseCommand):
+    """Django command to load a `fastdump` dump"""
+
+    help = "Load a directory written by fastdump"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Directory written by fastdump")
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Rows per INSERT"
+        )
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+
+        start = time.perf_counter()
+        try:
+            tables = fastdump.load(
+                options["path"],
+                batch_size=options["batch_size"],
+                using=options["database"],
+            )
+        except (fastdump.FormatError, LookupError, DatabaseError) as error:
+            raise CommandError(f"Problem loading {options['path']}: {error}")
+
+        for label, rows in tables:
+            self.stdout.write(f"{label}: {rows} rows")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Loaded {sum(rows for _, rows in tables)} rows in "
+                f"{time.perf_counter() - start:.1f}s"
+            )
+        )
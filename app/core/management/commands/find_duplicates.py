@@ -0,0 +1,39 @@
+"""
+Django command to find near-duplicate job descriptions of every user again
+
+Needed after rows were written without signals (``bulk_create``,
+`seed_data`, raw SQL imports) or after ``NEAR_DUPLICATES`` settings changed,
+see job/duplicates.py
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import models
+
+from core.models import JobDescriptionSignature
+from job import duplicates
+
+
+class Command(BaseCommand):
+    """Django command to rebuild near-duplicate clusters"""
+
+    help = "Compute MinHash signatures & near-duplicate clusters of job descriptions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+
+        start = time.perf_counter()
+        checked = duplicates.rebuild(batch_size=options["batch_size"])
+        clustered = JobDescriptionSignature.objects.exclude(
+            cluster=models.F("job_description_id")
+        ).count()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} job descriptions in "
+                f"{time.perf_counter() - start:.1f}s, {clustered} are near-duplicates"
+            )
+        )
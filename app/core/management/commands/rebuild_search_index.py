@@ -0,0 +1,32 @@
+"""
+Django command to index every job title for full-text search again
+
+Needed after rows were written without signals (``bulk_create``,
+`seed_data`, raw SQL imports), see job/search.py
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from job import search
+
+
+class Command(BaseCommand):
+    """Django command to rebuild the search index"""
+
+    help = "Rebuild full-text search index of job titles"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+
+        start = time.perf_counter()
+        indexed = search.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {indexed} job titles in {time.perf_counter() - start:.1f}s"
+            )
+        )
@@ -0,0 +1,272 @@
+"""
+Django command to fill the database with synthetic data for benchmarks
+
+    python manage.py seed_data --users 100000 --job-titles 1000000 --seed 42
+
+- rows are produced by generators and written with batched ``bulk_create``,
+  so memory stays flat no matter how many rows are requested
+- primary keys are assigned here (continuing after the current maximum),
+  foreign keys can be set without reading anything back
+- every user gets the same precomputed password hash (PBKDF2 runs once)
+- no signals are sent, run `rebuild_search_index` afterwards to search the rows
+- the same `--seed` on the same database always produces the same rows
+TODO - Refer
+https://docs.djangoproject.com/en/4.1/ref/models/querysets/#bulk-create
+https://docs.djangoproject.com/en/4.1/howto/custom-management-commands/
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import islice
+
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from core.models import Applicant, JobDescription, JobTitle, Portal, User
+
+# Fixed reference date instead of `now()` so runs are reproducible
+REFERENCE_DATE = datetime(2023, 6, 1, tzinfo=dt_timezone.utc)
+
+FIRST_NAMES = [
+    "Aarav", "Vivaan", "Aditya", "Ananya", "Diya", "Ishaan", "Kavya", "Manthan",
+    "Meera", "Neha", "Priya", "Rahul", "Rohan", "Saanvi", "Sneha", "Vikram",
+]  # fmt: skip
+LAST_NAMES = [
+    "Agarwal", "Bose", "Desai", "Gupta", "Iyer", "Joshi", "Kapoor", "Kulkarni",
+    "Mehta", "Nair", "Patel", "Reddy", "Shah", "Sharma", "Singh", "Verma",
+]  # fmt: skip
+PORTAL_NAMES = [
+    "Naukri", "LinkedIn", "Indeed", "Monster", "Glassdoor", "Shine", "Instahyre",
+    "Hirist", "AngelList", "Cutshort", "Wellfound", "TimesJobs",
+]  # fmt: skip
+LEVELS = ["", "Junior", "Senior", "Lead", "Staff", "Principal"]
+TECHNOLOGIES = [
+    "Python", "Java", "Go", "React", "Data", "DevOps", "Cloud", "QA", "Android",
+    "iOS", "ML", "Django", "Node", "Rust", "SQL", "Security",
+]  # fmt: skip
+ROLES = ["Developer", "Engineer", "Analyst", "Architect", "Tester", "Intern"]
+WORDS = [
+    "build", "scalable", "APIs", "using", "Django", "REST", "microservices",
+    "design", "deploy", "Kubernetes", "AWS", "MySQL", "optimize", "queries",
+    "mentor", "team", "agile", "testing", "pipelines", "monitoring", "Kafka",
+    "Redis", "caching", "security", "frontend", "backend", "data", "models",
+]  # fmt: skip
+
+
+def skewed_index(rng, size, skew):
+    """
+    Random index in ``range(size)``, low indexes are picked much more often
+    (a few users post most jobs, a few portals/jobs get most traffic)
+    """
+    return min(size - 1, int(size * rng.random() ** skew))
+
+
+def batches(iterable, size):
+    """
+    Yields lists of at most `size` items without materializing `iterable`
+    """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def next_id(model):
+    return (model.objects.aggregate(Max("pk"))["pk__max"] or 0) + 1
+
+
+class Command(BaseCommand):
+    """Django command to generate synthetic data"""
+
+    help = "Generate synthetic users, portals, job titles and applicants"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--portals", type=int, default=100)
+        parser.add_argument("--job-titles", type=int, default=100_000)
+        parser.add_argument("--applicants", type=int, default=10_000)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--password",
+            default="seed@123",
+            help="Password of every generated user",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+
+        # Hashing once instead of per user saves ~hundreds of ms per row
+        self.password = hashers.make_password(options["password"])
+
+        # Applicants are users too (multi-table inheritance), they get ids after
+        # the regular users
+        user_start = next_id(User)
+        portal_start = next_id(Portal)
+        job_start = next_id(JobTitle)
+        description_start = next_id(JobDescription)
+
+        users = options["users"]
+        if users < 1:
+            self.stderr.write("At least one user is needed to own the data")
+            return
+
+        self.insert(User, self.generate_users(user_start, users))
+        self.insert(
+            Portal,
+            self.generate_portals(portal_start, options["portals"], user_start, users),
+        )
+        if options["portals"]:
+            self.insert_job_titles(
+                job_start,
+                description_start,
+                options["job_titles"],
+                portal_start,
+                options["portals"],
+                user_start,
+                users,
+            )
+        if options["job_titles"] and options["portals"]:
+            self.insert_applicants(
+                user_start + users,
+                options["applicants"],
+                job_start,
+                options["job_titles"],
+            )
+
+        # Explicit ids don't move the sequences on every backend (e.g. PostgreSQL)
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), [User, Portal, JobDescription, JobTitle]
+            ):
+                cursor.execute(sql)
+
+        self.stdout.write(self.style.SUCCESS("Seeding done!"))
+
+    def insert(self, model, rows):
+        """
+        ``bulk_create`` `rows` batch by batch, one transaction per batch
+        """
+        start = time.perf_counter()
+        count = 0
+        for batch in batches(rows, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            count += len(batch)
+        self.report(model, count, start)
+
+    def report(self, model, count, start):
+        seconds = time.perf_counter() - start
+        self.stdout.write(
+            f"{model.__name__}: {count} rows in {seconds:.1f}s"
+            f" ({count / seconds if seconds else 0:.0f} rows/s)"
+        )
+
+    def generate_user_fields(self, pk):
+        return {
+            "id": pk,
+            "email": f"user{pk}@seed.example.com",
+            "name": f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}",
+            "password": self.password,
+        }
+
+    def generate_users(self, start, count):
+        for pk in range(start, start + count):
+            yield User(**self.generate_user_fields(pk))
+
+    def generate_portals(self, start, count, user_start, users):
+        for pk in range(start, start + count):
+            yield Portal(
+                id=pk,
+                user_id=user_start + skewed_index(self.rng, users, 2),
+                # name is unique
+                name=f"{PORTAL_NAMES[pk % len(PORTAL_NAMES)]} {pk}",
+                description=self.sentence(8),
+            )
+
+    def generate_job_titles(
+        self, start, description_start, count, portal_start, portals, user_start, users
+    ):
+        """
+        Yields ``(JobDescription, JobTitle)`` pairs, they are 1:1
+        """
+        for offset in range(count):
+            role = f"{self.rng.choice(TECHNOLOGIES)} {self.rng.choice(ROLES)}"
+            published_date = REFERENCE_DATE - timedelta(
+                seconds=self.rng.randint(0, 2 * 365 * 24 * 3600)
+            )
+            # recruiters: a few users post most of the jobs
+            user_id = user_start + skewed_index(self.rng, users, 3)
+
+            job_description = JobDescription(
+                id=description_start + offset,
+                user_id=user_id,
+                role=role,
+                description_text=self.sentence(self.rng.randint(8, 30))[:250],
+                published_date=published_date,
+            )
+            job_title = JobTitle(
+                id=start + offset,
+                user_id=user_id,
+                title=f"{self.rng.choice(LEVELS)} {role}".strip()[:25],
+                last_updated=published_date
+                + timedelta(seconds=self.rng.randint(0, 30 * 24 * 3600)),
+                job_description_id=job_description.id,
+                portal_id=portal_start + skewed_index(self.rng, portals, 2),
+            )
+            yield job_description, job_title
+
+    def insert_job_titles(self, *args):
+        start = time.perf_counter()
+        count = 0
+        for batch in batches(self.generate_job_titles(*args), self.batch_size):
+            job_descriptions, job_titles = zip(*batch)
+            with transaction.atomic():
+                JobDescription.objects.bulk_create(job_descriptions)
+                JobTitle.objects.bulk_create(job_titles)
+            count += len(batch)
+        self.report(JobTitle, count, start)
+
+    def insert_applicants(self, start, count, job_start, job_titles):
+        """
+        ``bulk_create`` refuses multi-table inherited models, so parent `User` rows
+        are bulk created first and `core_applicant` rows are inserted with a
+        parametrized multi-row INSERT (``executemany``) pointing at them
+        """
+        begin = time.perf_counter()
+        fields = Applicant._meta.local_concrete_fields
+        sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            connection.ops.quote_name(Applicant._meta.db_table),
+            ", ".join(connection.ops.quote_name(field.column) for field in fields),
+            ", ".join(["%s"] * len(fields)),
+        )
+
+        inserted = 0
+        for batch in batches(range(start, start + count), self.batch_size):
+            parents = [User(**self.generate_user_fields(pk)) for pk in batch]
+            rows = []
+            for parent in parents:
+                values = {
+                    "user_ptr_id": parent.id,
+                    "is_applicant": True,
+                    # popular postings get most of the applications
+                    "applied_for_id": job_start + skewed_index(self.rng, job_titles, 3),
+                    "cover_letter": self.sentence(10)[:150],
+                }
+                rows.append([values[field.attname] for field in fields])
+
+            with transaction.atomic(), connection.cursor() as cursor:
+                User.objects.bulk_create(parents)
+                cursor.executemany(sql, rows)
+            inserted += len(batch)
+
+        self.report(Applicant, inserted, begin)
+
+    def sentence(self, words):
+        return " ".join(self.rng.choices(WORDS, k=words)).capitalize()
@@ -0,0 +1,154 @@
+"""
+Prometheus metrics of the API, exported by `core.views.metrics` at ``/metrics``
+
+Values live in process memory. When the app runs in several forked worker
+processes set ``PROMETHEUS_MULTIPROC_DIR`` to an empty directory before the
+server starts; every process then writes its values to mmap-ed files there
+and ``/metrics`` adds them up, whichever worker answers the scrape. Call
+`mark_process_dead` when a worker exits (e.g. gunicorn ``child_exit`` hook)
+so its in-flight gauge is dropped.
+
+``/metrics`` only answers scrapes from ``METRICS["ALLOWED_IPS"]`` (loopback by
+default) or carrying ``Authorization: Bearer <METRICS["TOKEN"]>``
+(``bearer_token`` of the Prometheus scrape config), anyone else gets 403.
+
+TODO - Refer
+https://prometheus.github.io/client_python/instrumenting/
+https://prometheus.github.io/client_python/multiprocess/
+"""
+
+import ipaddress
+import os
+import secrets
+
+from django.conf import settings
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+
+def get_config():
+    return {
+        "TOKEN": None,
+        "ALLOWED_IPS": ["127.0.0.1", "::1"],
+        **getattr(settings, "METRICS", {}),
+    }
+
+
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by DRF view & action",
+    ["view", "method", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests being handled right now",
+    # sum of the gauges of the worker processes that are alive
+    multiprocess_mode="livesum",
+)
+DB_TIME = Histogram(
+    "db_query_duration_seconds",
+    "Total SQL time of a request by view",
+    ["view"],
+    buckets=DB_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "db_queries_per_request",
+    "Number of SQL queries of a request by view",
+    ["view"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+PASSWORD_HASH_TIME = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent hashing/verifying a password on the hashing pool",
+    buckets=HASH_BUCKETS,
+)
+PASSWORD_HASH_WAIT = Histogram(
+    "password_hash_wait_seconds",
+    "Time a password hash waited for a free hashing pool worker",
+    buckets=HASH_BUCKETS,
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected",
+    "Password hashes refused because the hashing pool was saturated",
+)
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "response_cache_lookups",
+    "Lookups of rendered responses by cache tier (local, shared) & result",
+    ["tier", "result"],
+)
+RESPONSE_CACHE_EVICTIONS = Counter(
+    "response_cache_evictions",
+    "Rendered responses evicted from the per-process LRU (size caps)",
+)
+SINGLE_FLIGHT_REQUESTS = Counter(
+    "single_flight_requests",
+    "Coalesced GETs by outcome (leader, shared, timeout, fallback)",
+    ["layer", "outcome"],
+)
+
+
+def view_name(view_func, method):
+    """
+    Label of a view like ``JobTitleViewSet.list`` or ``CreateTokenView``
+    """
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+    if view_class is None:
+        return getattr(view_func, "__name__", "unknown")
+
+    # ViewSet.as_view() remembers the {"get": "list", ...} mapping
+    action = (getattr(view_func, "actions", None) or {}).get(method.lower())
+    if action:
+        return f"{view_class.__name__}.{action}"
+    return view_class.__name__
+
+
+def is_scrape_allowed(request):
+    """
+    Request comes from an allowed address (or network) or carries the token
+    """
+    config = get_config()
+    token = config["TOKEN"]
+    authorization = request.headers.get("Authorization", "")
+    if token and secrets.compare_digest(
+        authorization.encode(), f"Bearer {token}".encode()
+    ):
+        return True
+
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network, strict=False)
+        for network in config["ALLOWED_IPS"]
+    )
+
+
+def render():
+    """
+    Returns ``(body, content type)`` of the metrics of all worker processes
+    """
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
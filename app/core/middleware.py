@@ -0,0 +1,273 @@
+"""
+Per-request SQL statistics & Prometheus request metrics
+
+query_instrumentation_middleware
+
+Every query run while a request is handled is timed by a database execute
+wrapper (works with ``DEBUG = False``, unlike ``connection.queries``) and
+summed up per request:
+    - number of queries and their total time
+    - duplicate statements, grouped by fingerprint (literals & IN lists removed)
+    - the slowest statement
+
+The numbers are sent back in ``X-DB-Queries`` & ``Server-Timing`` headers
+(SQL text is only logged, never sent to the client) and a warning is logged
+when one SELECT repeats often enough to look like an N+1 query. Batches
+aren't: a statement of which some run had an IN list of several values or
+read a keyset page (``> %s ... ORDER BY ... LIMIT``) is chunked on purpose.
+
+The wrapper is installed once on every connection and finds the statistics of
+the current request through a context variable, so it also sees queries that
+async views run with ``sync_to_async`` in another thread.
+Queries run while a streaming response is consumed aren't counted.
+TODO - Refer
+https://docs.djangoproject.com/en/4.1/topics/db/instrumentation/
+https://docs.djangoproject.com/en/4.1/topics/http/middleware/#asynchronous-support
+https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Server-Timing
+
+MetricsMiddleware
+------------------
+Observes request latency by view/action, requests in flight and SQL time of
+each request into the Prometheus metrics of `core.metrics`.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.decorators import sync_and_async_middleware
+
+from core import metrics
+
+logger = logging.getLogger("core.sql")
+
+current_stats = ContextVar("current_sql_stats", default=None)
+
+_IN_LIST = re.compile(r"\bIN\s*\(\s*%s(?:\s*,\s*%s)*\s*\)", re.IGNORECASE)
+_BATCH_IN_LIST = re.compile(r"\bIN\s*\(\s*%s\s*,", re.IGNORECASE)
+_KEYSET = re.compile(r"[<>]=?\s*%s.*\bORDER BY\b.*\bLIMIT\b", re.IGNORECASE | re.DOTALL)
+_NUMBER = re.compile(r"\b\d+\b")
+
+
+def get_config():
+    return {
+        "HEADERS": True,
+        "N_PLUS_ONE_THRESHOLD": 10,
+        **getattr(settings, "SQL_INSTRUMENTATION", {}),
+    }
+
+
+def fingerprint(sql):
+    """
+    Statement with literals removed, ``id IN (%s, %s, %s)`` of any length
+    (one value too) and ``LIMIT 21`` / ``LIMIT 50`` give the same fingerprint
+    """
+    return _NUMBER.sub("?", _IN_LIST.sub("IN (%s, ...)", sql))
+
+
+def is_batch(sql):
+    """
+    Chunk of a bigger read: IN list of several values or a keyset page
+    """
+    return bool(_BATCH_IN_LIST.search(sql) or _KEYSET.search(sql))
+
+
+class QueryStats:
+    """
+    SQL statistics of one request
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_sql = None
+        # raw sql -> times executed, fingerprinted only once the request is done
+        self.statements = {}
+
+    def record(self, sql, duration):
+        self.count += 1
+        self.duration += duration
+        self.statements[sql] = self.statements.get(sql, 0) + 1
+        if duration > self.slowest_duration:
+            self.slowest_duration = duration
+            self.slowest_sql = sql
+
+    def duplicates(self):
+        """
+        ``{fingerprint: times executed}`` of statements run more than once
+        """
+        fingerprints = {}
+        for sql, count in self.statements.items():
+            key = fingerprint(sql)
+            fingerprints[key] = fingerprints.get(key, 0) + count
+        return {key: count for key, count in fingerprints.items() if count > 1}
+
+    def repeated(self, threshold):
+        """
+        ``{fingerprint: times executed}`` of SELECTs run at least `threshold`
+        times which aren't batches (possible N+1)
+        """
+        counts, batches = {}, set()
+        for sql, count in self.statements.items():
+            if not sql.lstrip().upper().startswith("SELECT"):
+                continue
+            key = fingerprint(sql)
+            counts[key] = counts.get(key, 0) + count
+            if is_batch(sql):
+                batches.add(key)
+        return {
+            key: count
+            for key, count in counts.items()
+            if count >= threshold and key not in batches
+        }
+
+
+def instrument(execute, sql, params, many, context):
+    """
+    Execute wrapper, times the query if a request is being instrumented
+    """
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record(sql, time.perf_counter() - start)
+
+
+def install(connection, **kwargs):
+    if instrument not in connection.execute_wrappers:
+        # first, so wrappers pushed & popped by `execute_wrapper()` stay on top
+        connection.execute_wrappers.insert(0, instrument)
+
+
+def finish(request, response, stats):
+    config = get_config()
+
+    if config["HEADERS"]:
+        response["X-DB-Queries"] = str(stats.count)
+        timing = f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'
+        if response.has_header("Server-Timing"):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response["Server-Timing"] = timing
+
+    for key, count in stats.repeated(config["N_PLUS_ONE_THRESHOLD"]).items():
+        logger.warning(
+            "Possible N+1 on %s %s: %d x %s",
+            request.method,
+            request.path,
+            count,
+            key,
+        )
+
+    if stats.slowest_sql is not None:
+        logger.debug(
+            "%s %s: %d queries in %.2f ms, slowest %.2f ms: %s",
+            request.method,
+            request.path,
+            stats.count,
+            stats.duration * 1000,
+            stats.slowest_duration * 1000,
+            stats.slowest_sql,
+        )
+    return response
+
+
+@sync_and_async_middleware
+def query_instrumentation_middleware(get_response):
+    """
+    Collects `QueryStats` of each request (also kept as ``request.sql_stats``)
+    """
+    connection_created.connect(install, dispatch_uid="core.middleware.install")
+    for connection in connections.all(initialized_only=True):
+        install(connection)
+
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            request.sql_stats = stats = QueryStats()
+            token = current_stats.set(stats)
+            try:
+                response = await get_response(request)
+            finally:
+                current_stats.reset(token)
+            return finish(request, response, stats)
+
+    else:
+
+        def middleware(request):
+            request.sql_stats = stats = QueryStats()
+            token = current_stats.set(stats)
+            try:
+                response = get_response(request)
+            finally:
+                current_stats.reset(token)
+            return finish(request, response, stats)
+
+    return middleware
+
+
+class MetricsMiddleware:
+    """
+    Must come before `query_instrumentation_middleware` in ``MIDDLEWARE``,
+    its `request.sql_stats` are complete once the inner middlewares are done
+    TODO - Refer
+    https://docs.djangoproject.com/en/4.1/topics/http/middleware/#process-view
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        metrics.REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.REQUESTS_IN_FLIGHT.dec()
+        self.observe(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        metrics.REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.REQUESTS_IN_FLIGHT.dec()
+        self.observe(request, response, time.perf_counter() - start)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics_view = metrics.view_name(view_func, request.method)
+
+    def observe(self, request, response, seconds):
+        # not resolved (404) or answered by a middleware before the view
+        view = getattr(request, "metrics_view", "unresolved")
+
+        metrics.REQUEST_LATENCY.labels(
+            view, request.method, str(response.status_code)
+        ).observe(seconds)
+
+        stats = getattr(request, "sql_stats", None)
+        if stats is not None:
+            metrics.DB_TIME.labels(view).observe(stats.duration)
+            metrics.DB_QUERIES.labels(view).observe(stats.count)
@@ -0,0 +1,24 @@
+# Generated by Django 4.1.5 on 2026-10-18 20:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_jobdescription_portal_jobtitle_applicant"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="jobtitle",
+            index=models.Index(
+                fields=["user", "-id"], name="core_jobtitle_user_id_desc"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobtitle",
+            index=models.Index(
+                fields=["user", "-last_updated"], name="core_jobtitle_user_updated"
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.1.5 on 2026-10-18 20:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0003_jobtitle_user_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="auth_generation",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
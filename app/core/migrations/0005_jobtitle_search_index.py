@@ -0,0 +1,88 @@
+# Generated by Django 4.1.5 on 2026-10-18 21:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0004_user_auth_generation"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobTitleSearchStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("documents", models.PositiveIntegerField(default=0)),
+                ("total_length", models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="JobTitleSearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=50)),
+                ("frequency", models.PositiveIntegerField()),
+                ("document_length", models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="jobtitle",
+            index=models.Index(
+                fields=["user", "portal", "-id"], name="core_jobtitle_user_portal_id"
+            ),
+        ),
+        migrations.AddField(
+            model_name="jobtitlesearchterm",
+            name="job_title",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="search_terms",
+                to="core.jobtitle",
+            ),
+        ),
+        migrations.AddField(
+            model_name="jobtitlesearchterm",
+            name="portal",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="core.portal"
+            ),
+        ),
+        migrations.AddField(
+            model_name="jobtitlesearchterm",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobtitlesearchterm",
+            index=models.Index(
+                fields=["user", "term"], name="core_searchterm_user_term"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="jobtitlesearchterm",
+            constraint=models.UniqueConstraint(
+                fields=("job_title", "term"), name="core_searchterm_unique_term"
+            ),
+        ),
+    ]
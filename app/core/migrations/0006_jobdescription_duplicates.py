@@ -0,0 +1,81 @@
+# Generated by Django 4.1.5 on 2026-10-18 21:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0005_jobtitle_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobDescriptionSignature",
+            fields=[
+                (
+                    "job_description",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="duplicate_signature",
+                        serialize=False,
+                        to="core.jobdescription",
+                    ),
+                ),
+                ("signature", models.BinaryField()),
+                ("cluster", models.PositiveBigIntegerField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="JobDescriptionBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.BigIntegerField()),
+                (
+                    "job_description",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="duplicate_buckets",
+                        to="core.jobdescription",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="jobdescriptionsignature",
+            index=models.Index(
+                fields=["user", "cluster", "job_description"],
+                name="core_signature_user_cluster",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobdescriptionbucket",
+            index=models.Index(
+                fields=["user", "bucket"], name="core_bucket_user_bucket"
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.1.5 on 2026-10-18 21:50
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0006_jobdescription_duplicates"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobTitleChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("user_id", models.BigIntegerField()),
+                ("job_title_id", models.BigIntegerField()),
+                (
+                    "action",
+                    models.PositiveSmallIntegerField(
+                        choices=[(1, "Created"), (2, "Updated"), (3, "Deleted")]
+                    ),
+                ),
+                ("changed_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="jobtitlechange",
+            index=models.Index(fields=["user_id", "id"], name="core_change_user_id"),
+        ),
+    ]
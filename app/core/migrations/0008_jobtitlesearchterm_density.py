@@ -0,0 +1,71 @@
+# Generated by Django 4.1.5 on 2026-10-18 23:30
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+
+def fill_density(apps, schema_editor):
+    JobTitleSearchTerm = apps.get_model("core", "JobTitleSearchTerm")
+    JobTitleSearchTerm.objects.update(
+        density=Cast("frequency", FloatField()) / F("document_length")
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0007_jobtitlechange"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobtitlesearchterm",
+            name="density",
+            field=models.FloatField(default=0),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_density, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name="jobtitlesearchstats",
+            name="version",
+            field=models.UUIDField(default=uuid.uuid4),
+        ),
+        migrations.RemoveIndex(
+            model_name="jobtitlesearchterm",
+            name="core_searchterm_user_term",
+        ),
+        migrations.AddIndex(
+            model_name="jobtitlesearchterm",
+            index=models.Index(
+                fields=[
+                    "user",
+                    "term",
+                    "-density",
+                    "-job_title",
+                    "frequency",
+                    "document_length",
+                ],
+                name="core_searchterm_density",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobtitlesearchterm",
+            index=models.Index(
+                fields=["job_title", "term", "frequency", "document_length"],
+                name="core_searchterm_job_title",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="jobtitlesearchterm",
+            name="job_title",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="search_terms",
+                to="core.jobtitle",
+            ),
+        ),
+    ]
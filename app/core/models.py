@@ -5,13 +5,17 @@ from django.db import models  # noqa
 # Customization of default authentication system in django
 # https://docs.djangoproject.com/en/4.1/topics/auth/customizing/#a-full-example
 
+import uuid
+
 from django.contrib.auth.models import (
     AbstractBaseUser,
     PermissionsMixin,
     BaseUserManager,
 )
 from django.conf import settings
+from django.db import router, transaction
 from django.utils import timezone
+from core import hashing
 
 
 class UserManager(BaseUserManager):  # customizing default UserManager class
@@ -56,6 +60,10 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
 
+    # Bumped to revoke every signed access/refresh token issued to this user
+    # (see user/tokens.py)
+    auth_generation = models.PositiveIntegerField(default=0)
+
     # whatever ORM queries we run
     # all goes through these objects attribute User.objects.get()
     objects = UserManager()
@@ -63,6 +71,26 @@ class User(AbstractBaseUser, PermissionsMixin):
     # to define new USERNAME_FIELD in custom user model
     USERNAME_FIELD = "email"
 
+    def set_password(self, raw_password):
+        """
+        Same as parent class method but PBKDF2 runs on the bounded
+        hashing pool (core/hashing.py) instead of the request thread
+        """
+        self.password = hashing.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """
+        Verify password on the hashing pool,
+        re-hash it if it was made with an outdated hasher (like parent class does)
+        """
+        is_correct = hashing.check_password(raw_password, self.password)
+        if is_correct and hashing.must_update(self.password):
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=["password"])
+        return is_correct
+
 
 class Portal(models.Model):
     """
@@ -81,6 +109,15 @@ class Portal(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.CharField(max_length=250)
 
+    def save(self, *args, **kwargs):
+        """
+        Saved in one transaction with what post_save receivers write
+        (changelog of its JobTitles, see job/changes.py)
+        """
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
     def __str__(self):
         """
         If id need
@@ -102,6 +139,15 @@ class JobDescription(models.Model):
     description_text = models.CharField(max_length=250)
     published_date = models.DateTimeField(default=timezone.now)
 
+    def save(self, *args, **kwargs):
+        """
+        Saved in one transaction with what post_save receivers write
+        (changelog of its JobTitle, see job/changes.py)
+        """
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.role} - ({self.published_date})"
 
@@ -129,10 +175,212 @@ class JobTitle(models.Model):
     # OneToManyField Relationship
     portal = models.ForeignKey(Portal, on_delete=models.CASCADE)
 
+    class Meta:
+        """
+        Composite indexes for the per-user listing
+            WHERE user_id = ? ORDER BY id DESC LIMIT ?
+        so the database walks the index in order instead of sorting (filesort)
+        TODO - refer
+        https://docs.djangoproject.com/en/4.1/ref/models/indexes/
+        """
+
+        indexes = [
+            models.Index(fields=["user", "-id"], name="core_jobtitle_user_id_desc"),
+            models.Index(
+                fields=["user", "-last_updated"], name="core_jobtitle_user_updated"
+            ),
+            # ``?portal=`` filter of the listing
+            models.Index(
+                fields=["user", "portal", "-id"], name="core_jobtitle_user_portal_id"
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Keep the values read from the database, receivers compare them with
+        the saved ones without another query (job/signals.py)
+        TODO - refer
+        https://docs.djangoproject.com/en/4.1/ref/models/instances/#customizing-model-loading
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, update_fields=None, **kwargs):
+        """
+        - `last_updated` moves to now on every update (``auto_now`` would
+          also overwrite it on create, `seed_data` sets it on purpose)
+        - saved in one transaction with what post_save receivers write
+          (changelog, see job/changes.py)
+        """
+        if not self._state.adding:
+            self.last_updated = timezone.now()
+            if update_fields is not None:
+                update_fields = {*update_fields, "last_updated"}
+
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, update_fields=update_fields, **kwargs)
+
     def __str__(self):
         return f"{self.title} - ({self.portal})"
 
 
+class JobTitleChange(models.Model):
+    """
+    Changelog of job titles, one row per create/update/delete written in the
+    same transaction. The (auto increment) id is the change token of
+    ``GET /api/jobtitle/jobtitles/changes/?since=<token>`` (see job/changes.py)
+    """
+
+    class Action(models.IntegerChoices):
+        CREATED = 1
+        UPDATED = 2
+        DELETED = 3
+
+    # no foreign keys, rows of deleted job titles (and their users) must stay
+    user_id = models.BigIntegerField()
+    job_title_id = models.BigIntegerField()
+    action = models.PositiveSmallIntegerField(choices=Action.choices)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user_id", "id"], name="core_change_user_id"),
+        ]
+
+    def __str__(self):
+        return f"{self.id} - ({self.job_title_id} {self.get_action_display()})"
+
+
+class JobTitleSearchTerm(models.Model):
+    """
+    Inverted index of job postings (see job/search.py)
+
+    One row per distinct word of a JobTitle's title, role & description_text.
+    `user` & `portal` are copied from the JobTitle so a search reads only the
+    posting list of one user's terms without joining job titles.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # looked up by `core_searchterm_job_title`
+    job_title = models.ForeignKey(
+        JobTitle, on_delete=models.CASCADE, related_name="search_terms", db_index=False
+    )
+    portal = models.ForeignKey(Portal, on_delete=models.CASCADE)
+
+    term = models.CharField(max_length=50)
+
+    # times the term occurs in the posting & words of the whole posting (BM25)
+    frequency = models.PositiveIntegerField()
+    document_length = models.PositiveIntegerField()
+    # frequency / document_length, posting lists are read densest first
+    # (newest first among equally dense ones, the order of the ranking)
+    density = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                # covering: posting lists are read from the index alone
+                fields=[
+                    "user",
+                    "term",
+                    "-density",
+                    "-job_title",
+                    "frequency",
+                    "document_length",
+                ],
+                name="core_searchterm_density",
+            ),
+            # other query words of a posting, read by job title
+            models.Index(
+                fields=["job_title", "term", "frequency", "document_length"],
+                name="core_searchterm_job_title",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job_title", "term"], name="core_searchterm_unique_term"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.term} - ({self.job_title_id})"
+
+
+class JobTitleSearchStats(models.Model):
+    """
+    Number of indexed postings & their total length per user,
+    BM25 needs both and counting them on every search would be a scan
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True
+    )
+    documents = models.PositiveIntegerField(default=0)
+    total_length = models.PositiveBigIntegerField(default=0)
+    # changed on every change of the user's postings, cached posting lists
+    # of an older version aren't used
+    version = models.UUIDField(default=uuid.uuid4)
+
+    def __str__(self):
+        return f"{self.user_id} - ({self.documents})"
+
+
+class JobDescriptionSignature(models.Model):
+    """
+    MinHash signature of a JobDescription (see job/duplicates.py)
+
+    `cluster` groups near-duplicate descriptions of one user, it's the id of
+    one of them (the oldest when the cluster was formed) and only compared
+    for equality.
+    """
+
+    job_description = models.OneToOneField(
+        JobDescription,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="duplicate_signature",
+    )
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    signature = models.BinaryField()
+    cluster = models.PositiveBigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "cluster", "job_description"],
+                name="core_signature_user_cluster",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.job_description_id} - ({self.cluster})"
+
+
+class JobDescriptionBucket(models.Model):
+    """
+    LSH bucket of a JobDescription, one row per band of its signature.
+    Descriptions sharing a bucket are near-duplicate candidates.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    job_description = models.ForeignKey(
+        JobDescription, on_delete=models.CASCADE, related_name="duplicate_buckets"
+    )
+    # hash of the band number & the band of the signature
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "bucket"], name="core_bucket_user_bucket"),
+        ]
+
+    def __str__(self):
+        return f"{self.bucket} - ({self.job_description_id})"
+
+
 class Applicant(User):
     """
     - Whoever is user by default his/her applicant status will True
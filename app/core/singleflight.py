@@ -0,0 +1,118 @@
+"""
+Single-flight: one computation per key at a time, concurrent callers of the
+same key wait for it and share its result
+
+- `SingleFlight` for threads (WSGI workers with threads)
+- `AsyncSingleFlight` for coroutines of one event loop (ASGI)
+
+A waiter which isn't served within `timeout` seconds, or whose leader failed
+(raised or was cancelled), runs the computation on its own instead of
+failing with it, so coalescing only ever saves work.
+
+TODO - Refer
+https://pkg.go.dev/golang.org/x/sync/singleflight
+"""
+
+import asyncio
+import threading
+
+# how a call was served, see `SingleFlight.do`
+LEADER = "leader"
+SHARED = "shared"
+TIMEOUT = "timeout"
+FALLBACK = "fallback"
+
+
+class _Flight:
+    def __init__(self, done):
+        self.done = done
+        self.result = None
+        self.failed = False
+
+
+class SingleFlight:
+    """
+    Thread-safe single-flight group
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._flights)
+
+    def do(self, key, fn, timeout=None):
+        """
+        Returns ``(result, outcome)`` of ``fn()``, outcome being `LEADER`,
+        `SHARED` (result of another thread), `TIMEOUT` or `FALLBACK`
+        (computed again by this thread)
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight(threading.Event())
+
+        if leader:
+            return self._lead(key, flight, fn), LEADER
+
+        if not flight.done.wait(timeout):
+            return fn(), TIMEOUT
+        if flight.failed:
+            return fn(), FALLBACK
+        return flight.result, SHARED
+
+    def _lead(self, key, flight, fn):
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException:
+            flight.failed = True
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    Single-flight group of coroutines, flights are kept per event loop
+    """
+
+    def __init__(self):
+        self._flights = {}
+
+    def __len__(self):
+        return len(self._flights)
+
+    async def do(self, key, fn, timeout=None):
+        """
+        Same as `SingleFlight.do` with ``await fn()``
+        """
+        key = (asyncio.get_running_loop(), key)
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight(asyncio.Event())
+            return await self._lead(key, flight, fn), LEADER
+
+        try:
+            await asyncio.wait_for(flight.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            return await fn(), TIMEOUT
+        if flight.failed:
+            return await fn(), FALLBACK
+        return flight.result, SHARED
+
+    async def _lead(self, key, flight, fn):
+        try:
+            flight.result = await fn()
+            return flight.result
+        except BaseException:
+            # cancelled (client went away) too
+            flight.failed = True
+            raise
+        finally:
+            del self._flights[key]
+            flight.done.set()
@@ -0,0 +1,47 @@
+"""
+Tests for system checks of caches which must be shared by worker processes
+"""
+
+from django.core import checks
+from django.test import SimpleTestCase, override_settings
+
+from job.checks import check_response_cache
+from user.checks import check_signed_tokens_cache
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+SHARED = {"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache"}}
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    @override_settings(CACHES=LOCMEM, RESPONSE_CACHE={"ENABLED": True})
+    def test_response_cache_in_process_memory(self):
+        errors = check_response_cache(None)
+
+        self.assertEqual([error.id for error in errors], ["job.E001"])
+        self.assertIsInstance(errors[0], checks.Error)
+
+    @override_settings(CACHES=LOCMEM, RESPONSE_CACHE={"ENABLED": False})
+    def test_disabled_response_cache(self):
+        self.assertEqual(check_response_cache(None), [])
+
+    @override_settings(CACHES=SHARED, RESPONSE_CACHE={"ENABLED": True})
+    def test_shared_response_cache(self):
+        self.assertEqual(check_response_cache(None), [])
+
+    @override_settings(
+        CACHES=SHARED, RESPONSE_CACHE={"ENABLED": True, "CACHE_ALIAS": "responses"}
+    )
+    def test_unknown_alias(self):
+        self.assertEqual(
+            [error.id for error in check_response_cache(None)], ["job.E001"]
+        )
+
+    @override_settings(CACHES=LOCMEM, SIGNED_AUTH_TOKENS={"ENABLED": True})
+    def test_token_state_in_process_memory(self):
+        self.assertEqual(
+            [error.id for error in check_signed_tokens_cache(None)], ["user.E001"]
+        )
+
+    @override_settings(CACHES=LOCMEM, SIGNED_AUTH_TOKENS={"ENABLED": False})
+    def test_signed_tokens_disabled(self):
+        self.assertEqual(check_signed_tokens_cache(None), [])
@@ -0,0 +1,107 @@
+"""
+Test fastdump & fastload management commands
+"""
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core import fastdump
+from core.models import (
+    Applicant,
+    JobDescription,
+    JobDescriptionSignature,
+    JobTitle,
+    Portal,
+    User,
+)
+from core.tests.test_seed_data import seed
+
+MODELS = [User, Applicant, Portal, JobDescription, JobTitle, JobDescriptionSignature]
+
+
+def snapshot():
+    return {model: list(model.objects.order_by("pk").values()) for model in MODELS}
+
+
+class FastDumpTests(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = directory.name
+
+    def test_dump_and_load_round_trip(self):
+        seed(users=10, portals=3, job_titles=25, applicants=4)
+        job_description = JobDescription.objects.first()
+        JobDescriptionSignature.objects.create(
+            job_description=job_description,
+            user_id=job_description.user_id,
+            signature=bytes(range(256)),
+            cluster=job_description.id,
+        )
+        before = snapshot()
+
+        call_command("fastdump", self.path, block_rows=7, stdout=StringIO())
+        User.objects.all().delete()
+        self.assertEqual(JobTitle.objects.count(), 0)
+        out = StringIO()
+        call_command("fastload", self.path, batch_size=4, stdout=out)
+
+        self.assertEqual(snapshot(), before)
+        self.assertIn("core.jobtitle: 25 rows", out.getvalue())
+        # new rows don't collide with the loaded ids
+        portal = Portal.objects.create(
+            user=User.objects.first(), name="New", description="Jobs"
+        )
+        self.assertGreater(portal.id, max(row["id"] for row in before[Portal]))
+
+    def test_parents_before_children(self):
+        order = fastdump.dependency_order(
+            [JobTitle, Applicant, JobDescription, Portal, User]
+        )
+
+        self.assertLess(order.index(User), order.index(Portal))
+        self.assertLess(order.index(Portal), order.index(JobTitle))
+        self.assertLess(order.index(JobDescription), order.index(JobTitle))
+        self.assertLess(order.index(JobTitle), order.index(Applicant))
+
+    def test_manifest(self):
+        seed(users=3, portals=1, job_titles=5, applicants=0)
+
+        fastdump.dump(self.path, ["core.JobTitle", "core.Portal"])
+
+        with open(os.path.join(self.path, fastdump.MANIFEST)) as stream:
+            manifest = json.load(stream)
+        self.assertEqual(
+            [(table["model"], table["rows"]) for table in manifest["tables"]],
+            [("core.portal", 1), ("core.jobtitle", 5)],
+        )
+        self.assertIn("datetime", manifest["tables"][1]["codecs"])
+
+    def test_load_into_existing_rows_is_rolled_back(self):
+        seed(users=3, portals=2, job_titles=5, applicants=0)
+        fastdump.dump(self.path, ["core.Portal"])
+        Portal.objects.order_by("pk").first().delete()
+
+        with self.assertRaises(CommandError):
+            call_command("fastload", self.path, stdout=StringIO())
+
+        self.assertEqual(Portal.objects.count(), 1)
+
+    def test_unknown_column(self):
+        seed(users=2, portals=1, job_titles=0, applicants=0)
+        fastdump.dump(self.path, ["core.Portal"])
+        manifest_path = os.path.join(self.path, fastdump.MANIFEST)
+        with open(manifest_path) as stream:
+            manifest = json.load(stream)
+        manifest["tables"][0]["columns"][-1] = "removed"
+        with open(manifest_path, "w") as stream:
+            json.dump(manifest, stream)
+
+        with self.assertRaisesMessage(CommandError, "has no column removed"):
+            call_command("fastload", self.path, stdout=StringIO())
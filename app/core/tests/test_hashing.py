@@ -0,0 +1,88 @@
+"""
+Tests for password hashing pool
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password as django_check_password
+from django.shortcuts import reverse
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+
+from core import hashing
+
+
+class TestHashingPool(SimpleTestCase):
+    def setUp(self) -> None:
+        hashing.metrics.reset()
+
+    def test_make_and_check_password(self):
+        """
+        Test hashes made on the pool are regular Django password hashes
+        """
+        encoded = hashing.make_password("pass@123")
+
+        self.assertTrue(django_check_password("pass@123", encoded))
+        self.assertTrue(hashing.check_password("pass@123", encoded))
+        self.assertFalse(hashing.check_password("wrong", encoded))
+
+    def test_unusable_password(self):
+        encoded = hashing.make_password(None)
+
+        self.assertFalse(hashing.check_password(None, encoded))
+        self.assertFalse(hashing.check_password("pass@123", encoded))
+
+    def test_metrics_record_wait_time(self):
+        hashing.make_password("pass@123")
+
+        snapshot = hashing.metrics.snapshot()
+        self.assertEqual(snapshot["count"], 1)
+        self.assertGreater(snapshot["hash_seconds_total"], 0)
+        self.assertGreaterEqual(snapshot["wait_seconds_max"], 0)
+        self.assertEqual(snapshot["in_flight"], 0)
+
+    @override_settings(PASSWORD_HASHING_POOL={"MAX_QUEUE": 0})
+    def test_saturated_pool_fails_fast(self):
+        with self.assertRaises(hashing.HashingPoolSaturated):
+            hashing.make_password("pass@123")
+
+        self.assertEqual(hashing.metrics.snapshot()["rejected"], 1)
+
+    @override_settings(PASSWORD_HASHING_POOL={"WORKERS": 0})
+    def test_inline_mode(self):
+        with patch.object(hashing.pool, "submit") as patched_submit:
+            encoded = hashing.make_password("pass@123")
+
+        patched_submit.assert_not_called()
+        self.assertTrue(django_check_password("pass@123", encoded))
+
+    def test_must_update_outdated_hash(self):
+        self.assertFalse(hashing.must_update(hashing.make_password("pass@123")))
+        self.assertTrue(hashing.must_update("pbkdf2_sha256$1000$salt$" + "A" * 44))
+
+
+class TestSaturatedSignupAndLogin(TestCase):
+    """
+    Test user API answers 503 instead of queueing when the pool is full
+    """
+
+    @override_settings(PASSWORD_HASHING_POOL={"MAX_QUEUE": 0})
+    def test_create_user_returns_503(self):
+        payload = {"email": "busy@gmail.com", "password": "busy@123", "name": "Busy"}
+
+        res = self.client.post(reverse("create"), payload)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(
+            get_user_model().objects.filter(email=payload["email"]).exists()
+        )
+
+    def test_token_returns_503(self):
+        payload = {"email": "busy@gmail.com", "password": "busy@123"}
+        get_user_model().objects.create_user(**payload)
+
+        with override_settings(PASSWORD_HASHING_POOL={"MAX_QUEUE": 0}):
+            res = self.client.post(reverse("token"), payload)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -0,0 +1,77 @@
+"""
+Tests for in-process LRU cache
+"""
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core.lru import LRUCache
+
+
+class TestLRUCache(SimpleTestCase):
+    def test_get_and_set(self):
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_least_recently_used_is_evicted(self):
+        """
+        Test cache never grows past `max_entries`
+        """
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # `b` is least recently used now
+        cache.set("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+
+    @patch("core.lru.time.monotonic")
+    def test_entries_expire(self, patched_monotonic):
+        patched_monotonic.return_value = 100.0
+        cache = LRUCache(ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=60)
+
+        patched_monotonic.return_value = 111.0
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+
+    def test_delete_and_clear(self):
+        cache = LRUCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.delete("a")
+        self.assertNotIn("a", cache)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_size_limit(self):
+        """
+        Test total size of the values stays under `max_size`
+        """
+        cache = LRUCache(max_size=10)
+        cache.set("a", b"aaaa")
+        cache.set("b", b"bbbb")
+        cache.set("a", b"aa")
+        cache.set("c", b"cccccc")
+
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.stats()["total_size"], 8)
+        self.assertEqual(cache.evictions, 1)
+
+        cache.set("d", b"d" * 11)
+        self.assertNotIn("d", cache)
+        self.assertEqual(cache.stats()["total_size"], 8)
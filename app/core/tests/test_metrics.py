@@ -0,0 +1,119 @@
+"""
+Tests for Prometheus metrics & /metrics endpoint
+"""
+
+from django.contrib.auth import get_user_model
+from django.shortcuts import reverse
+from django.test import SimpleTestCase, TestCase, override_settings
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+from core import hashing, metrics
+from job.views import JobTitleViewSet
+from user.views import CreateTokenView
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class ViewNameTests(SimpleTestCase):
+    def test_viewset_action(self):
+        view = JobTitleViewSet.as_view({"get": "list", "post": "create"})
+
+        self.assertEqual(metrics.view_name(view, "GET"), "JobTitleViewSet.list")
+        self.assertEqual(metrics.view_name(view, "POST"), "JobTitleViewSet.create")
+
+    def test_api_view(self):
+        view = CreateTokenView.as_view()
+
+        self.assertEqual(metrics.view_name(view, "POST"), "CreateTokenView")
+
+    def test_function_view(self):
+        from core.views import metrics as metrics_view
+
+        self.assertEqual(metrics.view_name(metrics_view, "GET"), "metrics")
+
+
+class MetricsEndpointTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="metrics@gmail.com", password="metrics@123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_request_latency_by_view_and_action(self):
+        labels = {"view": "JobTitleViewSet.list", "method": "GET", "status": "200"}
+        before = sample("http_request_duration_seconds_count", **labels)
+
+        self.client.get(reverse("jobtitle:jobtitle-list"))
+
+        self.assertEqual(
+            sample("http_request_duration_seconds_count", **labels), before + 1
+        )
+
+    def test_db_time_per_view(self):
+        before = sample("db_queries_per_request_sum", view="JobTitleViewSet.list")
+
+        self.client.get(reverse("jobtitle:jobtitle-list"))
+
+        self.assertGreater(
+            sample("db_queries_per_request_sum", view="JobTitleViewSet.list"), before
+        )
+        self.assertGreater(
+            sample("db_query_duration_seconds_count", view="JobTitleViewSet.list"), 0
+        )
+
+    def test_unresolved_requests(self):
+        labels = {"view": "unresolved", "method": "GET", "status": "404"}
+        before = sample("http_request_duration_seconds_count", **labels)
+
+        self.client.get("/does-not-exist/")
+
+        self.assertEqual(
+            sample("http_request_duration_seconds_count", **labels), before + 1
+        )
+
+    def test_in_flight_back_to_zero(self):
+        self.client.get(reverse("jobtitle:jobtitle-list"))
+
+        self.assertEqual(sample("http_requests_in_flight"), 0)
+
+    @override_settings(PASSWORD_HASHING_POOL={"WORKERS": 0})
+    def test_password_hash_time(self):
+        before = sample("password_hash_duration_seconds_count")
+
+        hashing.make_password("metrics@123")
+
+        self.assertEqual(sample("password_hash_duration_seconds_count"), before + 1)
+
+    def test_metrics_endpoint(self):
+        self.client.get(reverse("jobtitle:jobtitle-list"))
+
+        res = self.client.get(reverse("metrics"))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/plain"))
+        self.assertIn(b'view="JobTitleViewSet.list"', res.content)
+        self.assertIn(b"password_hash_duration_seconds_bucket", res.content)
+
+    def test_metrics_endpoint_forbidden_from_outside(self):
+        res = self.client.get(reverse("metrics"), REMOTE_ADDR="203.0.113.7")
+
+        self.assertEqual(res.status_code, 403)
+
+    @override_settings(METRICS={"TOKEN": "scrape", "ALLOWED_IPS": ["10.0.0.0/8"]})
+    def test_metrics_endpoint_token_or_network(self):
+        url = reverse("metrics")
+
+        for address, authorization, expected in (
+            ("203.0.113.7", "Bearer scrape", 200),
+            ("203.0.113.7", "Bearer wrong", 403),
+            ("10.1.2.3", "", 200),
+            ("127.0.0.1", "", 403),
+        ):
+            res = self.client.get(
+                url, REMOTE_ADDR=address, HTTP_AUTHORIZATION=authorization
+            )
+            self.assertEqual(res.status_code, expected, (address, authorization))
@@ -0,0 +1,147 @@
+"""
+Tests for per-request SQL instrumentation middleware
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import HttpResponse
+from django.shortcuts import reverse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.middleware import (
+    fingerprint,
+    install,
+    query_instrumentation_middleware,
+)
+from core.models import Portal
+
+
+def run_queries(times):
+    def view(request):
+        for pk in range(times):
+            list(get_user_model().objects.filter(pk=pk))
+        return HttpResponse()
+
+    return view
+
+
+def run_queries_async(times):
+    async def view(request):
+        for pk in range(times):
+            await get_user_model().objects.filter(pk=pk).afirst()
+        return HttpResponse()
+
+    return view
+
+
+class QueryInstrumentationMiddlewareTests(TestCase):
+    def setUp(self) -> None:
+        self.request = RequestFactory().get("/api/jobtitle/jobtitles/")
+        # the test connection exists before any middleware instance, the async
+        # test builds its middleware where that connection isn't listed
+        install(connection)
+
+    def test_headers_match_executed_queries(self):
+        user = get_user_model().objects.create_user(
+            email="sql@gmail.com", password="sql@123"
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = client.get(reverse("me"))
+
+        self.assertEqual(res["X-DB-Queries"], str(len(queries)))
+        self.assertRegex(res["Server-Timing"], r'^db;dur=[\d.]+;desc="\d+ queries"$')
+
+    def test_stats_on_request(self):
+        query_instrumentation_middleware(run_queries(3))(self.request)
+
+        stats = self.request.sql_stats
+        self.assertEqual(stats.count, 3)
+        self.assertGreater(stats.duration, 0)
+        self.assertIn("SELECT", stats.slowest_sql)
+        self.assertEqual(list(stats.duplicates().values()), [3])
+
+    @override_settings(SQL_INSTRUMENTATION={"N_PLUS_ONE_THRESHOLD": 5})
+    def test_n_plus_one_logged(self):
+        with self.assertLogs("core.sql", "WARNING") as logs:
+            query_instrumentation_middleware(run_queries(5))(self.request)
+
+        self.assertIn(
+            "Possible N+1 on GET /api/jobtitle/jobtitles/: 5 x", logs.output[0]
+        )
+
+    @override_settings(SQL_INSTRUMENTATION={"N_PLUS_ONE_THRESHOLD": 5})
+    def test_below_threshold_not_logged(self):
+        with self.assertNoLogs("core.sql", "WARNING"):
+            query_instrumentation_middleware(run_queries(4))(self.request)
+
+    @override_settings(SQL_INSTRUMENTATION={"HEADERS": False})
+    def test_headers_disabled(self):
+        response = query_instrumentation_middleware(run_queries(1))(self.request)
+
+        self.assertFalse(response.has_header("X-DB-Queries"))
+
+    async def test_async_view_queries_counted(self):
+        response = await query_instrumentation_middleware(run_queries_async(2))(
+            self.request
+        )
+
+        self.assertEqual(response["X-DB-Queries"], "2")
+
+    def test_queries_outside_requests_ignored(self):
+        query_instrumentation_middleware(run_queries(1))(self.request)
+
+        list(get_user_model().objects.all())
+
+        self.assertEqual(self.request.sql_stats.count, 1)
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) LIMIT 21'),
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s) LIMIT 50'),
+        )
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s)'),
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s)'),
+        )
+
+    @override_settings(SQL_INSTRUMENTATION={"N_PLUS_ONE_THRESHOLD": 5})
+    def test_batches_not_logged(self):
+        def view(request):
+            users = get_user_model().objects.order_by("id")
+            for start in range(0, 12, 2):
+                # IN batches, the last one of a single value
+                list(users.filter(pk__in=range(start, min(start + 2, 11))))
+                # keyset pages
+                list(users.filter(pk__gt=start)[:2])
+            return HttpResponse()
+
+        with self.assertNoLogs("core.sql", "WARNING"):
+            query_instrumentation_middleware(view)(self.request)
+
+    @override_settings(SQL_INSTRUMENTATION={"N_PLUS_ONE_THRESHOLD": 5})
+    def test_bulk_create_of_job_titles_not_logged(self):
+        user = get_user_model().objects.create_user(
+            email="bulk@gmail.com", password="bulk@123"
+        )
+        portal = Portal.objects.create(user=user, name="Naukri", description="")
+        client = APIClient()
+        client.force_authenticate(user)
+        payload = [
+            {
+                "title": f"Python Developer {number}",
+                "portal": portal.id,
+                "job_description": {
+                    "role": "Developer",
+                    "description_text": f"python django rest apis {number}",
+                },
+            }
+            for number in range(20)
+        ]
+
+        with self.assertNoLogs("core.sql", "WARNING"):
+            client.post(reverse("jobtitle:jobtitle-bulk"), payload, format="json")
@@ -0,0 +1,80 @@
+"""
+Test seed_data management command
+"""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import Applicant, JobDescription, JobTitle, Portal, User
+
+
+def seed(**options):
+    defaults = {
+        "users": 20,
+        "portals": 5,
+        "job_titles": 50,
+        "applicants": 10,
+        "batch_size": 7,
+        "stdout": StringIO(),
+    }
+    defaults.update(options)
+    call_command("seed_data", **defaults)
+
+
+def snapshot():
+    """
+    Generated content without primary keys (those depend on existing rows)
+    """
+    return [
+        (job_title.title, job_title.job_description.role, job_title.last_updated)
+        for job_title in JobTitle.objects.select_related("job_description").order_by(
+            "id"
+        )
+    ]
+
+
+class SeedDataTests(TestCase):
+    def test_seed_counts(self):
+        seed()
+
+        self.assertEqual(User.objects.count(), 30)
+        self.assertEqual(Applicant.objects.count(), 10)
+        self.assertEqual(Portal.objects.count(), 5)
+        self.assertEqual(JobDescription.objects.count(), 50)
+        self.assertEqual(JobTitle.objects.count(), 50)
+
+    def test_job_title_matches_description(self):
+        seed()
+
+        for job_title in JobTitle.objects.select_related("job_description"):
+            self.assertEqual(job_title.user_id, job_title.job_description.user_id)
+            self.assertIn(job_title.job_description.role, job_title.title)
+            self.assertLessEqual(len(job_title.title), 25)
+
+    def test_applicants_are_usable_users(self):
+        seed(password="seed@123")
+
+        applicant = Applicant.objects.select_related("applied_for").first()
+        self.assertTrue(applicant.is_applicant)
+        self.assertTrue(applicant.check_password("seed@123"))
+
+    def test_deterministic_by_seed(self):
+        seed(seed=7)
+        first = snapshot()
+        User.objects.all().delete()
+
+        seed(seed=7)
+        self.assertEqual(snapshot(), first)
+
+        User.objects.all().delete()
+        seed(seed=8)
+        self.assertNotEqual(snapshot(), first)
+
+    def test_seed_twice_appends(self):
+        seed()
+        seed()
+
+        self.assertEqual(JobTitle.objects.count(), 100)
+        self.assertEqual(User.objects.count(), 60)
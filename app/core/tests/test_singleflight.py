@@ -0,0 +1,163 @@
+"""
+Tests for single-flight groups (threads & asyncio)
+"""
+
+import asyncio
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from core.singleflight import (
+    FALLBACK,
+    LEADER,
+    SHARED,
+    TIMEOUT,
+    AsyncSingleFlight,
+    SingleFlight,
+)
+
+
+class SingleFlightTests(SimpleTestCase):
+    def run_concurrently(self, group, fn, count, timeout=5):
+        """
+        Calls ``group.do("key", fn)`` from `count` threads, the first one
+        leads (``fn`` should block until the test releases it)
+        """
+        results = []
+        errors = []
+
+        def call():
+            try:
+                results.append(group.do("key", fn, timeout))
+            except Exception as error:
+                errors.append(error)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        while not len(group):
+            pass
+        threads = [threading.Thread(target=call) for _ in range(count - 1)]
+        for thread in threads:
+            thread.start()
+        # let them reach the flight
+        time.sleep(0.1)
+        return leader, threads, results, errors
+
+    def test_concurrent_calls_share_result(self):
+        group = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return "result"
+
+        leader, threads, results, _ = self.run_concurrently(group, compute, 5)
+        # every waiter is parked on the flight, then the leader finishes
+        release.set()
+        for thread in [leader, *threads]:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(
+            sorted(outcome for _, outcome in results), [LEADER] + [SHARED] * 4
+        )
+        self.assertEqual({result for result, _ in results}, {"result"})
+        self.assertEqual(len(group), 0)
+
+    def test_leader_failure_falls_back(self):
+        group = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(5)
+                raise RuntimeError("database went away")
+            return "result"
+
+        leader, threads, results, errors = self.run_concurrently(group, compute, 2)
+        release.set()
+        for thread in [leader, *threads]:
+            thread.join()
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(results, [("result", FALLBACK)])
+
+    def test_timeout(self):
+        group = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(5)
+                return "slow"
+            return "fast"
+
+        leader, threads, results, _ = self.run_concurrently(
+            group, compute, 2, timeout=0.01
+        )
+        threads[0].join()
+        release.set()
+        leader.join()
+
+        self.assertEqual(results, [("fast", TIMEOUT), ("slow", LEADER)])
+
+    def test_sequential_calls_each_lead(self):
+        group = SingleFlight()
+
+        self.assertEqual(group.do("key", lambda: 1), (1, LEADER))
+        self.assertEqual(group.do("key", lambda: 2), (2, LEADER))
+
+
+class AsyncSingleFlightTests(SimpleTestCase):
+    async def test_concurrent_calls_share_result(self):
+        group = AsyncSingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(group.do("key", compute) for _ in range(5)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [("result", LEADER)] + [("result", SHARED)] * 4)
+        self.assertEqual(len(group), 0)
+
+    async def test_leader_cancelled_falls_back(self):
+        group = AsyncSingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            return "result"
+
+        leader = asyncio.create_task(group.do("key", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(group.do("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        self.assertEqual(await waiter, ("result", FALLBACK))
+
+    async def test_timeout(self):
+        group = AsyncSingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.2)
+            return "slow"
+
+        async def fast():
+            return "fast"
+
+        leader = asyncio.create_task(group.do("key", slow))
+        await asyncio.sleep(0)
+
+        self.assertEqual(await group.do("key", fast, 0.01), ("fast", TIMEOUT))
+        self.assertEqual(await leader, ("slow", LEADER))
@@ -0,0 +1,22 @@
+"""
+Views of the core app
+"""
+
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+from core import metrics as core_metrics
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus scrape endpoint, see core/metrics.py
+    Allowed addresses or the ``METRICS["TOKEN"]`` bearer token only
+    TODO - Refer
+    https://prometheus.io/docs/instrumenting/exposition_formats/
+    """
+    if not core_metrics.is_scrape_allowed(request):
+        return HttpResponseForbidden()
+    body, content_type = core_metrics.render()
+    return HttpResponse(body, content_type=content_type)
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class JobConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "job"
+
+    def ready(self):
+        """
+        Connect signal receivers & register system checks once app registry
+        is ready
+        """
+        from job import checks, signals  # noqa
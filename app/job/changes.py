@@ -0,0 +1,118 @@
+"""
+Change feed of job postings
+
+Every create/update/delete of a JobTitle (and update of its description or
+portal) adds a `core.models.JobTitleChange` row in the same transaction
+(job/signals.py, bulk create in job/serializers.py). Its auto increment id
+is the change token, a client syncs with
+
+    GET /api/jobtitle/jobtitles/changes/             -> {"next": 41, ...}
+    GET /api/jobtitle/jobtitles/                     (full list, once)
+    GET /api/jobtitle/jobtitles/changes/?since=41    -> only what changed
+
+and keeps the ``next`` token of every response for the following call
+(``has_more`` means call again right away).
+
+Ids are given out on insert but become visible on commit, so a transaction
+still open could hold a smaller id than one already committed and a client
+past that id would never see it. `record` locks the user row
+(``SELECT ... FOR UPDATE``) before inserting and the lock is held until
+commit: changes of one user are written one transaction after another and
+their ids become visible in order.
+
+TODO - Refer
+https://developers.google.com/calendar/api/guides/sync
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from core.models import JobTitleChange
+
+Action = JobTitleChange.Action
+
+
+def get_config():
+    return {
+        "LIMIT": 500,
+        "MAX_LIMIT": 5000,
+        **getattr(settings, "JOB_TITLE_CHANGES", {}),
+    }
+
+
+def record(job_titles, action):
+    """
+    Add a change of `job_titles`, inside the transaction which changed them
+    """
+    user_ids = sorted({job_title.user_id for job_title in job_titles})
+    with transaction.atomic(savepoint=False):
+        # same order in every transaction, no deadlock between two of them
+        list(
+            get_user_model()
+            .objects.select_for_update()
+            .filter(pk__in=user_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        JobTitleChange.objects.bulk_create(
+            [
+                JobTitleChange(
+                    user_id=job_title.user_id, job_title_id=job_title.pk, action=action
+                )
+                for job_title in job_titles
+            ]
+        )
+
+
+def latest_token(user):
+    """
+    Token to start syncing from, after the current state was downloaded
+    """
+    token = (
+        JobTitleChange.objects.filter(user_id=user.pk)
+        .order_by("-id")
+        .values_list("id", flat=True)
+        .first()
+    )
+    return token or 0
+
+
+def changes(user, since, limit):
+    """
+    Job title ids changed after token `since`
+    ``{"next": 52, "has_more": False, "created": [..], "updated": [..],
+    "deleted": [..]}``
+
+    Several changes of one posting collapse into one entry, a posting both
+    created & deleted in the range isn't mentioned at all
+    """
+    rows = list(
+        JobTitleChange.objects.filter(user_id=user.pk, id__gt=since)
+        .order_by("id")
+        .values_list("id", "job_title_id", "action")[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    first, last = {}, {}
+    for _, pk, action in rows:
+        first.setdefault(pk, action)
+        last[pk] = action
+
+    result = {
+        "next": rows[-1][0] if rows else since,
+        "has_more": has_more,
+        "created": [],
+        "updated": [],
+        "deleted": [],
+    }
+    for pk, action in last.items():
+        if action == Action.DELETED:
+            if first[pk] != Action.CREATED:
+                result["deleted"].append(pk)
+        elif first[pk] == Action.CREATED:
+            result["created"].append(pk)
+        else:
+            result["updated"].append(pk)
+    return result
@@ -0,0 +1,20 @@
+"""
+System checks of job application, registered in `JobConfig.ready()`
+"""
+
+from django.core import checks
+
+from core.checks import check_shared_cache
+from job import response_cache
+
+
+@checks.register(checks.Tags.caches)
+def check_response_cache(app_configs, **kwargs):
+    """
+    Versions bumped by one process must invalidate the responses cached by
+    every other one
+    """
+    config = response_cache.get_config()
+    if not config["ENABLED"]:
+        return []
+    return check_shared_cache("RESPONSE_CACHE", config["CACHE_ALIAS"], "job.E001")
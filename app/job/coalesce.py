@@ -0,0 +1,135 @@
+"""
+Coalescing of identical concurrent GETs of job titles (single-flight)
+
+When many clients ask for the same posting at the same moment only one
+request runs the queries & the serializer, the others wait for it and get
+the same response (core/singleflight.py):
+
+- WSGI (threads): `flights`, used by ``cache_response`` on cache misses
+  (job/response_cache.py), keyed by the versioned cache key
+- ASGI: `CoalescedGets` in front of Django's handler (app/asgi.py). Django
+  runs sync views one at a time in its thread-sensitive executor, so
+  concurrent requests have to be joined before they get there. Keyed by the
+  request line & the headers the response depends on (credentials, accept,
+  conditional headers, host).
+
+A waiter runs its request itself after ``SINGLE_FLIGHT["TIMEOUT"]`` seconds,
+or when the leader failed (exception, 5xx, client gone). Responses setting
+cookies or bigger than ``MAX_BYTES`` aren't shared.
+
+TODO - Refer
+https://asgi.readthedocs.io/en/latest/specs/www.html
+"""
+
+import hashlib
+import re
+
+from django.conf import settings
+
+from core import metrics
+from core.singleflight import FALLBACK, SHARED, AsyncSingleFlight, SingleFlight
+
+# list & detail of /api/jobtitle/jobtitles/, not the streamed exports
+PATH = re.compile(r"^/api/jobtitle/jobtitles/(\d+/)?$")
+
+# request headers the response depends on
+HEADERS = (
+    b"authorization",
+    b"cookie",
+    b"accept",
+    b"accept-language",
+    b"host",
+    b"if-none-match",
+    b"if-modified-since",
+    b"x-forwarded-host",
+    b"x-forwarded-proto",
+)
+
+
+def get_config():
+    return {
+        "ENABLED": True,
+        "TIMEOUT": 5,
+        "MAX_BYTES": 2**20,
+        **getattr(settings, "SINGLE_FLIGHT", {}),
+    }
+
+
+flights = SingleFlight()
+async_flights = AsyncSingleFlight()
+
+
+def request_key(scope):
+    headers = sorted(
+        (name, value) for name, value in scope["headers"] if name.lower() in HEADERS
+    )
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (
+        scope.get("scheme", "http").encode(),
+        scope["path"].encode(),
+        scope["query_string"],
+        *(b"%s: %s" % header for header in headers),
+    ):
+        digest.update(part + b"\n")
+    return digest.hexdigest()
+
+
+class CoalescedGets:
+    """
+    ASGI application coalescing identical GETs of `PATH`, everything else
+    goes straight to `application`
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        config = get_config()
+        if (
+            not config["ENABLED"]
+            or scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not PATH.match(scope["path"])
+        ):
+            return await self.application(scope, receive, send)
+
+        messages, outcome = await async_flights.do(
+            request_key(scope),
+            lambda: self.forward(scope, receive, send, config["MAX_BYTES"]),
+            config["TIMEOUT"],
+        )
+        if outcome == SHARED and messages is None:
+            # the leader's response can't be shared
+            outcome = FALLBACK
+            await self.application(scope, receive, send)
+        elif outcome == SHARED:
+            for message in messages:
+                await send(dict(message))
+        metrics.SINGLE_FLIGHT_REQUESTS.labels("asgi", outcome).inc()
+
+    async def forward(self, scope, receive, send, max_bytes):
+        """
+        Runs the request, returns the response messages to share or None
+        """
+        messages = []
+        size = 0
+
+        async def capture(message):
+            nonlocal messages, size
+            if messages is not None:
+                if message["type"] == "http.response.start":
+                    if message["status"] >= 500 or any(
+                        name.lower() == b"set-cookie"
+                        for name, _ in message.get("headers", [])
+                    ):
+                        messages = None
+                else:
+                    size += len(message.get("body", b""))
+                    if size > max_bytes:
+                        messages = None
+            if messages is not None:
+                messages.append(message)
+            await send(message)
+
+        await self.application(scope, receive, capture)
+        return messages
@@ -0,0 +1,95 @@
+"""
+ETag & Last-Modified of the job title list and detail views
+
+Computed from versions instead of hashing the rendered body, so a
+conditional GET answered with 304 costs one index lookup, no row fetch and
+no serializer:
+
+- list: latest `JobTitleChange` of the user (job/changes.py), every
+  create/update/delete of one of their postings moves it
+- detail: `JobTitle.last_updated`, moved by every update of the posting, its
+  description or its portal (rendered with ``?expand=portal``)
+
+The tags are strong, they also cover the request path with its query string
+(filters, cursor) & the negotiated media type. Used with Django's
+``condition`` decorator, which answers ``If-None-Match`` /
+``If-Modified-Since`` before the view runs.
+
+TODO - Refer
+https://docs.djangoproject.com/en/4.1/topics/conditional-view-processing/
+"""
+
+import hashlib
+
+from core.models import JobTitle, JobTitleChange
+
+
+def make_etag(*parts):
+    digest = hashlib.blake2b(
+        "\n".join(str(part) for part in parts).encode(), digest_size=16
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def collection_version(request):
+    """
+    ``(token, changed_at)`` of the latest change of the user's postings,
+    read once per request
+    """
+    if not hasattr(request, "_job_title_version"):
+        request._job_title_version = (
+            JobTitleChange.objects.filter(user_id=request.user.pk)
+            .order_by("-id")
+            .values_list("id", "changed_at")
+            .first()
+        ) or (0, None)
+    return request._job_title_version
+
+
+def list_etag(request, *args, **kwargs):
+    token, _ = collection_version(request)
+    return make_etag(
+        "list",
+        request.user.pk,
+        token,
+        request.get_full_path(),
+        request.accepted_media_type,
+    )
+
+
+def list_last_modified(request, *args, **kwargs):
+    return collection_version(request)[1]
+
+
+def row_version(request, pk):
+    """
+    `last_updated` of the user's job title, None when there's no such row
+    """
+    if not hasattr(request, "_job_title_row_version"):
+        try:
+            request._job_title_row_version = (
+                JobTitle.objects.filter(pk=pk, user_id=request.user.pk)
+                .values_list("last_updated", flat=True)
+                .first()
+            )
+        except (TypeError, ValueError):
+            # not a valid id, the view answers 404
+            request._job_title_row_version = None
+    return request._job_title_row_version
+
+
+def detail_etag(request, pk=None, **kwargs):
+    last_updated = row_version(request, pk)
+    if last_updated is None:
+        return None
+    return make_etag(
+        "detail",
+        pk,
+        last_updated.isoformat(),
+        request.get_full_path(),
+        request.accepted_media_type,
+    )
+
+
+def detail_last_modified(request, pk=None, **kwargs):
+    return row_version(request, pk)
@@ -0,0 +1,304 @@
+"""
+Near-duplicate job descriptions (same posting on several portals)
+
+- Shingles: every run of ``SHINGLE_SIZE`` consecutive words of ``role`` &
+  ``description_text``, hashed to 32 bits.
+- MinHash: ``NUM_PERM`` hash functions (multiply-shift), the signature keeps
+  the smallest hash of the shingles for each of them. Two signatures agree on
+  a position with probability = Jaccard similarity of the shingle sets.
+- LSH: the signature is cut in ``BANDS`` bands, each band is hashed to a
+  bucket (`core.models.JobDescriptionBucket`). Descriptions sharing a bucket
+  are candidates, which are kept when their signatures agree on at least
+  ``THRESHOLD`` of the positions. Finding the duplicates of a description
+  reads only its buckets, so checking N descriptions is ~linear in N.
+
+Near-duplicates of one user form a cluster (`JobDescriptionSignature.cluster`),
+matches are transitive. Descriptions are checked when saved (job/signals.py)
+or all at once with ``python manage.py find_duplicates``.
+
+TODO - Refer
+http://infolab.stanford.edu/~ullman/mmds/ch3n.pdf (3.3 MinHash, 3.4 LSH)
+"""
+
+import hashlib
+import zlib
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+
+from core.models import JobDescription, JobDescriptionBucket, JobDescriptionSignature
+from job import search
+
+# ids per ``IN (...)`` lookup
+IN_BATCH = 500
+
+
+def get_config():
+    return {
+        "SHINGLE_SIZE": 3,
+        "NUM_PERM": 128,
+        "BANDS": 16,
+        "THRESHOLD": 0.8,
+        "SEED": 1,
+        **getattr(settings, "NEAR_DUPLICATES", {}),
+    }
+
+
+def hash_functions(config):
+    rng = np.random.default_rng(config["SEED"])
+    size = config["NUM_PERM"]
+    # odd multipliers, ``(a * x + b) mod 2**64 >> 32`` is a universal hash
+    multipliers = rng.integers(1, 2**63, size=size, dtype=np.uint64) | np.uint64(1)
+    increments = rng.integers(0, 2**63, size=size, dtype=np.uint64)
+    return multipliers, increments
+
+
+def shingles(job_description, size):
+    words = search.TOKEN.findall(
+        f"{job_description.role} {job_description.description_text}".lower()
+    )
+    if not words:
+        return set()
+    runs = range(max(1, len(words) - size + 1))
+    return {zlib.crc32(" ".join(words[i : i + size]).encode()) for i in runs}
+
+
+def signature(job_description, config, functions):
+    """
+    MinHash signature (uint32 array), None for a description without words
+    """
+    hashed = shingles(job_description, config["SHINGLE_SIZE"])
+    if not hashed:
+        return None
+    multipliers, increments = functions
+    values = np.fromiter(hashed, dtype=np.uint64, count=len(hashed))
+    # (functions x shingles) matrix, uint64 arithmetic wraps around mod 2**64
+    hashes = (multipliers[:, None] * values[None, :] + increments[:, None]) >> 32
+    return hashes.min(axis=1).astype(np.uint32)
+
+
+def buckets(signature, bands):
+    """
+    One 63 bit bucket per band, the band number is part of the hash
+    """
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                band.tobytes(), digest_size=8, person=number.to_bytes(2, "little")
+            ).digest(),
+            "little",
+            signed=True,
+        )
+        for number, band in enumerate(np.split(signature, bands))
+    ]
+
+
+def similarity(first, second):
+    """
+    Estimated Jaccard similarity of two signatures
+    """
+    return float(np.mean(first == second))
+
+
+class UnionFind:
+    def __init__(self):
+        self.parents = {}
+
+    def find(self, item):
+        root = item
+        while self.parents.setdefault(root, root) != root:
+            root = self.parents[root]
+        # path compression, the next find is one step
+        while item != root:
+            self.parents[item], item = root, self.parents[item]
+        return root
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            # the smaller id stays the root, clusters are labelled by it
+            self.parents[max(first, second)] = min(first, second)
+
+
+def forget(ids):
+    """
+    Clusters labelled by one of `ids` take the smallest id of their other
+    descriptions, so a label is always the id of a description in it
+    """
+    remaining = defaultdict(list)
+    rows = (
+        JobDescriptionSignature.objects.filter(cluster__in=ids)
+        .exclude(job_description_id__in=ids)
+        .values_list("cluster", "job_description_id")
+    )
+    for cluster, pk in rows:
+        remaining[cluster].append(pk)
+    for cluster, pks in remaining.items():
+        JobDescriptionSignature.objects.filter(
+            cluster=cluster, job_description_id__in=pks
+        ).update(cluster=min(pks))
+
+
+def unindex_descriptions(ids):
+    """
+    Drop signatures & buckets of `ids` (deleted or edited descriptions),
+    their clusters are relabelled first
+    """
+    with transaction.atomic():
+        forget(ids)
+        JobDescriptionBucket.objects.filter(job_description_id__in=ids).delete()
+        JobDescriptionSignature.objects.filter(job_description_id__in=ids).delete()
+
+
+def index_descriptions(job_descriptions, batch_size=1000):
+    """
+    (Re)compute signatures of saved descriptions and merge them into the
+    clusters of their near-duplicates
+    """
+    config = get_config()
+    functions = hash_functions(config)
+    bands = config["BANDS"]
+
+    new = {}
+    for job_description in job_descriptions:
+        value = signature(job_description, config, functions)
+        if value is not None:
+            new[job_description.pk] = (job_description.user_id, value)
+
+    with transaction.atomic():
+        # an edited description may have moved out of its cluster
+        unindex_descriptions(
+            [job_description.pk for job_description in job_descriptions]
+        )
+        if not new:
+            return
+
+        keys = {pk: buckets(value, bands) for pk, (_, value) in new.items()}
+        members = defaultdict(set)
+        for pk, (user_id, _) in new.items():
+            for key in keys[pk]:
+                members[user_id, key].add(pk)
+
+        users = {user_id for user_id, _ in new.values()}
+        all_keys = list({key for pk_keys in keys.values() for key in pk_keys})
+        for start in range(0, len(all_keys), IN_BATCH):
+            stored = JobDescriptionBucket.objects.filter(
+                user_id__in=users, bucket__in=all_keys[start : start + IN_BATCH]
+            ).values_list("user_id", "bucket", "job_description_id")
+            for user_id, key, pk in stored:
+                if (user_id, key) in members:
+                    members[user_id, key].add(pk)
+
+        candidates = list({pk for group in members.values() for pk in group} - set(new))
+        existing = {}
+        for start in range(0, len(candidates), IN_BATCH):
+            rows = JobDescriptionSignature.objects.filter(
+                job_description_id__in=candidates[start : start + IN_BATCH]
+            ).values_list("job_description_id", "user_id", "signature", "cluster")
+            for pk, user_id, value, cluster in rows:
+                existing[pk] = (user_id, np.frombuffer(value, np.uint32), cluster)
+
+        def signature_of(pk):
+            return new[pk][1] if pk in new else existing[pk][1]
+
+        # members of a stored cluster are joined through its label
+        components = UnionFind()
+        for pk, (_, _, cluster) in existing.items():
+            components.union(pk, cluster)
+        # distinct candidates of every new description over all of its bands,
+        # each pair is compared once
+        neighbours = defaultdict(set)
+        for group in members.values():
+            for pk in group & new.keys():
+                neighbours[pk].update(group)
+        for pk in sorted(neighbours):
+            for other in sorted(neighbours[pk]):
+                if other == pk or (other in new and other < pk):
+                    # compared from the side of `other` already
+                    continue
+                root = components.find(pk)
+                if root == components.find(other):
+                    continue
+                if similarity(signature_of(pk), signature_of(other)) >= (
+                    config["THRESHOLD"]
+                ):
+                    components.union(root, other)
+
+        # clusters joined by the new descriptions take the smallest label
+        relabel = defaultdict(list)
+        for pk, (user_id, _, cluster) in existing.items():
+            label = components.find(cluster)
+            if label != cluster:
+                relabel[user_id, label].append(cluster)
+        for (user_id, label), old in relabel.items():
+            JobDescriptionSignature.objects.filter(
+                user_id=user_id, cluster__in=set(old)
+            ).update(cluster=label)
+
+        JobDescriptionSignature.objects.bulk_create(
+            (
+                JobDescriptionSignature(
+                    job_description_id=pk,
+                    user_id=user_id,
+                    signature=value.tobytes(),
+                    cluster=components.find(pk),
+                )
+                for pk, (user_id, value) in new.items()
+            ),
+            batch_size=batch_size,
+        )
+        JobDescriptionBucket.objects.bulk_create(
+            (
+                JobDescriptionBucket(user_id=user_id, job_description_id=pk, bucket=key)
+                for pk, (user_id, _) in new.items()
+                for key in keys[pk]
+            ),
+            batch_size=batch_size,
+        )
+
+
+def rebuild(batch_size=2000):
+    """
+    Check every description from scratch, returns number of descriptions
+    """
+    JobDescriptionBucket.objects.all().delete()
+    JobDescriptionSignature.objects.all().delete()
+
+    checked = 0
+    last_id = 0
+    while True:
+        # keyset batches, each batch is matched against the previous ones
+        batch = list(
+            JobDescription.objects.filter(id__gt=last_id)
+            .only("id", "user_id", "role", "description_text")
+            .order_by("id")[:batch_size]
+        )
+        if not batch:
+            return checked
+        last_id = batch[-1].id
+        index_descriptions(batch, batch_size=batch_size)
+        checked += len(batch)
+
+
+def clusters(user, limit=50):
+    """
+    ``(label, job description ids)`` of the `limit` newest clusters of `user`
+    with more than one description, ``[(12, [12, 15]), (3, [3, 4, 9]), ...]``
+    """
+    labels = list(
+        JobDescriptionSignature.objects.filter(user=user)
+        .values_list("cluster", flat=True)
+        .annotate(size=Count("job_description"))
+        .filter(size__gt=1)
+        .order_by("-cluster")[:limit]
+    )
+    grouped = defaultdict(list)
+    rows = JobDescriptionSignature.objects.filter(
+        user=user, cluster__in=labels
+    ).values_list("cluster", "job_description_id")
+    for cluster, pk in rows.order_by("-cluster", "job_description_id"):
+        grouped[cluster].append(pk)
+    return list(grouped.items())
@@ -0,0 +1,130 @@
+"""
+Streaming export of job postings (JSON lines, CSV or columnar JSON)
+
+Rows are read in keyset batches (``WHERE user_id = ? AND id < ? ORDER BY id
+DESC LIMIT n``, `core_jobtitle_user_id_desc` index) and encoded batch by
+batch into the body of a ``StreamingHttpResponse``, so memory stays flat
+whatever the number of rows and the first bytes are sent after the first
+batch. ``QuerySet.iterator()`` alone wouldn't do on MySQL, mysqlclient
+buffers the whole result set on the client.
+
+TODO - Refer
+https://docs.djangoproject.com/en/4.1/howto/outputting-csv/#streaming-large-csv-files
+https://docs.djangoproject.com/en/4.1/ref/models/querysets/#iterator
+https://jsonlines.org/
+"""
+
+import csv
+import io
+
+from rest_framework.utils.encoders import JSONEncoder
+
+# (name in the export, lookup from JobTitle)
+COLUMNS = [
+    ("id", "id"),
+    ("title", "title"),
+    ("last_updated", "last_updated"),
+    ("portal", "portal_id"),
+    ("portal_name", "portal__name"),
+    ("job_description", "job_description_id"),
+    ("role", "job_description__role"),
+    ("description_text", "job_description__description_text"),
+    ("published_date", "job_description__published_date"),
+]
+
+NAMES = [name for name, _ in COLUMNS]
+
+# same datetime format as the serializers (ISO 8601, "Z" for UTC)
+encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def rows(queryset, batch_size=2000):
+    """
+    Tuples of `COLUMNS` of a queryset ordered by ``-id``, one batch at a time
+    """
+    lookups = [lookup for _, lookup in COLUMNS]
+    last_id = None
+    while True:
+        batch = queryset if last_id is None else queryset.filter(id__lt=last_id)
+        batch = list(batch.values_list(*lookups)[:batch_size])
+        if not batch:
+            return
+        last_id = batch[-1][0]
+        yield batch
+
+
+def jsonl(batches):
+    for batch in batches:
+        yield "".join(
+            encoder.encode(dict(zip(NAMES, row))) + "\n" for row in batch
+        ).encode()
+
+
+def csv_value(value):
+    if value is None or isinstance(value, (str, int)):
+        return value
+    # datetimes like in JSON
+    return encoder.default(value)
+
+
+def csv_rows(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(NAMES)
+    for batch in batches:
+        writer.writerows([csv_value(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    # header of an empty export
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def columnar(batches, names=NAMES, dictionary=(), head=None):
+    """
+    ``{"columns": [...], "rows": [[...], ...], "dictionaries": {...}}``
+    encoded batch by batch, members of `head` (``next``, ...) go first
+
+    Values of the `dictionary` columns (e.g. ``portal_name``) are replaced
+    by their index in ``dictionaries[<column>]``, each distinct value is
+    sent once. The dictionaries are only complete after the last row, so
+    they come after ``rows``.
+    """
+    indexes = [index for index, name in enumerate(names) if name in dictionary]
+    dictionaries = {index: {} for index in indexes}
+
+    members = [
+        f"{encoder.encode(key)}:{encoder.encode(value)},"
+        for key, value in (head or {}).items()
+    ]
+    columns = encoder.encode(list(names))
+    yield f'{{{"".join(members)}"columns":{columns},"rows":['.encode()
+
+    separator = ""
+    for batch in batches:
+        if dictionaries:
+            batch = [dictionary_encode(row, dictionaries) for row in batch]
+        chunk = ",".join(encoder.encode(row) for row in batch)
+        if chunk:
+            yield (separator + chunk).encode()
+            separator = ","
+
+    tail = "]"
+    if dictionaries:
+        values = {names[index]: list(codes) for index, codes in dictionaries.items()}
+        tail += f',"dictionaries":{encoder.encode(values)}'
+    yield (tail + "}").encode()
+
+
+def dictionary_encode(row, dictionaries):
+    row = list(row)
+    for index, codes in dictionaries.items():
+        value = row[index]
+        # nested objects (``?expand=``) stay as they are
+        if value is not None and not isinstance(value, (dict, list)):
+            row[index] = codes.setdefault(value, len(codes))
+    return row
+
+
+ENCODERS = {"jsonl": jsonl, "csv": csv_rows, "columnar": columnar}
@@ -0,0 +1,173 @@
+"""
+Compiled read-only serializers
+
+DRF builds a model instance per row and then walks every field of the
+serializer for it (``get_attribute``, ``to_representation``, None checks)
+which is most of the CPU of a big list response. `compile_serializer` does
+that walk once: the readable ``Meta.fields`` of a ModelSerializer become
+the columns of a ``values_list()`` and a generated function like
+
+    def row_to_dict(row):
+        return {"id": row[0], "title": row[1]}
+
+turns every tuple into what the serializer would have returned. Fields
+whose representation of a database value is the value itself (text,
+integers, booleans, ids of relations) are copied as is, ISO 8601 datetimes
+look the current time zone up once per response instead of once per value,
+every other field keeps its own ``to_representation``. The output stays
+identical to the serializer's (job/tests/test_fastpath.py).
+
+Only flat serializers compile: nested serializers, method fields &
+``source="*"`` raise TypeError.
+
+TODO - Refer
+https://www.django-rest-framework.org/api-guide/serializers/#overriding-serialization-and-deserialization-behavior
+https://docs.djangoproject.com/en/4.1/ref/models/querysets/#values-list
+"""
+
+import datetime
+import functools
+
+from rest_framework import ISO_8601, fields, relations, serializers
+from rest_framework.settings import api_settings
+
+# representation of a value read from the database is the value itself
+IDENTITY = {
+    fields.CharField.to_representation,
+    fields.IntegerField.to_representation,
+    fields.BooleanField.to_representation,
+}
+
+
+def datetime_converter(field):
+    """
+    ``DateTimeField.to_representation`` with the field's time zone resolved
+    once, aware datetimes (every datetime read with ``USE_TZ``) skip the
+    per-value lookup, anything else goes through the field
+    """
+    field_timezone = (
+        field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    )
+    if field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if type(value) is not datetime.datetime or value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return convert
+
+
+class CompiledSerializer:
+    """
+    ``serialize(rows)`` of ``queryset.values_list(*columns)`` tuples
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.names = []
+        self.columns = []
+        items = []
+        # makers of the converters, called once per response
+        self.converters = []
+
+        serializer = serializer_class()
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            self.names.append(field.field_name)
+            # two fields of one column read it once
+            column = self.column(field)
+            if column not in self.columns:
+                self.columns.append(column)
+            value = f"row[{self.columns.index(column)}]"
+
+            converter = self.converter(
+                field, declared=field.field_name in serializer._declared_fields
+            )
+            if converter is not None:
+                name = f"convert_{len(self.converters)}"
+                self.converters.append(converter)
+                # the serializer renders None without calling the field
+                value = f"None if {value} is None else {name}({value})"
+            items.append(f"{field.field_name!r}: {value}")
+
+        arguments = ", ".join(
+            f"convert_{index}" for index in range(len(self.converters))
+        )
+        self.source = (
+            f"def make_row_to_dict({arguments}):\n"
+            f"    def row_to_dict(row):\n"
+            f"        return {{{', '.join(items)}}}\n"
+            f"    return row_to_dict\n"
+        )
+        namespace = {}
+        exec(
+            compile(self.source, f"<compiled {serializer_class.__name__}>", "exec"),
+            namespace,
+        )
+        self.make_row_to_dict = namespace["make_row_to_dict"]
+
+    def column(self, field):
+        if (
+            isinstance(field, serializers.BaseSerializer)
+            or field.source == "*"
+            or isinstance(field, relations.RelatedField)
+            and not isinstance(field, relations.PrimaryKeyRelatedField)
+        ):
+            raise TypeError(
+                f"{self.serializer_class.__name__}.{field.field_name} can't be compiled"
+            )
+        # ``values_list("portal")`` reads the FK column, the related id
+        return "__".join(field.source_attrs)
+
+    @staticmethod
+    def converter(field, declared):
+        """
+        Maker of the function turning the column into the field's
+        representation, None when the value is copied as is
+        """
+        if isinstance(field, relations.PrimaryKeyRelatedField):
+            # the row holds the id, not the related object
+            if field.pk_field is None:
+                return None
+            return lambda: field.pk_field.to_representation
+        # a declared field may read a column of another type
+        # (``CharField(source="id")``), keep its conversion
+        if not declared and type(field).to_representation in IDENTITY:
+            return None
+        if (
+            type(field).to_representation is fields.DateTimeField.to_representation
+            and getattr(field, "format", api_settings.DATETIME_FORMAT) == ISO_8601
+        ):
+            return functools.partial(datetime_converter, field)
+        return lambda: field.to_representation
+
+    def row_to_dict(self):
+        """
+        ``row -> dict`` function for one response
+        """
+        return self.make_row_to_dict(*(make() for make in self.converters))
+
+    def values_list(self, queryset):
+        """
+        `queryset` reading the columns of the serializer, rows are named
+        tuples so pagination can read the cursor position (``row.id``)
+        """
+        return queryset.values_list(*self.columns, named=True)
+
+    def serialize(self, rows):
+        row_to_dict = self.row_to_dict()
+        return [row_to_dict(row) for row in rows]
+
+
+@functools.lru_cache(maxsize=None)
+def compile_serializer(serializer_class):
+    """
+    `CompiledSerializer` of `serializer_class`, compiled once per process
+    """
+    return CompiledSerializer(serializer_class)
@@ -0,0 +1,102 @@
+"""
+Sparse fieldsets & expansion of relations of job titles
+
+    GET /api/jobtitle/jobtitles/?fields=id,title,portal.name
+    GET /api/jobtitle/jobtitles/12/?expand=job_description,portal
+
+- ``fields`` keeps only the listed fields, ``<relation>.<field>`` keeps a
+  field of the related object (and expands the relation)
+- ``expand`` renders relations as objects instead of their ids
+
+The queryset is shaped to match: ``only()`` of the columns the response
+needs & ``select_related()`` of the expanded relations, so one query
+serves the page and unused columns are never read.
+
+TODO - Refer
+https://www.django-rest-framework.org/api-guide/serializers/#dynamically-modifying-fields
+https://docs.djangoproject.com/en/4.1/ref/models/querysets/#only
+"""
+
+from dataclasses import dataclass, field
+
+from rest_framework.exceptions import ValidationError
+
+# fields of a job title & the fields of its expandable relations
+FIELDS = ["id", "title", "job_description", "portal"]
+RELATIONS = {
+    "job_description": ["id", "role", "description_text", "published_date"],
+    "portal": ["id", "name", "description"],
+}
+
+
+@dataclass
+class FieldSet:
+    """
+    `fields` of the job title in output order, `expand` maps every
+    expanded relation to its fields
+    """
+
+    fields: list
+    expand: dict = field(default_factory=dict)
+
+
+def split(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse(query_params, default_fields):
+    """
+    `FieldSet` of ``?fields=`` & ``?expand=``, None when neither is given
+
+    `default_fields` are what the view renders without them
+    """
+    requested = query_params.get("fields")
+    expanded = query_params.get("expand")
+    if requested is None and expanded is None:
+        return None
+
+    expand = {}
+    for name in split(expanded or ""):
+        if name not in RELATIONS:
+            raise ValidationError({"expand": [f'Unknown relation "{name}".']})
+        expand[name] = list(RELATIONS[name])
+
+    if requested is None:
+        names = list(default_fields)
+    else:
+        names = []
+        subfields = {}
+        for path in split(requested):
+            name, _, subfield = path.partition(".")
+            if name not in FIELDS or (subfield and name not in RELATIONS):
+                raise ValidationError({"fields": [f'Unknown field "{path}".']})
+            if subfield and subfield not in RELATIONS[name]:
+                raise ValidationError({"fields": [f'Unknown field "{path}".']})
+            names.append(name)
+            if subfield:
+                subfields.setdefault(name, []).append(subfield)
+        if not names:
+            raise ValidationError({"fields": ["At least one field is required."]})
+
+        for name, fields in subfields.items():
+            expand[name] = [item for item in RELATIONS[name] if item in fields]
+
+    # an expanded relation is always part of the output
+    names = set(names) | set(expand)
+    return FieldSet([name for name in FIELDS if name in names], expand)
+
+
+def shape(queryset, fieldset):
+    """
+    `queryset` reading only the columns & relations `fieldset` renders
+    """
+    columns = {"id"}
+    for name in fieldset.fields:
+        # the id of a relation which isn't expanded is its FK column
+        columns.add(name)
+        columns.update(f"{name}__{item}" for item in fieldset.expand.get(name, ()))
+    # drop the view's own select_related(), deferred relations can't be joined
+    queryset = queryset.select_related(None)
+    if fieldset.expand:
+        queryset = queryset.select_related(*fieldset.expand)
+    return queryset.only(*sorted(columns))
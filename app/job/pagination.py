@@ -0,0 +1,77 @@
+"""
+Pagination classes for job API
+
+TODO - Refer
+https://www.django-rest-framework.org/api-guide/pagination/#cursorpagination
+"""
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class JobTitleCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination for JobTitle list endpoint
+
+    Unlike LIMIT/OFFSET every page is fetched as
+        WHERE id < <last id of previous page> ORDER BY id DESC LIMIT page_size + 1
+    so the database seeks straight into the primary key index and page 1000
+    costs the same as page 1.
+
+    Cursors are opaque (base64 encoded) and stable because `id` is unique
+    and never changes once a row is inserted, so rows created while a client
+    is paging do not shift or repeat items on the following pages.
+    """
+
+    # `-id` is unique & immutable which is exactly what a cursor needs
+    ordering = "-id"
+
+    page_size = 50
+
+    # Client can ask for ``?page_size=200`` but never more than `max_page_size`
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class SearchCursorPagination(JobTitleCursorPagination):
+    """
+    Cursor pagination of ranked search results (``?q=``, see job/search.py)
+
+    Results are ordered by score, which isn't a column, so the cursor holds
+    ``(score, id)`` of the last result of the page and the next page is
+    the best results ranked below it. Only forward paging (`next`) is offered.
+    """
+
+    def paginate_ranked(self, search, request):
+        """
+        `search(after=(score, id) | None, limit=n)` returns ranked ``(score, id)``
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        after = None
+        if cursor is not None:
+            try:
+                score, pk = cursor.position.split(":")
+                after = (float(score), int(pk))
+            except (AttributeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+        results = search(after=after, limit=self.page_size + 1)
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        score, pk = self.page[-1]
+        # repr() of a float parses back to exactly the same float
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=f"{score!r}:{pk}")
+        )
+
+    def get_previous_link(self):
+        return None
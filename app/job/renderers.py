@@ -0,0 +1,96 @@
+"""
+Renderers of the job postings export (see job/export.py) & the job list
+
+The export itself is streamed by the view, these renderers let DRF pick the
+format (``Accept`` header or ``?format=jsonl|csv|columnar``) and render error
+responses (401, 400, ...) in it.
+TODO - Refer
+https://www.django-rest-framework.org/api-guide/renderers/#custom-renderers
+"""
+
+import csv
+import io
+
+from rest_framework.renderers import BaseRenderer
+
+from job import export
+
+
+class JSONLinesRenderer(BaseRenderer):
+    media_type = "application/x-ndjson"
+    format = "jsonl"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        items = data if isinstance(data, list) else [data]
+        return "".join(export.encoder.encode(item) + "\n" for item in items).encode()
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        items = data if isinstance(data, list) else [data]
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(items[0]) if items else [])
+        writer.writeheader()
+        writer.writerows(items)
+        return buffer.getvalue().encode()
+
+
+def dictionary_columns(request):
+    """
+    ``?dictionary=portal_name,role``, columns sent dictionary encoded
+    """
+    if request is None:
+        return []
+    return [
+        name.strip()
+        for name in request.query_params.get("dictionary", "").split(",")
+        if name.strip()
+    ]
+
+
+class ColumnarJSONRenderer(BaseRenderer):
+    """
+    ``{"columns": [...], "rows": [[...], ...]}`` instead of one object per
+    row, names of the fields are sent once (``Accept:
+    application/vnd.jobs.columnar+json`` or ``?format=columnar``)
+
+    A page of the list keeps ``next`` & ``previous`` next to the columns,
+    anything which isn't a list of rows (errors, ...) is plain JSON.
+    """
+
+    media_type = "application/vnd.jobs.columnar+json"
+    format = "columnar"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        head = None
+        items = data
+        if isinstance(data, dict) and isinstance(data.get("results"), list):
+            head = {key: value for key, value in data.items() if key != "results"}
+            items = data["results"]
+        if not isinstance(items, list):
+            return export.encoder.encode(data).encode()
+
+        # columns of the first row, every row of a page has the same fields
+        names = list(items[0]) if items else []
+        request = (renderer_context or {}).get("request")
+        return b"".join(
+            export.columnar(
+                [([item[name] for name in names] for item in items)],
+                names,
+                dictionary_columns(request),
+                head,
+            )
+        )
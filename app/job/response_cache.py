@@ -0,0 +1,254 @@
+"""
+Cache of rendered job title list & detail responses (JSON bytes)
+
+Keys carry a version instead of being deleted one by one:
+
+- list: version of the user's collection + absolute URL (filters, cursor)
+- detail: version of the job title row
+
+Saving or deleting a JobTitle, JobDescription or Portal bumps the versions it
+affects (job/signals.py), one ``incr`` each, and entries of older versions
+are never looked up again (they age out of the LRU / shared cache TTL).
+Versions are bumped right away and once more on commit, so a request which
+read the old rows while the transaction was open doesn't leave them cached
+under the new version.
+
+Two tiers:
+1) per-process LRU capped by number of entries and bytes of bodies
+2) shared Django cache (``RESPONSE_CACHE["CACHE_ALIAS"]``), also holding
+   the versions, should be shared by all processes (memcached, redis)
+
+Hits, misses & evictions are exported at ``/metrics`` (core/metrics.py).
+
+TODO - Refer
+https://docs.djangoproject.com/en/4.1/topics/cache/#cache-versioning
+"""
+
+import functools
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from core import metrics
+from core.lru import LRUCache
+from core.singleflight import FALLBACK, SHARED
+from job import coalesce
+
+
+def get_config():
+    return {
+        "ENABLED": False,
+        "CACHE_ALIAS": "default",
+        "SHARED": True,
+        "TTL": 300,
+        "MAX_ENTRIES": 10_000,
+        "MAX_BYTES": 64 * 2**20,
+        **getattr(settings, "RESPONSE_CACHE", {}),
+    }
+
+
+def user_version_key(user_id):
+    return f"response-version:user:{user_id}"
+
+
+def job_title_version_key(pk):
+    return f"response-version:job-title:{pk}"
+
+
+class ResponseCache:
+    def __init__(self):
+        self._local = None
+
+    @property
+    def local(self):
+        if self._local is None:
+            config = get_config()
+            self._local = LRUCache(
+                max_entries=config["MAX_ENTRIES"],
+                ttl=config["TTL"],
+                max_size=config["MAX_BYTES"],
+                # (content type, body)
+                sizeof=lambda entry: len(entry[1]),
+            )
+        return self._local
+
+    @property
+    def shared(self):
+        return caches[get_config()["CACHE_ALIAS"]]
+
+    def version(self, key):
+        version = self.shared.get(key)
+        if version is None:
+            # never restart from a number an evicted version already used
+            self.shared.add(key, time.time_ns(), None)
+            version = self.shared.get(key)
+        return version
+
+    def bump(self, keys):
+        for key in keys:
+            try:
+                self.shared.incr(key)
+            except ValueError:
+                self.shared.set(key, time.time_ns(), None)
+
+    def invalidate(self, user_ids=(), job_title_ids=()):
+        keys = [user_version_key(pk) for pk in set(user_ids)] + [
+            job_title_version_key(pk) for pk in set(job_title_ids)
+        ]
+        self.bump(keys)
+        transaction.on_commit(lambda: self.bump(keys))
+
+    def get(self, key):
+        entry = self.local.get(key)
+        metrics.RESPONSE_CACHE_LOOKUPS.labels(
+            "local", "miss" if entry is None else "hit"
+        ).inc()
+        if entry is None and get_config()["SHARED"]:
+            entry = self.shared.get(key)
+            metrics.RESPONSE_CACHE_LOOKUPS.labels(
+                "shared", "miss" if entry is None else "hit"
+            ).inc()
+            if entry is not None:
+                self.set_local(key, entry)
+        return entry
+
+    def set(self, key, entry):
+        self.set_local(key, entry)
+        config = get_config()
+        if config["SHARED"]:
+            self.shared.set(key, entry, config["TTL"])
+
+    def set_local(self, key, entry):
+        evictions = self.local.evictions
+        self.local.set(key, entry)
+        if self.local.evictions > evictions:
+            metrics.RESPONSE_CACHE_EVICTIONS.inc(self.local.evictions - evictions)
+
+    def stats(self):
+        return self.local.stats()
+
+    def clear(self):
+        """
+        Drops the local tier and re-reads settings on next use
+        """
+        self._local = None
+
+
+response_cache = ResponseCache()
+
+
+class RenderedResponse(Response):
+    """
+    DRF response of already rendered bytes, `data` is only parsed back
+    when something reads it (tests)
+    """
+
+    def __init__(self, body, content_type):
+        super().__init__()
+        self.body = body
+        self["Content-Type"] = content_type
+
+    @property
+    def data(self):
+        return json.loads(self.body)
+
+    @data.setter
+    def data(self, value):
+        pass
+
+    @property
+    def rendered_content(self):
+        return self.body
+
+
+def response_key(kind, request, kwargs):
+    """
+    Versioned key of the response, None when it isn't cached
+    (browsable API, invalid id)
+    """
+    if request.accepted_renderer.format != "json":
+        return None
+
+    if kind == "detail":
+        try:
+            pk = int(kwargs["pk"])
+        except ValueError:
+            return None
+        version = response_cache.version(job_title_version_key(pk))
+    else:
+        version = response_cache.version(user_version_key(request.user.pk))
+
+    representation = hashlib.blake2b(
+        f"{request.build_absolute_uri()}\n{request.accepted_media_type}".encode(),
+        digest_size=16,
+    ).hexdigest()
+    return f"response:{kind}:{request.user.pk}:{version}:{representation}"
+
+
+def cache_response(kind):
+    """
+    Decorator of a viewset action (``"list"`` or ``"detail"``) serving its
+    rendered 200 responses from the cache, concurrent misses of the same key
+    are computed once (job/coalesce.py)
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            caching = get_config()["ENABLED"]
+            coalescing = coalesce.get_config()
+            if not (caching or coalescing["ENABLED"]):
+                return method(view, request, *args, **kwargs)
+            key = response_key(kind, request, kwargs)
+            if key is None:
+                return method(view, request, *args, **kwargs)
+
+            def render():
+                """
+                ``(response, entry)``, entry is None when it isn't cached
+                """
+                response = method(view, request, *args, **kwargs)
+                if not isinstance(response, Response) or response.status_code != 200:
+                    return response, None
+
+                renderer = request.accepted_renderer
+                context = view.get_renderer_context()
+                context["response"] = response
+                content_type = renderer.media_type
+                if renderer.charset:
+                    content_type = f"{content_type}; charset={renderer.charset}"
+                body = renderer.render(
+                    response.data, request.accepted_media_type, context
+                )
+                entry = (content_type, body)
+                if caching:
+                    response_cache.set(key, entry)
+                return response, entry
+
+            entry = response_cache.get(key) if caching else None
+            if entry is None:
+                if coalescing["ENABLED"]:
+                    (response, entry), outcome = coalesce.flights.do(
+                        key, render, coalescing["TIMEOUT"]
+                    )
+                    if outcome == SHARED and entry is None:
+                        # the leader's response isn't shared (404, ...)
+                        outcome = FALLBACK
+                        response, entry = render()
+                    metrics.SINGLE_FLIGHT_REQUESTS.labels("view", outcome).inc()
+                else:
+                    response, entry = render()
+                if entry is None:
+                    return response
+
+            content_type, body = entry
+            return RenderedResponse(body, content_type)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,514 @@
+"""
+Full-text search over job postings
+
+Words of ``JobTitle.title``, ``JobDescription.role`` and
+``JobDescription.description_text`` are kept in an inverted index
+(`core.models.JobTitleSearchTerm`, one row per posting & distinct word) which
+is updated from save/delete signals (job/signals.py), so a search only reads
+the posting lists of the searched words of one user instead of scanning
+every row with ``icontains``.
+
+Results are ranked with BM25 (words of the title count twice):
+
+    idf(t) = ln(1 + (N - df + 0.5) / (df + 0.5))
+    score  = sum idf(t) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))
+
+Common words have long posting lists, so a search doesn't read them whole.
+Postings of a term are read densest first (``tf / dl``, covering index
+`core_searchterm_density`) in growing blocks and scored with numpy. A job
+title of which only some of the words were read has a score so far and a
+best case, a word not read yet is at most as dense as the last posting read
+of it (``tf <= density * dl``, none left once the list is read whole).
+Reading stops (threshold algorithm) once the k-th best score so far beats
+what a posting not read yet could still score: the sum over the terms of the
+score of a posting as dense as the last one read (the ``k1 * (1 - b) / tf``
+part of the denominator left out, so it's an upper bound). The other words
+of the job titles which could still make it to the page are then read by id
+(`core_searchterm_job_title`), if there are few of them, a lookup by id costs
+as much as reading a few dozen postings in order.
+
+Scores of common words are close to each other so that bound can take most
+of a list to reach. Past its `MAX_TERM_POSTINGS` densest postings the rest
+of a list is read at once, that whole list is kept in an in-process LRU
+(``FULL_TEXT_SEARCH["CACHE_MAX_BYTES"]``) under the version of the user's
+index, which changes with every change of the user's postings, so a common
+word is read from the database once per process and change. Results are
+always the exact BM25 ranking, ties by descending id.
+
+TODO - Refer
+https://en.wikipedia.org/wiki/Okapi_BM25
+https://en.wikipedia.org/wiki/Fagin%27s_threshold_algorithm
+https://nlp.stanford.edu/IR-book/html/htmledition/a-first-take-at-building-an-inverted-index-1.html
+"""
+
+import itertools
+import math
+import re
+import uuid
+from collections import Counter, defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+
+from core.lru import LRUCache
+from core.models import JobTitle, JobTitleSearchStats, JobTitleSearchTerm
+
+TOKEN = re.compile(r"\w+")
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in is of on or the to with".split()
+)
+
+# BM25 parameters, the usual defaults
+K1 = 1.2
+B = 0.75
+
+TITLE_WEIGHT = 2
+MAX_TERM_LENGTH = JobTitleSearchTerm._meta.get_field("term").max_length
+MAX_QUERY_TERMS = 10
+# postings of every term read by the first round of a search, x4 each round
+BLOCK_SIZE = 2000
+# postings of a term read block by block, the rest is read whole & cached
+MAX_TERM_POSTINGS = 4000
+# job titles of which the other words are read by id at once
+MAX_LOOKUPS = 300
+
+EMPTY = np.zeros((0, 3), dtype=np.int64)
+
+
+def get_config():
+    return {
+        "CACHE_MAX_ENTRIES": 1000,
+        "CACHE_MAX_BYTES": 64 * 2**20,
+        **getattr(settings, "FULL_TEXT_SEARCH", {}),
+    }
+
+
+_cache = None
+
+
+def get_cache():
+    """
+    LRU of the posting lists read whole by this process, keyed by
+    ``(user_id, portal_id, term, version)``
+    """
+    global _cache
+    if _cache is None:
+        config = get_config()
+        _cache = LRUCache(
+            max_entries=config["CACHE_MAX_ENTRIES"],
+            max_size=config["CACHE_MAX_BYTES"],
+            sizeof=lambda postings: postings.nbytes,
+        )
+    return _cache
+
+
+def clear_cache():
+    """
+    Drops the cached posting lists and re-reads settings on next use
+    """
+    global _cache
+    _cache = None
+
+
+def tokenize(text):
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN.findall(text.lower())
+        if token not in STOP_WORDS
+    ]
+
+
+def document_terms(job_title, job_description):
+    """
+    ``Counter`` of the words of a posting
+    """
+    terms = Counter(tokenize(job_title.title) * TITLE_WEIGHT)
+    terms.update(tokenize(job_description.role))
+    terms.update(tokenize(job_description.description_text))
+    return terms
+
+
+def add_postings(postings, job_title):
+    """
+    Append index rows of `job_title` to `postings`, returns the posting's length
+    """
+    terms = document_terms(job_title, job_title.job_description)
+    length = sum(terms.values())
+    postings.extend(
+        JobTitleSearchTerm(
+            user_id=job_title.user_id,
+            job_title_id=job_title.pk,
+            portal_id=job_title.portal_id,
+            term=term,
+            frequency=frequency,
+            document_length=length,
+            density=frequency / length,
+        )
+        for term, frequency in terms.items()
+    )
+    return length
+
+
+def forget(job_title_ids):
+    """
+    Remove postings from the index, returns ``{user_id: [documents, length]}``
+    to subtract from the stats
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    indexed = (
+        JobTitleSearchTerm.objects.filter(job_title_id__in=job_title_ids)
+        .values_list("job_title_id", "user_id", "document_length")
+        .distinct()
+    )
+    for _, user_id, length in indexed:
+        deltas[user_id][0] -= 1
+        deltas[user_id][1] -= length
+
+    if deltas:
+        JobTitleSearchTerm.objects.filter(job_title_id__in=job_title_ids).delete()
+    return deltas
+
+
+def update_stats(deltas):
+    for user_id, (documents, length) in deltas.items():
+        # a new version even if the totals are the same (re-indexed posting)
+        changes = {
+            "documents": F("documents") + documents,
+            "total_length": F("total_length") + length,
+            "version": uuid.uuid4(),
+        }
+        stats = JobTitleSearchStats.objects.filter(user_id=user_id)
+        if not stats.update(**changes):
+            JobTitleSearchStats.objects.get_or_create(user_id=user_id)
+            stats.update(**changes)
+
+
+def index_job_titles(job_titles, batch_size=1000):
+    """
+    (Re)index saved job titles, ``job_title.job_description`` must be available
+    """
+    job_titles = [job_title for job_title in job_titles if job_title.pk]
+    if not job_titles:
+        return
+
+    with transaction.atomic():
+        deltas = forget([job_title.pk for job_title in job_titles])
+
+        postings = []
+        for job_title in job_titles:
+            length = add_postings(postings, job_title)
+            deltas[job_title.user_id][0] += 1
+            deltas[job_title.user_id][1] += length
+
+        JobTitleSearchTerm.objects.bulk_create(postings, batch_size=batch_size)
+        update_stats(deltas)
+
+
+def unindex_job_titles(job_title_ids):
+    with transaction.atomic():
+        update_stats(forget(job_title_ids))
+
+
+def rebuild(batch_size=2000):
+    """
+    Index every job title from scratch (after ``bulk_create``/loading data),
+    returns number of indexed job titles
+    """
+    JobTitleSearchTerm.objects.all().delete()
+    JobTitleSearchStats.objects.all().delete()
+
+    stats = defaultdict(lambda: [0, 0])
+    indexed = 0
+    last_id = 0
+    while True:
+        # keyset batches, memory stays flat whatever the table size
+        batch = list(
+            JobTitle.objects.select_related("job_description")
+            .filter(id__gt=last_id)
+            .order_by("id")[:batch_size]
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        postings = []
+        for job_title in batch:
+            length = add_postings(postings, job_title)
+            stats[job_title.user_id][0] += 1
+            stats[job_title.user_id][1] += length
+
+        with transaction.atomic():
+            JobTitleSearchTerm.objects.bulk_create(postings, batch_size=batch_size)
+        indexed += len(batch)
+
+    JobTitleSearchStats.objects.bulk_create(
+        JobTitleSearchStats(user_id=user_id, documents=documents, total_length=length)
+        for user_id, (documents, length) in stats.items()
+    )
+    return indexed
+
+
+def weight(frequency, length, average_length):
+    """
+    BM25 score of a term in a posting, without idf (numbers or numpy arrays)
+    """
+    return (
+        frequency * (K1 + 1) / (frequency + K1 * (1 - B + B * length / average_length))
+    )
+
+
+def weight_bound(density, average_length):
+    """
+    Highest `weight` of a posting at most as dense as `density`
+    """
+    return (K1 + 1) / (1 + K1 * B / (density * average_length))
+
+
+class PostingList:
+    """
+    Postings of one term of one user, densest first (newest first among equally
+    dense ones, the order of the ranking), read block by block
+    """
+
+    def __init__(self, queryset, postings=None):
+        self.queryset = queryset
+        # (density, job_title_id) of the last posting read
+        self.last = None
+        # ``(job_title_id, frequency, document_length)`` arrays read in order
+        self.blocks = []
+        self.count = 0
+        self.exhausted = False
+        if postings is not None:
+            # the whole list, cached
+            self.blocks.append(postings)
+            self.count = len(postings)
+            self.exhausted = True
+
+    def read(self, size=None):
+        """
+        Next `size` postings (all the rest when None), appended to `blocks`
+        """
+        queryset = self.queryset
+        if self.last is not None:
+            # a range scan of `core_searchterm_density`, same order
+            density, job_title_id = self.last
+            queryset = queryset.filter(density__lte=density).exclude(
+                density=density, job_title_id__gte=job_title_id
+            )
+        queryset = queryset.order_by("-density", "-job_title_id").values_list(
+            "density", "job_title_id", "frequency", "document_length"
+        )
+        if size is not None:
+            queryset = queryset[:size]
+        rows = np.fromiter(
+            itertools.chain.from_iterable(queryset), dtype=np.float64
+        ).reshape(-1, 4)
+        self.count += len(rows)
+        if size is None or len(rows) < size:
+            self.exhausted = True
+        if len(rows):
+            self.last = (float(rows[-1, 0]), int(rows[-1, 1]))
+        self.blocks.append(rows[:, 1:].astype(np.int64))
+
+    def postings(self):
+        return np.concatenate(self.blocks) if self.blocks else EMPTY
+
+    def bound(self, average_length):
+        """
+        Highest `weight` of a posting not read yet
+        """
+        if self.exhausted:
+            return 0.0
+        if self.last is None:
+            return K1 + 1
+        return weight_bound(self.last[0], average_length)
+
+    def frequency_bound(self, lengths):
+        """
+        Highest frequency of a posting not read yet, for every document length
+        of `lengths` (0 when no such posting is left)
+        """
+        if self.exhausted:
+            return np.zeros_like(lengths)
+        if self.last is None:
+            return lengths
+        # frequency / length is at most the density of the last one read
+        return np.floor(self.last[0] * lengths + 1e-9)
+
+
+def rank(lists, looked_up, complete, idf, average_length):
+    """
+    ``(job_title_ids, scores, exact, upper)`` arrays of the job titles of
+    which a posting was read: score of the postings read, whether that's the
+    whole score & the best score the job title could still get
+    """
+    columns = [
+        np.concatenate(posting_list.blocks + rows)
+        if posting_list.blocks or rows
+        else EMPTY
+        for posting_list, rows in zip(lists, looked_up)
+    ]
+    # distinct ids, sorted
+    job_title_ids = np.sort(np.concatenate([column[:, 0] for column in columns]))
+    job_title_ids = job_title_ids[np.diff(job_title_ids, prepend=0) != 0]
+    lengths = np.zeros(len(job_title_ids))
+    weights = np.zeros((len(lists), len(job_title_ids)))
+    # every word of a looked up job title is read, a missing one isn't in it
+    known = np.zeros(weights.shape, dtype=bool)
+    known[:, np.searchsorted(job_title_ids, complete)] = True
+    for index, column in enumerate(columns):
+        positions = np.searchsorted(job_title_ids, column[:, 0])
+        known[index, positions] = True
+        lengths[positions] = column[:, 2]
+        weights[index, positions] = idf[index] * weight(
+            column[:, 1], column[:, 2], average_length
+        )
+
+    # terms in query order, a posting always gets the same score
+    scores = weights[0].copy()
+    for row in weights[1:]:
+        scores += row
+
+    upper = scores.copy()
+    exact = np.ones(len(job_title_ids), dtype=bool)
+    for index, posting_list in enumerate(lists):
+        frequencies = posting_list.frequency_bound(lengths)
+        missing = ~known[index] & (frequencies > 0)
+        exact &= ~missing
+        upper[missing] += idf[index] * weight(
+            frequencies[missing], lengths[missing], average_length
+        )
+    return job_title_ids, scores, exact, upper
+
+
+def search(user, query, portal_id=None, after=None, limit=50, exclude=()):
+    """
+    Best matching job titles of `user` for `query`
+
+    Returns up to `limit` ``(score, job_title_id)`` sorted best first.
+    `after` is the ``(score, job_title_id)`` of the last result of the previous
+    page, only results ranked below it are returned (cursor paging).
+    Job titles of the `exclude` ids are left out before the page is cut.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return []
+
+    stats = (
+        JobTitleSearchStats.objects.filter(user=user)
+        .values_list("documents", "total_length", "version")
+        .first()
+    )
+    if not stats or not stats[0]:
+        return []
+    documents, total_length, version = stats
+    average_length = total_length / documents or 1
+
+    postings = JobTitleSearchTerm.objects.filter(user=user)
+    # idf is computed over all postings of the user, the portal filter only
+    # narrows down which of them are returned
+    frequencies = dict(
+        postings.filter(term__in=terms)
+        .values_list("term")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    terms = [term for term in terms if term in frequencies]
+    if not terms:
+        return []
+    idf = [
+        math.log(1 + (documents - frequencies[term] + 0.5) / (frequencies[term] + 0.5))
+        for term in terms
+    ]
+
+    if portal_id is not None:
+        postings = postings.filter(portal_id=portal_id)
+    cache = get_cache()
+    keys = [(user.pk, portal_id, term, version) for term in terms]
+    lists = [
+        PostingList(postings.filter(term=term), cache.get(key))
+        for term, key in zip(terms, keys)
+    ]
+    exclude = np.fromiter(exclude, dtype=np.int64)
+    # ``(job_title_id, frequency, document_length)`` arrays looked up by id
+    looked_up = [[] for _ in terms]
+    # job titles of which every word was read by id
+    complete = []
+
+    def look_up(job_title_ids):
+        rows = {term: [] for term in terms}
+        for job_title_id, term, *posting in JobTitleSearchTerm.objects.filter(
+            job_title_id__in=job_title_ids, term__in=terms
+        ).values_list("job_title_id", "term", "frequency", "document_length"):
+            rows[term].append((job_title_id, *posting))
+        for term_rows, term in zip(looked_up, terms):
+            if rows[term]:
+                term_rows.append(np.array(rows[term], dtype=np.int64))
+        complete.extend(job_title_ids)
+
+    def ranking():
+        job_title_ids, scores, exact, upper = rank(
+            lists, looked_up, np.array(complete, dtype=np.int64), idf, average_length
+        )
+        # scores only grow, a job title ranked above `after` stays there
+        eligible = np.ones(len(job_title_ids), dtype=bool)
+        if after is not None:
+            eligible = (scores < after[0]) | (
+                (scores == after[0]) & (job_title_ids < after[1])
+            )
+        if len(exclude):
+            eligible &= ~np.isin(job_title_ids, exclude)
+        return job_title_ids, scores, exact, upper, eligible
+
+    def best(positions, job_title_ids, scores):
+        positions = positions[np.lexsort((job_title_ids[positions], scores[positions]))]
+        return positions[::-1][:limit]
+
+    # growing blocks of every posting list until nothing not read yet can make
+    # it to the page, past `MAX_TERM_POSTINGS` a list is read whole & cached
+    size = max(BLOCK_SIZE, limit)
+    while True:
+        for posting_list, key in zip(lists, keys):
+            if posting_list.exhausted:
+                continue
+            if posting_list.count < MAX_TERM_POSTINGS:
+                posting_list.read(min(size, MAX_TERM_POSTINGS - posting_list.count))
+            else:
+                posting_list.read()
+                cache.set(key, posting_list.postings())
+
+        job_title_ids, scores, exact, upper, eligible = ranking()
+        # only the ones which can't end up above `after`
+        below = eligible if after is None else eligible & (exact | (upper < after[0]))
+        # scores so far are lower bounds of the scores
+        page = best(np.flatnonzero(below), job_title_ids, scores)
+        threshold = sum(
+            idf[index] * posting_list.bound(average_length)
+            for index, posting_list in enumerate(lists)
+        )
+        if all(posting_list.exhausted for posting_list in lists) or (
+            len(page) == limit
+            and scores[page[-1]] > threshold
+            # reading on is cheaper than looking many of them up by id
+            and np.count_nonzero(~exact & (upper >= scores[page[-1]])) <= MAX_LOOKUPS
+        ):
+            break
+        size *= 4
+
+    # words of the job titles which could still make it to the page, by id
+    while True:
+        page = best(np.flatnonzero(exact & eligible), job_title_ids, scores)
+        kth = scores[page[-1]] if len(page) == limit else -math.inf
+        pending = np.flatnonzero(~exact & eligible & (upper >= kth))
+        if not len(pending):
+            return [
+                (float(scores[position]), int(job_title_ids[position]))
+                for position in page
+            ]
+        # most promising first, the page fills up & the rest drop out
+        pending = pending[np.argsort(-upper[pending], kind="stable")][:MAX_LOOKUPS]
+        look_up(job_title_ids[pending].tolist())
+        job_title_ids, scores, exact, upper, eligible = ranking()
@@ -1,5 +1,14 @@
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Max
 from rest_framework import serializers
-from core.models import JobTitle
+from rest_framework.utils import html
+from core.models import JobTitle, JobDescription, Portal
+from job import changes, duplicates, fieldsets, search, similar, stream, suggest
+from job.response_cache import response_cache
 
 
 class JobTitleSerializer(serializers.ModelSerializer):
@@ -19,6 +28,75 @@ class JobTitleSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
+class NestedJobDescriptionSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a JobDescription written inline together with its JobTitle
+    """
+
+    class Meta:
+        model = JobDescription
+        fields = ["role", "description_text", "published_date"]
+
+
+class InlineJobDescriptionSerializer(NestedJobDescriptionSerializer):
+    """
+    `job_description` of the JobTitle detail view
+
+    Accepts either an object ``{"role": ..., "description_text": ...}`` which is
+    created/updated together with the JobTitle, or (like before) the primary key
+    of an existing JobDescription. Rendered as the primary key like before,
+    the object comes with ``?expand=job_description`` (job/fieldsets.py).
+    TODO - Refer
+    https://www.django-rest-framework.org/api-guide/relations/#writable-nested-serializers
+    """
+
+    class Meta(NestedJobDescriptionSerializer.Meta):
+        fields = ["id"] + NestedJobDescriptionSerializer.Meta.fields
+        read_only_fields = ["id"]
+
+    def get_value(self, dictionary):
+        # Form data can only send the primary key, nested form keys aren't supported
+        if html.is_html_input(dictionary) and self.field_name in dictionary:
+            return dictionary[self.field_name]
+        return super().get_value(dictionary)
+
+    def to_internal_value(self, data):
+        if isinstance(data, Mapping):
+            return super().to_internal_value(data)
+
+        return serializers.PrimaryKeyRelatedField(
+            queryset=JobDescription.objects.all()
+        ).to_internal_value(data)
+
+    def to_representation(self, instance):
+        return instance.pk
+
+
+def save_changed_fields(instance, data):
+    """
+    Assign `data` to `instance` and save only the columns whose value changed
+    Returns names of the saved fields
+    TODO - Refer
+    https://docs.djangoproject.com/en/4.1/ref/models/instances/#specifying-which-fields-to-save
+    """
+    update_fields = []
+    for name, value in data.items():
+        field = instance._meta.get_field(name)
+        if field.is_relation:
+            # compare ids, reading `instance.<fk>` could cost a query
+            changed = getattr(instance, field.attname) != getattr(value, "pk", None)
+        else:
+            changed = getattr(instance, name) != value
+
+        if changed:
+            setattr(instance, name, value)
+            update_fields.append(name)
+
+    if update_fields:
+        instance.save(update_fields=update_fields)
+    return update_fields
+
+
 class JobDescriptionSerializer(JobTitleSerializer):
     """
     Serializer class for JobTitle detail view
@@ -43,3 +121,256 @@ class JobDescriptionSerializer(JobTitleSerializer):
         #  fields = ParentModelSerializer.Meta.fields + [
         #             "field1-from-child-serializer", "field2-from-child-serializer", etc..]
         fields = JobTitleSerializer.Meta.fields + ["job_description", "portal"]
+
+    job_description = InlineJobDescriptionSerializer()
+
+    def validate_job_description(self, value):
+        """
+        JobTitle <--> JobDescription is OneToOne, same check the
+        UniqueValidator of the default ``PrimaryKeyRelatedField`` did
+        """
+        if isinstance(value, JobDescription):
+            job_titles = JobTitle.objects.filter(job_description=value)
+            if self.instance is not None:
+                job_titles = job_titles.exclude(pk=self.instance.pk)
+            if job_titles.exists():
+                raise serializers.ValidationError(
+                    "job title with this job description already exists."
+                )
+        return value
+
+    def create(self, validated_data):
+        """
+        Create the JobTitle and its inline JobDescription in one transaction
+        so a failure never leaves an orphaned JobDescription behind
+        """
+        job_description = validated_data.pop("job_description")
+
+        with transaction.atomic():
+            if not isinstance(job_description, JobDescription):
+                job_description = JobDescription.objects.create(
+                    user=validated_data["user"], **job_description
+                )
+            return JobTitle.objects.create(
+                job_description=job_description, **validated_data
+            )
+
+    def update(self, instance, validated_data):
+        """
+        Update JobTitle and inline JobDescription in one transaction,
+        each row only writes the columns that actually changed
+        """
+        job_description = validated_data.pop("job_description", None)
+
+        with transaction.atomic():
+            if isinstance(job_description, JobDescription):
+                validated_data["job_description"] = job_description
+            elif job_description is not None:
+                save_changed_fields(instance.job_description, job_description)
+
+            save_changed_fields(instance, validated_data)
+
+        return instance
+
+
+class DynamicFieldsMixin:
+    """
+    Serializer taking a ``fields=[...]`` argument, only those fields are rendered
+    TODO - Refer
+    https://www.django-rest-framework.org/api-guide/serializers/#dynamically-modifying-fields
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class PortalSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    `portal` of a job title expanded with ``?expand=portal``
+    """
+
+    class Meta:
+        model = Portal
+        fields = fieldsets.RELATIONS["portal"]
+
+
+class ExpandedJobDescriptionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    `job_description` of a job title expanded with ``?expand=job_description``,
+    same shape as the detail view renders it
+    """
+
+    class Meta:
+        model = JobDescription
+        fields = fieldsets.RELATIONS["job_description"]
+
+
+class SparseJobTitleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Read only JobTitle rendering the fields & expanded relations of
+    ``?fields=`` / ``?expand=`` (see job/fieldsets.py)
+    """
+
+    expanded_serializers = {
+        "job_description": ExpandedJobDescriptionSerializer,
+        "portal": PortalSerializer,
+    }
+
+    class Meta:
+        model = JobTitle
+        fields = fieldsets.FIELDS
+        read_only_fields = fieldsets.FIELDS
+
+    def __init__(self, *args, fieldset, **kwargs):
+        super().__init__(*args, fields=fieldset.fields, **kwargs)
+        for name, fields in fieldset.expand.items():
+            self.fields[name] = self.expanded_serializers[name](
+                fields=fields, read_only=True
+            )
+
+
+class BulkJobTitleListSerializer(serializers.ListSerializer):
+    """
+    Creates many job titles (and their descriptions) at once
+
+    - every `portal` id is checked with one ``id IN (...)`` query
+    - rows are written with ``bulk_create`` inside one transaction
+    TODO - Refer
+    https://www.django-rest-framework.org/api-guide/serializers/#customizing-multiple-create
+    """
+
+    def to_internal_value(self, data):
+        """
+        Validate all portal FKs with a single query instead of one per row
+        (done here, errors raised from `validate` would become non_field_errors)
+        """
+        attrs = super().to_internal_value(data)
+
+        portal_ids = {item["portal"] for item in attrs}
+        existing = set(
+            Portal.objects.filter(id__in=portal_ids).values_list("id", flat=True)
+        )
+
+        if existing != portal_ids:
+            # Same message & shape as PrimaryKeyRelatedField gives for one row
+            raise serializers.ValidationError(
+                [
+                    {}
+                    if item["portal"] in existing
+                    else {
+                        "portal": [
+                            f'Invalid pk "{item["portal"]}" - object does not exist.'
+                        ]
+                    }
+                    for item in attrs
+                ]
+            )
+
+        return attrs
+
+    def create(self, validated_data):
+        batch_size = settings.BULK_JOB_TITLES["BATCH_SIZE"]
+        user = validated_data[0]["user"]
+
+        with transaction.atomic():
+            job_descriptions = bulk_create_job_descriptions(
+                user,
+                [
+                    JobDescription(user=user, **item["job_description"])
+                    for item in validated_data
+                ],
+                batch_size,
+            )
+            job_titles = JobTitle.objects.bulk_create(
+                [
+                    JobTitle(
+                        user=user,
+                        title=item["title"],
+                        portal_id=item["portal"],
+                        job_description=job_description,
+                    )
+                    for item, job_description in zip(validated_data, job_descriptions)
+                ],
+                batch_size=batch_size,
+            )
+
+            if job_titles and job_titles[0].pk is None:
+                # MySQL, look the ids up by their (unique) job description
+                ids = dict(
+                    JobTitle.objects.filter(
+                        job_description__in=job_descriptions
+                    ).values_list("job_description_id", "id")
+                )
+                for job_title in job_titles:
+                    job_title.pk = ids[job_title.job_description_id]
+
+            # bulk_create sends no post_save, index the new postings here
+            search.index_job_titles(job_titles, batch_size=batch_size)
+            changes.record(job_titles, changes.Action.CREATED)
+            response_cache.invalidate(user_ids=[user.pk])
+            suggest.record(job_titles)
+            duplicates.index_descriptions(job_descriptions, batch_size=batch_size)
+            for job_title in job_titles:
+                similar.similar_jobs.update(job_title)
+                stream.publish_job_title(job_title, created=True)
+            return job_titles
+
+
+class BulkJobTitleSerializer(serializers.Serializer):
+    """
+    Serializer for one row of ``POST /api/jobtitle/jobtitles/bulk/``
+    ``[{"title": "...", "portal": 1, "job_description": {"role": "...", ...}}, ...]``
+    """
+
+    title = serializers.CharField(max_length=25)
+
+    # Plain integer, existence of all portals is checked at once by the list serializer
+    portal = serializers.IntegerField(min_value=1)
+
+    job_description = NestedJobDescriptionSerializer()
+
+    class Meta:
+        list_serializer_class = BulkJobTitleListSerializer
+
+
+def bulk_create_job_descriptions(user, job_descriptions, batch_size):
+    """
+    ``bulk_create`` which also sets primary keys on MySQL
+
+    MySQL can't return ids from a multi-row INSERT. With the user row locked
+    (so bulk imports of the same user run one after another) the rows of this
+    user above the previous maximum id are exactly the ones just inserted,
+    in insertion order. Must run inside a transaction.
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        return JobDescription.objects.bulk_create(
+            job_descriptions, batch_size=batch_size
+        )
+
+    list(
+        get_user_model()
+        .objects.select_for_update()
+        .filter(pk=user.pk)
+        .values_list("pk", flat=True)
+    )
+    last_id = JobDescription.objects.filter(user=user).aggregate(Max("id"))["id__max"]
+
+    JobDescription.objects.bulk_create(job_descriptions, batch_size=batch_size)
+
+    ids = list(
+        JobDescription.objects.filter(user=user, id__gt=last_id or 0)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    if len(ids) != len(job_descriptions):
+        # Someone else inserted a description for this user meanwhile
+        raise serializers.ValidationError(
+            "Job descriptions changed during import, please retry"
+        )
+
+    for job_description, pk in zip(job_descriptions, ids):
+        job_description.pk = pk
+    return job_descriptions
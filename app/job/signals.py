@@ -0,0 +1,202 @@
+"""
+Signal receivers of job application, keep the search index (job/search.py),
+the similar jobs matrix (job/similar.py), near-duplicate clusters
+(job/duplicates.py), the autocomplete suggestions (job/suggest.py) and the
+changelog (job/changes.py) in sync with job titles, descriptions & portals,
+push saved job titles to open event streams (job/stream.py) and invalidate
+cached responses (job/response_cache.py)
+
+Connected in `JobConfig.ready()`
+TODO - Refer
+https://docs.djangoproject.com/en/4.1/ref/signals/#post-save
+"""
+
+from django.db.models import DEFERRED
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.models import JobDescription, JobTitle, Portal
+from job import changes, duplicates, search, similar, stream, suggest
+from job.response_cache import response_cache
+
+# Columns which change the indexed words of a posting
+JOB_TITLE_INDEXED_FIELDS = {"title", "portal", "job_description", "user"}
+JOB_DESCRIPTION_INDEXED_FIELDS = {"role", "description_text"}
+# Columns of a portal rendered with its postings (``?expand=portal``)
+PORTAL_RENDERED_FIELDS = {"name", "description"}
+
+
+@receiver(post_save, sender=JobTitle)
+def index_job_title(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not JOB_TITLE_INDEXED_FIELDS.intersection(update_fields):
+        return
+    search.index_job_titles([instance])
+    similar.similar_jobs.update(instance)
+
+
+@receiver(post_save, sender=JobDescription)
+def index_job_title_of_description(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    if created:
+        # nothing links to a new description yet
+        return
+    if update_fields and not JOB_DESCRIPTION_INDEXED_FIELDS.intersection(update_fields):
+        return
+
+    job_title = JobTitle.objects.filter(job_description=instance).first()
+    if job_title is not None:
+        job_title.job_description = instance
+        search.index_job_titles([job_title])
+        similar.similar_jobs.update(job_title)
+
+
+@receiver(post_save, sender=JobDescription)
+def check_duplicates_of_description(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not JOB_DESCRIPTION_INDEXED_FIELDS.intersection(update_fields):
+        return
+    duplicates.index_descriptions([instance])
+
+
+@receiver(pre_delete, sender=JobDescription)
+def unindex_duplicates_of_description(sender, instance, **kwargs):
+    # a cluster keeps no label of a deleted description
+    duplicates.unindex_descriptions([instance.pk])
+
+
+@receiver(pre_delete, sender=JobTitle)
+def unindex_job_title(sender, instance, **kwargs):
+    search.unindex_job_titles([instance.pk])
+    similar.similar_jobs.remove(instance.pk)
+
+
+@receiver(post_save, sender=JobTitle)
+def record_job_title_change(sender, instance, created, **kwargs):
+    changes.record(
+        [instance], changes.Action.CREATED if created else changes.Action.UPDATED
+    )
+
+
+@receiver(post_save, sender=JobTitle)
+def stream_job_title(sender, instance, created, **kwargs):
+    stream.publish_job_title(instance, created)
+
+
+@receiver([post_save, post_delete], sender=JobTitle)
+def invalidate_job_title_responses(sender, instance, **kwargs):
+    response_cache.invalidate(user_ids=[instance.user_id], job_title_ids=[instance.pk])
+
+
+@receiver(post_save, sender=JobDescription)
+def invalidate_job_description_responses(sender, instance, created, **kwargs):
+    job_title_ids = []
+    if not created:
+        # detail of its job title renders the description
+        job_title_ids = list(
+            JobTitle.objects.filter(job_description=instance).values_list(
+                "pk", flat=True
+            )
+        )
+    # listing collapses near-duplicate descriptions (job/duplicates.py)
+    response_cache.invalidate(user_ids=[instance.user_id], job_title_ids=job_title_ids)
+
+
+@receiver(post_delete, sender=JobDescription)
+def invalidate_deleted_job_description_responses(sender, instance, **kwargs):
+    response_cache.invalidate(user_ids=[instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=Portal)
+def invalidate_portal_responses(sender, instance, **kwargs):
+    response_cache.invalidate(user_ids=[instance.user_id])
+
+
+@receiver(post_save, sender=JobDescription)
+def record_job_description_change(sender, instance, created, **kwargs):
+    if created:
+        return
+    # the description is part of the posting, it was updated too
+    job_title = (
+        JobTitle.objects.filter(job_description=instance)
+        .only("user", "title", "portal")
+        .first()
+    )
+    if job_title is not None:
+        job_title.last_updated = timezone.now()
+        JobTitle.objects.filter(pk=job_title.pk).update(
+            last_updated=job_title.last_updated
+        )
+        changes.record([job_title], changes.Action.UPDATED)
+        stream.publish_job_title(job_title, created=False)
+
+
+@receiver(post_save, sender=Portal)
+def record_portal_change(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        # no postings yet
+        return
+    if update_fields and not PORTAL_RENDERED_FIELDS.intersection(update_fields):
+        return
+    # postings render their portal (``?expand=portal``, ``fields=portal.name``),
+    # they were updated too: moves the ETags & cached responses of every
+    # user posting on it
+    job_titles = list(JobTitle.objects.filter(portal=instance).only("user"))
+    if job_titles:
+        JobTitle.objects.filter(portal=instance).update(last_updated=timezone.now())
+        changes.record(job_titles, changes.Action.UPDATED)
+        response_cache.invalidate(
+            user_ids=[job_title.user_id for job_title in job_titles],
+            job_title_ids=[job_title.pk for job_title in job_titles],
+        )
+
+
+@receiver(post_delete, sender=JobTitle)
+def record_job_title_delete(sender, instance, **kwargs):
+    changes.record([instance], changes.Action.DELETED)
+
+
+@receiver(post_save, sender=JobTitle)
+def count_job_title_suggestions(sender, instance, created, **kwargs):
+    # values read from the database (`JobTitle.from_db`), none for an
+    # instance which wasn't loaded
+    loaded = getattr(instance, "_loaded_values", {})
+    if created:
+        suggest.record([instance])
+    else:
+        title = loaded.get("title", DEFERRED)
+        portal_id = loaded.get("portal_id", DEFERRED)
+        current = (instance.title, instance.portal_id)
+        if DEFERRED not in (title, portal_id) and (title, portal_id) != current:
+            suggest.record(
+                [JobTitle(user_id=instance.user_id, title=title, portal_id=portal_id)],
+                change=-1,
+            )
+            suggest.record([instance])
+    # compared with on the next save
+    instance._loaded_values = {
+        **loaded,
+        "title": instance.title,
+        "portal_id": instance.portal_id,
+    }
+
+
+@receiver(post_delete, sender=JobTitle)
+def uncount_job_title_suggestions(sender, instance, **kwargs):
+    suggest.record([instance], change=-1)
+
+
+@receiver(post_save, sender=Portal)
+def count_portal_suggestion(sender, instance, created, **kwargs):
+    if created:
+        suggest.record_portal(instance)
+    else:
+        suggest.portal_names.pop(instance.pk, None)
+        # may be renamed, the old name can't be taken out of the snapshot
+        suggest.portals.mark_stale()
+
+
+@receiver(post_delete, sender=Portal)
+def uncount_portal_suggestion(sender, instance, **kwargs):
+    suggest.portal_names.pop(instance.pk, None)
+    suggest.portals.mark_stale()
@@ -0,0 +1,407 @@
+"""
+"Similar jobs" recommendations with TF-IDF vectors
+
+Every posting is a vector of its words (same tokens & title weight as
+job/search.py) weighted ``(1 + ln tf) * idf`` and L2 normalized, so the
+cosine similarity of two postings is their dot product.
+
+All vectors live in one sparse matrix stored column by column (CSC) in NumPy
+arrays: ``indptr[t]:indptr[t + 1]`` slices `rows`/`values` to the postings
+containing term ``t``. Similarities of one posting to all others are a single
+sparse matrix-vector product: the columns of the posting's terms are gathered
+and summed per row with ``np.bincount``, then ``np.argpartition`` picks the top
+K without sorting every score. Words found in more than ``MAX_DF`` of the
+postings are left out of the matrix (like ``max_df`` of scikit-learn).
+
+Saved/deleted postings (signals, see job/signals.py) only mark their old row
+dead and go to a small delta matrix scored the same way. The delta is merged
+into the main matrix once it holds ``MAX_DELTA`` postings (idf of merged rows
+is the one at the time they were saved) and the matrix is rebuilt from the
+database, in a background thread, every ``MAX_AGE`` seconds, which also
+picks up writes of other worker processes. The first build of a process
+runs in the background too (a minute & over 100 MB at a million postings),
+requests get `MatrixNotReady` (503) until it's done.
+
+TODO - Refer
+https://nlp.stanford.edu/IR-book/html/htmledition/tf-idf-weighting-1.html
+https://numpy.org/doc/stable/reference/generated/numpy.argpartition.html
+"""
+
+import logging
+import math
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from rest_framework.exceptions import APIException
+
+from core.models import JobTitle
+from job import search
+
+logger = logging.getLogger(__name__)
+
+
+class MatrixNotReady(APIException):
+    """
+    Raised while the first matrix of the process is built, DRF returns it as 503
+    """
+
+    status_code = 503
+    default_detail = "Similar jobs are being computed, please retry shortly."
+    default_code = "similar_jobs_not_ready"
+
+
+def get_config():
+    return {
+        "MAX_DELTA": 5000,
+        "MAX_AGE": 3600,
+        "MAX_DF": 0.5,
+        "BATCH_SIZE": 2000,
+        "BACKGROUND": True,
+        **getattr(settings, "SIMILAR_JOBS", {}),
+    }
+
+
+class Matrix:
+    """
+    Normalized TF-IDF vectors of many postings (CSC), rows ordered by id
+    """
+
+    def __init__(self, vocabulary, idf, ids, owners, indptr, rows, values):
+        # term -> column, new terms of saved postings are appended
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.ids = ids
+        self.owners = owners
+        self.indptr = indptr
+        self.rows = rows
+        self.values = values
+        self.alive = np.ones(len(ids), dtype=bool)
+
+    @classmethod
+    def build(cls, documents, vocabulary=None, idf=None):
+        """
+        `documents` are ``(job title id, user id, {term: tf})`` sorted by id,
+        idf is computed from them unless given
+        """
+        vocabulary = dict(vocabulary or {})
+        ids, owners, lengths, columns, counts = [], [], [], [], []
+        for pk, owner, terms in documents:
+            ids.append(pk)
+            owners.append(owner)
+            lengths.append(len(terms))
+            for term, count in terms.items():
+                columns.append(vocabulary.setdefault(term, len(vocabulary)))
+                counts.append(count)
+
+        size = len(ids)
+        rows = np.repeat(np.arange(size, dtype=np.int32), lengths)
+        columns = np.array(columns, dtype=np.int32)
+        values = 1 + np.log(np.array(counts, dtype=np.float32))
+
+        if idf is None:
+            frequency = np.bincount(columns, minlength=len(vocabulary))
+            idf = np.log((1 + size) / (1 + frequency)).astype(np.float32) + 1
+            # words in most postings say little and have the longest columns
+            idf[frequency > get_config()["MAX_DF"] * size] = 0
+        else:
+            idf = extend_idf(idf, len(vocabulary), size)
+        values *= idf[columns]
+        keep = values > 0
+        rows, columns, values = rows[keep], columns[keep], values[keep]
+        norms = np.sqrt(np.bincount(rows, values * values, minlength=size))
+        values /= norms[rows].astype(np.float32)
+
+        # stable sort keeps rows (ids) ascending inside every column
+        order = np.argsort(columns, kind="stable")
+        indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=len(vocabulary)), out=indptr[1:])
+        return cls(
+            vocabulary,
+            idf,
+            np.array(ids, dtype=np.int64),
+            np.array(owners, dtype=np.int64),
+            indptr,
+            rows[order],
+            values[order],
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def vector(self, terms):
+        """
+        ``(columns, weights)`` of a posting, terms the matrix never saw are left out
+        """
+        columns = [self.vocabulary[term] for term in terms if term in self.vocabulary]
+        if not columns:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        columns = np.array(columns, dtype=np.int64)
+        counts = np.array(
+            [count for term, count in terms.items() if term in self.vocabulary],
+            dtype=np.float32,
+        )
+        weights = (1 + np.log(counts)) * self.idf[columns]
+        norm = np.linalg.norm(weights)
+        return columns, weights / norm if norm else weights
+
+    def scores(self, columns, weights):
+        """
+        Dot product of every row with the vector, ``X @ q``
+        """
+        known = columns < len(self.indptr) - 1
+        spans = zip(self.indptr[columns[known]], self.indptr[columns[known] + 1])
+        spans = [
+            (start, end, weight) for (start, end), weight in zip(spans, weights[known])
+        ]
+        if not spans:
+            return np.zeros(len(self.ids))
+        # one contiguous slice per word of the posting, summed per row at once
+        return np.bincount(
+            np.concatenate([self.rows[start:end] for start, end, _ in spans]),
+            weights=np.concatenate(
+                [self.values[start:end] * weight for start, end, weight in spans]
+            ),
+            minlength=len(self.ids),
+        )
+
+    def entries(self):
+        """
+        ``(rows, columns, values)`` of the living rows (COO)
+        """
+        columns = np.repeat(
+            np.arange(len(self.indptr) - 1, dtype=np.int32), np.diff(self.indptr)
+        )
+        keep = self.alive[self.rows]
+        return self.rows[keep], columns[keep], self.values[keep]
+
+
+def kill(matrix, pk):
+    """
+    Leave the row of posting `pk` (if any) out of the scores
+    """
+    row = np.searchsorted(matrix.ids, pk)
+    if row < len(matrix) and matrix.ids[row] == pk:
+        matrix.alive[row] = False
+
+
+def extend_idf(idf, size, documents):
+    """
+    idf of terms first seen after the build, as if found in one posting
+    """
+    if len(idf) >= size:
+        return idf
+    extra = np.full(size - len(idf), math.log((1 + documents) / 2) + 1, np.float32)
+    return np.concatenate([idf, extra])
+
+
+def merge(matrix, delta):
+    """
+    New `Matrix` of the living rows of `matrix` & the postings of `delta`
+    """
+    added = Matrix.build(
+        sorted((pk, owner, terms) for pk, (owner, terms) in delta.items()),
+        matrix.vocabulary,
+        matrix.idf,
+    )
+    rows, columns, values = matrix.entries()
+    kept = np.flatnonzero(matrix.alive)
+    ids = np.concatenate([matrix.ids[kept], added.ids])
+    owners = np.concatenate([matrix.owners[kept], added.owners])
+
+    # old row numbers -> new ones, then ids ascending again
+    renumber = np.zeros(len(matrix), dtype=np.int64)
+    renumber[kept] = np.arange(len(kept))
+    added_rows, added_columns, added_values = added.entries()
+    rows = np.concatenate([renumber[rows], added_rows + len(kept)])
+    columns = np.concatenate([columns, added_columns])
+    values = np.concatenate([values, added_values])
+
+    by_id = np.argsort(ids, kind="stable")
+    position = np.empty_like(by_id)
+    position[by_id] = np.arange(len(by_id))
+    rows = position[rows]
+
+    order = np.lexsort((rows, columns))
+    vocabulary_size = len(added.vocabulary)
+    indptr = np.zeros(vocabulary_size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(columns, minlength=vocabulary_size), out=indptr[1:])
+    return Matrix(
+        added.vocabulary,
+        added.idf,
+        ids[by_id],
+        owners[by_id],
+        indptr,
+        rows[order].astype(np.int32),
+        values[order],
+    )
+
+
+class SimilarJobs:
+    """
+    Matrix of all postings + delta of postings saved since it was built
+    """
+
+    def __init__(self, load_documents):
+        self.load_documents = load_documents
+        self.matrix = None
+        # job title id -> (user id, {term: tf}) of saved postings
+        self.delta = {}
+        # job title id -> time.monotonic() of its last save/delete
+        self.changed = {}
+        self.delta_matrix = None
+        self.built_at = 0.0
+        self._lock = threading.Lock()
+        self._rebuilding = False
+
+    def update(self, job_title):
+        """
+        (Re)vectorize a saved posting, ``job_description`` must be available
+        """
+        terms = search.document_terms(job_title, job_title.job_description)
+        self.change(job_title.pk, (job_title.user_id, terms))
+
+    def remove(self, pk):
+        self.change(pk, None)
+
+    def change(self, pk, document):
+        matrix = self.matrix
+        if matrix is None:
+            # nothing loaded yet, the build reads the change anyway
+            return
+        with self._lock:
+            kill(matrix, pk)
+            self.changed[pk] = time.monotonic()
+            if document is None:
+                self.delta.pop(pk, None)
+            else:
+                self.delta[pk] = document
+            self.delta_matrix = None
+            merge_now = len(self.delta) >= get_config()["MAX_DELTA"]
+        if merge_now:
+            with self._lock:
+                self.matrix = merge(self.matrix, self.delta)
+                self.delta, self.delta_matrix = {}, None
+
+    def get_matrices(self):
+        """
+        ``(matrix, delta matrix)``, raises `MatrixNotReady` before the first
+        build of the process is done
+        """
+        config = get_config()
+        if self.matrix is None:
+            self.schedule_rebuild()
+            if self.matrix is None:
+                raise MatrixNotReady()
+        elif time.monotonic() - self.built_at > config["MAX_AGE"]:
+            self.schedule_rebuild()
+
+        with self._lock:
+            matrix = self.matrix
+            if self.delta_matrix is None and self.delta:
+                self.delta_matrix = Matrix.build(
+                    sorted(
+                        (pk, owner, terms) for pk, (owner, terms) in self.delta.items()
+                    ),
+                    matrix.vocabulary,
+                    matrix.idf,
+                )
+            return matrix, self.delta_matrix
+
+    def similar(self, job_title, k=10):
+        """
+        Up to `k` ``(similarity, job title id)`` of postings of the same user,
+        most similar first
+        """
+        terms = search.document_terms(job_title, job_title.job_description)
+        return self.rank(terms, job_title.user_id, job_title.pk, k)
+
+    def rank(self, terms, owner, exclude, k):
+        matrix, delta = self.get_matrices()
+        columns, weights = (delta or matrix).vector(terms)
+
+        ids, scores = [], []
+        for part in (matrix, delta):
+            if part is None or not len(part):
+                continue
+            part_scores = part.scores(columns, weights)
+            part_scores[(part.owners != owner) | ~part.alive] = 0
+            ids.append(part.ids)
+            scores.append(part_scores)
+        if not ids:
+            return []
+        ids, scores = np.concatenate(ids), np.concatenate(scores)
+        scores[ids == exclude] = 0
+
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        return sorted(
+            ((float(scores[row]), int(ids[row])) for row in best if scores[row] > 0),
+            key=lambda item: (-item[0], item[1]),
+        )
+
+    def schedule_rebuild(self):
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+
+        if get_config()["BACKGROUND"]:
+            threading.Thread(target=self.rebuild_in_background, daemon=True).start()
+        else:
+            self.rebuild()
+
+    def rebuild_in_background(self):
+        try:
+            self.rebuild()
+        finally:
+            # this thread's own connection, never the one of a request
+            connection.close()
+
+    def rebuild(self):
+        self._rebuilding = True
+        try:
+            started = time.monotonic()
+            matrix = Matrix.build(self.load_documents())
+            with self._lock:
+                # postings saved while the database was read may be missing
+                changed = {pk: at for pk, at in self.changed.items() if at >= started}
+                for pk in changed:
+                    kill(matrix, pk)
+                self.delta = {
+                    pk: document for pk, document in self.delta.items() if pk in changed
+                }
+                self.matrix, self.changed, self.delta_matrix = matrix, changed, None
+            self.built_at = started
+        except Exception:
+            logger.exception("Rebuilding similar jobs matrix failed")
+        finally:
+            self._rebuilding = False
+
+
+def job_title_documents():
+    """
+    ``(id, user id, {term: tf})`` of every posting, read in keyset batches
+    """
+    batch_size = get_config()["BATCH_SIZE"]
+    last_id = 0
+    while True:
+        batch = list(
+            JobTitle.objects.select_related("job_description")
+            .filter(id__gt=last_id)
+            .order_by("id")[:batch_size]
+        )
+        if not batch:
+            return
+        last_id = batch[-1].id
+        for job_title in batch:
+            yield (
+                job_title.pk,
+                job_title.user_id,
+                search.document_terms(job_title, job_title.job_description),
+            )
+
+
+similar_jobs = SimilarJobs(job_title_documents)
@@ -0,0 +1,266 @@
+"""
+Server-Sent Events stream of created & updated job titles (ASGI only)
+
+    GET /api/jobtitle/stream/?portal=3
+    Authorization: Token <key>
+
+    event: created
+    data: {"id":12,"title":"Python Developer","portal":3,"last_updated":"..."}
+
+- `hub` fans events out to the open streams of this process. Saves publish
+  to it from post_save (job/signals.py) once their transaction commits.
+- every subscriber has a bounded queue, when a client reads slower than
+  postings are saved the oldest events are dropped and the client gets a
+  ``dropped`` event (catch up with ``/jobtitles/changes/``, job/changes.py)
+- Django 4.1 can't stream an async iterator, so `JobTitleStream` is a plain
+  ASGI application wrapping Django's (app/asgi.py). Streams are held by
+  the event loop, not by a thread per client.
+
+Only saves made by the same process are seen, run the API & the stream in one
+ASGI process per host (or behind sticky routing).
+
+TODO - Refer
+https://html.spec.whatwg.org/multipage/server-sent-events.html
+https://asgi.readthedocs.io/en/latest/specs/www.html
+"""
+
+import asyncio
+import io
+import threading
+from collections import deque
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections, transaction
+from rest_framework import exceptions
+from rest_framework.utils.encoders import JSONEncoder
+
+from user.authentication import CachedTokenAuthentication, SignedTokenAuthentication
+
+PATH = "/api/jobtitle/stream/"
+
+encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def get_config():
+    return {
+        "MAX_QUEUED": 100,
+        "HEARTBEAT": 15,
+        **getattr(settings, "JOB_TITLE_STREAM", {}),
+    }
+
+
+def frame(event, data):
+    return f"event: {event}\ndata: {encoder.encode(data)}\n\n".encode()
+
+
+class Subscriber:
+    """
+    Events for one open stream, only touched from its event loop
+    """
+
+    def __init__(self, loop, user_id, portal_id, max_queued):
+        self.loop = loop
+        self.user_id = user_id
+        self.portal_id = portal_id
+        # a full deque drops from the other end, the oldest event
+        self.queue = deque(maxlen=max_queued)
+        self.dropped = 0
+        self.closed = False
+        self.ready = asyncio.Event()
+
+    def wants(self, user_id, portal_id):
+        return self.user_id == user_id and self.portal_id in (None, portal_id)
+
+    def push(self, event):
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(event)
+        self.ready.set()
+
+    def close(self):
+        self.closed = True
+        self.ready.set()
+
+    async def get(self, timeout):
+        """
+        Frames queued so far (waits up to `timeout` seconds for one),
+        None once closed
+        """
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        if self.closed:
+            return None
+        self.ready.clear()
+
+        frames = []
+        if self.dropped:
+            frames.append(frame("dropped", {"count": self.dropped}))
+            self.dropped = 0
+        frames.extend(self.queue)
+        self.queue.clear()
+        return frames
+
+
+class Hub:
+    """
+    In-process fan-out, `publish` may be called from any thread
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = set()
+
+    def subscribe(self, user_id, portal_id=None):
+        subscriber = Subscriber(
+            asyncio.get_running_loop(),
+            user_id,
+            portal_id,
+            get_config()["MAX_QUEUED"],
+        )
+        with self.lock:
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def publish(self, user_id, portal_id, event):
+        with self.lock:
+            subscribers = [
+                subscriber
+                for subscriber in self.subscribers
+                if subscriber.wants(user_id, portal_id)
+            ]
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.push, event)
+            except RuntimeError:
+                # its event loop is closed, the stream is gone
+                self.unsubscribe(subscriber)
+
+
+hub = Hub()
+
+
+def publish_job_title(job_title, created):
+    """
+    Send a saved job title to its streams when the transaction commits
+    """
+    if not hub.subscribers:
+        return
+    event = frame(
+        "created" if created else "updated",
+        {
+            "id": job_title.pk,
+            "title": job_title.title,
+            "portal": job_title.portal_id,
+            "last_updated": job_title.last_updated,
+        },
+    )
+    user_id, portal_id = job_title.user_id, job_title.portal_id
+    transaction.on_commit(lambda: hub.publish(user_id, portal_id, event))
+
+
+def authenticate(request):
+    """
+    User of the request with the authentication of the job API,
+    raises NotAuthenticated or AuthenticationFailed
+    """
+    try:
+        for authentication in (CachedTokenAuthentication, SignedTokenAuthentication):
+            result = authentication().authenticate(request)
+            if result is not None:
+                return result[0]
+        raise exceptions.NotAuthenticated()
+    finally:
+        close_old_connections()
+
+
+class JobTitleStream:
+    """
+    ASGI application serving `PATH`, everything else goes to `application`
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != PATH:
+            return await self.application(scope, receive, send)
+
+        if scope["method"] != "GET":
+            return await self.respond(send, 405, {"detail": "Method not allowed."})
+
+        try:
+            user = await sync_to_async(authenticate)(ASGIRequest(scope, io.BytesIO()))
+        except exceptions.APIException as error:
+            return await self.respond(send, error.status_code, {"detail": error.detail})
+
+        portal_id = parse_qs(scope["query_string"].decode()).get("portal", [None])[-1]
+        if portal_id is not None:
+            try:
+                portal_id = int(portal_id)
+            except ValueError:
+                return await self.respond(
+                    send, 400, {"portal": ["A valid integer is required."]}
+                )
+
+        subscriber = hub.subscribe(user.pk, portal_id)
+        try:
+            await self.stream(subscriber, receive, send)
+        finally:
+            hub.unsubscribe(subscriber)
+
+    async def stream(self, subscriber, receive, send):
+        async def watch_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            subscriber.close()
+
+        watcher = asyncio.create_task(watch_disconnect())
+        heartbeat = get_config()["HEARTBEAT"]
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (b"content-type", b"text/event-stream; charset=utf-8"),
+                        (b"cache-control", b"no-cache"),
+                        # nginx would buffer the events
+                        (b"x-accel-buffering", b"no"),
+                    ],
+                }
+            )
+            await send(
+                {"type": "http.response.body", "body": b": ok\n\n", "more_body": True}
+            )
+            while (frames := await subscriber.get(heartbeat)) is not None:
+                # a comment keeps idle connections (and proxies) open
+                body = b"".join(frames) or b": ping\n\n"
+                await send(
+                    {"type": "http.response.body", "body": body, "more_body": True}
+                )
+        except OSError:
+            # client went away while sending
+            pass
+        finally:
+            watcher.cancel()
+
+    async def respond(self, send, status, data):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send(
+            {"type": "http.response.body", "body": encoder.encode(data).encode()}
+        )
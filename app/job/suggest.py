@@ -0,0 +1,541 @@
+"""
+Prefix autocomplete of job titles & portal names
+
+Completions are served from memory instead of ``LIKE 'abc%'`` queries:
+
+- `PrefixIndex` is an immutable sorted array of (key, label, count) packed in
+  a handful of flat buffers (no Python object per entry). A prefix maps to
+  the contiguous range of keys starting with it (binary search); small ranges
+  are scanned for the top-K counts, for the few prefixes with huge ranges
+  ("p", "se", ...) the top-K is precomputed at build time.
+- The buffers are written to a snapshot file which every worker process
+  ``mmap``-s read-only, so the operating system keeps one copy in memory.
+- Keys are ``"<user id> <normalized text>"``, a user only sees completions
+  of their own postings (and portals).
+- `Suggester` merges a small per-process delta of recent writes (fed by
+  signals, see job/signals.py) over the snapshot. The snapshot is rebuilt from
+  the database in the background once the delta grows past ``MAX_DELTA`` or is
+  older than ``MAX_AGE`` seconds; other workers pick up the new file when its
+  modification time changes. Writes made by another worker (or by this one
+  before its first lookup) show up after the next rebuild.
+- One worker at a time rebuilds a snapshot file (``flock`` of ``<file>.lock``),
+  the others keep serving the old one until the new file shows up.
+- Without a snapshot the first lookup starts the build in the background and
+  gets no completions until it's done (``BACKGROUND``).
+
+TODO - Refer
+https://docs.python.org/3/library/mmap.html
+https://en.wikipedia.org/wiki/Trie#Sorting (sorted keys <=> trie in order)
+"""
+
+import fcntl
+import heapq
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+
+from core.models import JobTitle, Portal
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SUG1"
+# magic, entries, keys blob, labels blob, heavy prefixes, heavy keys blob, top_k,
+# time the entries were read from the database
+HEADER = struct.Struct("<4sIIIIIId")
+# 0xff never appears in UTF-8, ``prefix + END`` sorts after every key with prefix
+END = b"\xff"
+MISSING = 0xFFFFFFFF
+
+
+def get_config():
+    return {
+        "PATH": None,
+        "TOP_K": 50,
+        "SCAN_LIMIT": 1024,
+        "MAX_DELTA": 1000,
+        "MAX_AGE": 300,
+        "CHECK_INTERVAL": 1,
+        "BACKGROUND": True,
+        **getattr(settings, "SUGGEST_INDEX", {}),
+    }
+
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+
+def pad(data):
+    return data + b"\0" * (-len(data) % 4)
+
+
+def build(entries, top_k, scan_limit, started):
+    """
+    Serialize ``{key: (label, count)}`` into the snapshot format (bytes)
+    """
+    items = sorted(
+        (key.encode(), label.encode(), count) for key, (label, count) in entries.items()
+    )
+    keys = [item[0] for item in items]
+    counts = array("I", (item[2] for item in items))
+
+    key_offsets, label_offsets = array("I", [0]), array("I", [0])
+    for key, label, _ in items:
+        key_offsets.append(key_offsets[-1] + len(key))
+        label_offsets.append(label_offsets[-1] + len(label))
+
+    # Precompute top-K of every prefix whose range is too big to scan.
+    # Only big ranges are split further, so this stays close to O(n * depth)
+    heavy = []
+    stack = [(b"", 0, len(keys))]
+    while stack:
+        prefix, lo, hi = stack.pop()
+        depth = len(prefix)
+        start = lo
+        # keys equal to the prefix sort first and have no next byte
+        while start < hi and len(keys[start]) == depth:
+            start += 1
+        while start < hi:
+            byte = keys[start][depth : depth + 1]
+            end = start
+            while end < hi and keys[end][depth : depth + 1] == byte:
+                end += 1
+            if end - start > scan_limit:
+                child = prefix + byte
+                best = heapq.nlargest(top_k, range(start, end), key=counts.__getitem__)
+                heavy.append((child, best + [MISSING] * (top_k - len(best))))
+                stack.append((child, start, end))
+            start = end
+    heavy.sort()
+
+    heavy_offsets, heavy_top = array("I", [0]), array("I")
+    for prefix, best in heavy:
+        heavy_offsets.append(heavy_offsets[-1] + len(prefix))
+        heavy_top.extend(best)
+
+    keys_blob = b"".join(keys)
+    labels_blob = b"".join(item[1] for item in items)
+    heavy_blob = b"".join(prefix for prefix, _ in heavy)
+    return b"".join(
+        [
+            HEADER.pack(
+                MAGIC,
+                len(items),
+                len(keys_blob),
+                len(labels_blob),
+                len(heavy),
+                len(heavy_blob),
+                top_k,
+                started,
+            ),
+            key_offsets.tobytes(),
+            label_offsets.tobytes(),
+            counts.tobytes(),
+            heavy_offsets.tobytes(),
+            heavy_top.tobytes(),
+            pad(keys_blob),
+            pad(labels_blob),
+            pad(heavy_blob),
+        ]
+    )
+
+
+class PrefixIndex:
+    """
+    Read-only view over a snapshot (bytes or mmap), nothing is copied
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        view = memoryview(buffer)
+        if bytes(view[: len(MAGIC)]) != MAGIC:
+            raise ValueError("Not a suggestion index snapshot")
+        (
+            _,
+            size,
+            keys_len,
+            labels_len,
+            heavy_size,
+            heavy_len,
+            top_k,
+            started,
+        ) = HEADER.unpack_from(view)
+        self.size, self.heavy_size, self.top_k = size, heavy_size, top_k
+        self.started = started
+        position = HEADER.size
+
+        def take(length):
+            nonlocal position
+            part = view[position : position + length]
+            position += length + (-length % 4)
+            return part
+
+        self.key_offsets = take((size + 1) * 4).cast("I")
+        self.label_offsets = take((size + 1) * 4).cast("I")
+        self.counts = take(size * 4).cast("I")
+        self.heavy_offsets = take((heavy_size + 1) * 4).cast("I")
+        self.heavy_top = take(heavy_size * top_k * 4).cast("I")
+        self.keys = take(keys_len)
+        self.labels = take(labels_len)
+        self.heavy_keys = take(heavy_len)
+
+    def __len__(self):
+        return self.size
+
+    def key(self, index):
+        return bytes(self.keys[self.key_offsets[index] : self.key_offsets[index + 1]])
+
+    def label(self, index):
+        return str(
+            self.labels[self.label_offsets[index] : self.label_offsets[index + 1]],
+            "utf-8",
+        )
+
+    def lower_bound(self, target):
+        lo, hi = 0, self.size
+        while lo < hi:
+            middle = (lo + hi) // 2
+            if self.key(middle) < target:
+                lo = middle + 1
+            else:
+                hi = middle
+        return lo
+
+    def count(self, key):
+        encoded = key.encode()
+        index = self.lower_bound(encoded)
+        if index < self.size and self.key(index) == encoded:
+            return self.counts[index]
+        return 0
+
+    def heavy_top_k(self, prefix):
+        lo, hi = 0, self.heavy_size
+        offsets = self.heavy_offsets
+        while lo < hi:
+            middle = (lo + hi) // 2
+            key = bytes(self.heavy_keys[offsets[middle] : offsets[middle + 1]])
+            if key < prefix:
+                lo = middle + 1
+            elif key > prefix:
+                hi = middle
+            else:
+                start = middle * self.top_k
+                best = self.heavy_top[start : start + self.top_k]
+                return [index for index in best if index != MISSING]
+        return None
+
+    def top(self, prefix, k):
+        """
+        Up to `k` ``(count, key, label)`` starting with `prefix`, best first
+        """
+        prefix = prefix.encode()
+        lo = self.lower_bound(prefix)
+        hi = self.lower_bound(prefix + END)
+        if hi - lo <= k:
+            best = range(lo, hi)
+        else:
+            best = self.heavy_top_k(prefix) if k <= self.top_k else None
+            if best is None:
+                best = heapq.nlargest(k, range(lo, hi), key=self.counts.__getitem__)
+        return sorted(
+            (
+                (self.counts[index], self.key(index).decode(), self.label(index))
+                for index in best[:k]
+            ),
+            key=lambda item: (-item[0], item[1]),
+        )
+
+
+EMPTY = PrefixIndex(build({}, 1, 1, 0.0))
+
+
+class Suggester:
+    """
+    Snapshot index + recent changes of one kind of completions
+
+    `min_count` hides completions used fewer times (portals are suggested
+    before their first posting, titles aren't once their last one is gone)
+    """
+
+    def __init__(self, name, load_entries, min_count=1):
+        self.name = name
+        self.load_entries = load_entries
+        self.min_count = min_count
+        self.base = None
+        # looked up at least once, changes are recorded from then on
+        self.used = False
+        # key -> (label, count change, time.time() of the last change)
+        self.delta = {}
+        self.stale = False
+        self.checked_at = 0.0
+        self.mtime = None
+        self._lock = threading.Lock()
+        self._rebuilding = False
+
+    @property
+    def path(self):
+        directory = get_config()["PATH"]
+        return os.path.join(directory, f"{self.name}.idx") if directory else None
+
+    @property
+    def loaded(self):
+        """
+        The index is used by this process (maybe still being built)
+        """
+        return self.used
+
+    def add(self, user_id, label, count):
+        """
+        Record `count` more (or fewer) uses of `label` by a user since the snapshot
+        """
+        if not self.loaded:
+            # nothing loaded yet, the first lookup reads the changes anyway
+            return
+        key = user_key(user_id, label)
+        if key is None:
+            return
+        with self._lock:
+            current = self.delta.get(key, (label, 0, 0.0))
+            self.delta[key] = (current[0], current[1] + count, time.time())
+            too_big = len(self.delta) > get_config()["MAX_DELTA"]
+        if too_big:
+            self.schedule_rebuild()
+
+    def mark_stale(self):
+        """
+        Something a delta can't express changed (e.g. portal renamed),
+        the next lookup rebuilds the snapshot
+        """
+        self.stale = True
+        self.checked_at = 0.0
+
+    def complete(self, user_id, prefix, k):
+        """
+        Up to `k` ``{"text", "count"}`` completions of `prefix` of a user,
+        most used first
+        """
+        prefix = f"{user_id} {normalize(prefix)}"
+        base = self.get_base()
+        changes = {
+            key: (label, count)
+            for key, (label, count, _) in list(self.delta.items())
+            if key.startswith(prefix)
+        }
+
+        # changed keys can push at most len(changes) others out of the top k
+        candidates = {
+            key: (label, count)
+            for count, key, label in base.top(prefix, k + len(changes))
+        }
+        for key, (label, count) in changes.items():
+            if key in candidates:
+                label, base_count = candidates[key]
+            else:
+                base_count = base.count(key)
+            candidates[key] = (label, base_count + count)
+
+        best = sorted(
+            (-count, key, label)
+            for key, (label, count) in candidates.items()
+            if count >= self.min_count
+        )
+        return [{"text": label, "count": -count} for count, _, label in best[:k]]
+
+    def get_base(self):
+        config = get_config()
+        now = time.monotonic()
+
+        if self.base is None:
+            # first use in this process: map an existing snapshot or build one
+            self.used = True
+            if not self.load():
+                self.schedule_rebuild()
+        elif now - self.checked_at > config["CHECK_INTERVAL"]:
+            self.checked_at = now
+            self.load()
+            if self.stale or time.time() - self.base.started > config["MAX_AGE"]:
+                self.schedule_rebuild()
+        return self.base or EMPTY
+
+    def load(self):
+        """
+        Map the snapshot file if it's new (written by any process)
+        """
+        path = self.path
+        if path is None:
+            return self.base is not None
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            if mtime != self.mtime:
+                with open(path, "rb") as file:
+                    buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.use(PrefixIndex(buffer))
+                self.mtime = mtime
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def use(self, base):
+        with self._lock:
+            self.base = base
+            # changes older than the database read are part of the snapshot
+            self.delta = {
+                key: change
+                for key, change in self.delta.items()
+                if change[2] >= base.started
+            }
+
+    def schedule_rebuild(self):
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+
+        if get_config()["BACKGROUND"]:
+            threading.Thread(target=self.rebuild_in_background, daemon=True).start()
+        else:
+            self.rebuild()
+
+    def rebuild_in_background(self):
+        try:
+            self.rebuild()
+        finally:
+            # this thread's own connection, never the one of a request
+            connection.close()
+
+    def rebuild(self):
+        self._rebuilding = True
+        stale, self.stale = self.stale, False
+        try:
+            path = self.path
+            if path is None:
+                self.build()
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            requested = time.time()
+            with open(f"{path}.lock", "a") as lock:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # another worker is writing the file, picked up once done
+                    # (and checked again if it may have read the old rows)
+                    self.stale = stale
+                    return
+                # written by another worker while this one waited for the lock
+                self.load()
+                if self.base is None or self.base.started < requested:
+                    self.build()
+        except Exception:
+            logger.exception("Rebuilding %s suggestions failed", self.name)
+        finally:
+            self._rebuilding = False
+
+    def build(self):
+        """
+        Read the entries from the database & write (or keep) the snapshot
+        """
+        config = get_config()
+        started = time.time()
+        entries = {}
+        for user_id, label, count in self.load_entries():
+            key = user_key(user_id, label)
+            if key is not None:
+                previous = entries.get(key, (label, 0))
+                entries[key] = (previous[0], previous[1] + count)
+        data = build(entries, config["TOP_K"], config["SCAN_LIMIT"], started)
+
+        path = self.path
+        if path is None:
+            self.use(PrefixIndex(data))
+        else:
+            temporary = f"{path}.{os.getpid()}.{threading.get_ident()}"
+            with open(temporary, "wb") as file:
+                file.write(data)
+            # readers map either the old or the new complete file
+            os.replace(temporary, path)
+            self.load()
+
+
+def user_key(user_id, label):
+    """
+    Index key of `label` used by a user, None for blank labels
+    """
+    key = normalize(label)
+    return f"{user_id} {key}" if key else None
+
+
+def title_entries():
+    return (
+        JobTitle.objects.values_list("user", "title")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+
+# portal id -> name, postings only carry `portal_id`
+portal_names = {}
+
+
+def portal_entries():
+    """
+    Postings of each user per portal, and every portal for its owner
+    (suggested before its first posting)
+    """
+    global portal_names
+    rows = list(Portal.objects.values_list("id", "user", "name"))
+    portal_names = {portal_id: name for portal_id, _, name in rows}
+    yield from ((user_id, name, 0) for _, user_id, name in rows)
+    yield from (
+        JobTitle.objects.values_list("user", "portal__name")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+
+titles = Suggester("titles", title_entries)
+portals = Suggester("portals", portal_entries, min_count=0)
+
+
+def record(job_titles, change=1):
+    """
+    Count saved `job_titles` in the suggestions (``change=-1`` uncounts them)
+
+    Nothing to do (and no query) until this process has loaded the indexes,
+    the first lookup reads the database anyway.
+    """
+    if titles.loaded:
+        title_counts = Counter(
+            (job_title.user_id, job_title.title) for job_title in job_titles
+        )
+        for (user_id, title), count in title_counts.items():
+            titles.add(user_id, title, count * change)
+
+    if portals.loaded:
+        portal_counts = Counter(
+            (job_title.user_id, job_title.portal_id) for job_title in job_titles
+        )
+        missing = {portal_id for _, portal_id in portal_counts} - portal_names.keys()
+        if missing:
+            # created by another process since the last rebuild
+            portal_names.update(
+                Portal.objects.filter(pk__in=missing).values_list("id", "name")
+            )
+        for (user_id, portal_id), count in portal_counts.items():
+            if portal_id in portal_names:
+                portals.add(user_id, portal_names[portal_id], count * change)
+
+
+def record_portal(portal):
+    """
+    Suggest a new portal to its owner before its first posting
+    """
+    portal_names[portal.pk] = portal.name
+    portals.add(portal.user_id, portal.name, 0)
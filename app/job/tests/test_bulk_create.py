@@ -0,0 +1,146 @@
+"""
+Tests for bulk job title creation
+- HTTP POST - /api/jobtitle/jobtitles/bulk/
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import JobDescription, JobTitle, Portal
+
+BULK_URL = reverse("jobtitle:jobtitle-bulk")  # /api/jobtitle/jobtitles/bulk/
+
+
+def make_payload(portal, count):
+    return [
+        {
+            "title": f"Developer {index}",
+            "portal": portal.id,
+            "job_description": {
+                "role": f"Role {index}",
+                "description_text": "Django",
+            },
+        }
+        for index in range(count)
+    ]
+
+
+class TestPublicBulkCreateAPI(TestCase):
+    def test_auth_required(self):
+        res = APIClient().post(BULK_URL, [], format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TestPrivateBulkCreateAPI(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="bulk@gmail.com", password="bulk@123"
+        )
+        self.portal = Portal.objects.create(
+            user=self.user, name="Naukri", description="Jobs"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create(self):
+        payload = make_payload(self.portal, 3)
+
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data, {"created": 3})
+        job_titles = JobTitle.objects.filter(user=self.user).order_by("id")
+        self.assertEqual(
+            [
+                (job_title.title, job_title.job_description.role)
+                for job_title in job_titles
+            ],
+            [(item["title"], item["job_description"]["role"]) for item in payload],
+        )
+        self.assertTrue(
+            all(job_title.portal == self.portal for job_title in job_titles)
+        )
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """
+        Test validation & inserts cost the same number of queries for 2 or 20 rows
+        """
+        # first import of a user also creates its search stats row
+        self.client.post(BULK_URL, make_payload(self.portal, 1), format="json")
+
+        counts = []
+        # small enough for one INSERT per table even on SQLite (999 variables cap)
+        for count in (2, 20):
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(
+                    BULK_URL, make_payload(self.portal, count), format="json"
+                )
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
+
+    def test_thousands_of_rows(self):
+        """
+        Test a feed of thousands of rows is validated with one query per
+        model & written in batches, never with queries per row
+        """
+        count = 2000
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(
+                BULK_URL, make_payload(self.portal, count), format="json"
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data, {"created": count})
+        self.assertEqual(JobTitle.objects.filter(user=self.user).count(), count)
+        portal_lookups = [
+            query for query in queries if 'FROM "core_portal"' in query["sql"]
+        ]
+        self.assertEqual(len(portal_lookups), 1)
+        # INSERTs split by SQLite's 999 variables cap & LSH buckets looked up
+        # 500 at a time (job/duplicates.py)
+        self.assertLess(len(queries), count // 5)
+
+    def test_unknown_portal_creates_nothing(self):
+        payload = make_payload(self.portal, 2)
+        payload[1]["portal"] = self.portal.id + 100
+
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("portal", res.data[1])
+        self.assertFalse(JobTitle.objects.exists())
+        self.assertFalse(JobDescription.objects.exists())
+
+    def test_invalid_row(self):
+        payload = make_payload(self.portal, 2)
+        payload[0]["title"] = "x" * 30
+        del payload[1]["job_description"]["role"]
+
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("title", res.data[0])
+        self.assertIn("role", res.data[1]["job_description"])
+        self.assertFalse(JobTitle.objects.exists())
+
+    def test_empty_list(self):
+        res = self.client.post(BULK_URL, [], format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(BULK_JOB_TITLES={"MAX_ITEMS": 2, "BATCH_SIZE": 1000})
+    def test_too_many_rows(self):
+        res = self.client.post(BULK_URL, make_payload(self.portal, 3), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(JobTitle.objects.exists())
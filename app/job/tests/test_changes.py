@@ -0,0 +1,164 @@
+"""
+Tests for the change feed of job postings
+- HTTP GET - /api/jobtitle/jobtitles/changes/?since=<token>
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import JobDescription, JobTitle, Portal
+
+CHANGES_URL = reverse("jobtitle:jobtitle-changes")
+
+
+def detail_url(job_title_id):
+    return reverse("jobtitle:jobtitle-detail", args=[job_title_id])
+
+
+class ChangesTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="changes@gmail.com", password="changes@123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.portal = Portal.objects.create(
+            user=self.user, name="Naukri", description="Jobs"
+        )
+
+    def create_job_title(self, title, user=None):
+        user = user or self.user
+        job_description = JobDescription.objects.create(
+            user=user, role="Developer", description_text="Remote"
+        )
+        return JobTitle.objects.create(
+            user=user, title=title, portal=self.portal, job_description=job_description
+        )
+
+    def token(self):
+        return self.client.get(CHANGES_URL).data["next"]
+
+    def test_changes_since_token(self):
+        updated = self.create_job_title("Python Developer")
+        deleted = self.create_job_title("Java Developer")
+        since = self.token()
+
+        created = self.create_job_title("Go Developer")
+        updated.title = "Django Developer"
+        updated.save()
+        deleted_id = deleted.id
+        deleted.delete()
+        res = self.client.get(CHANGES_URL, {"since": since})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in res.data["created"]], [created.id])
+        self.assertEqual(res.data["updated"][0]["title"], "Django Developer")
+        self.assertEqual(
+            res.data["updated"][0]["job_description"], updated.job_description_id
+        )
+        self.assertEqual(res.data["deleted"], [deleted_id])
+        self.assertFalse(res.data["has_more"])
+
+        res = self.client.get(CHANGES_URL, {"since": res.data["next"]})
+        self.assertEqual(
+            (res.data["created"], res.data["updated"], res.data["deleted"]),
+            ([], [], []),
+        )
+
+    def test_changes_collapse(self):
+        since = self.token()
+        job_title = self.create_job_title("Python Developer")
+        job_title.save()
+        self.create_job_title("Java Developer").delete()
+        other_user = get_user_model().objects.create_user(
+            email="other@gmail.com", password="other@123"
+        )
+        self.create_job_title("Hidden", user=other_user)
+
+        res = self.client.get(CHANGES_URL, {"since": since})
+
+        self.assertEqual([item["id"] for item in res.data["created"]], [job_title.id])
+        self.assertEqual((res.data["updated"], res.data["deleted"]), ([], []))
+
+    def test_changes_pages(self):
+        since = self.token()
+        job_titles = [self.create_job_title(f"Developer {n}") for n in range(3)]
+
+        res = self.client.get(CHANGES_URL, {"since": since, "limit": 2})
+        self.assertTrue(res.data["has_more"])
+        res = self.client.get(CHANGES_URL, {"since": res.data["next"], "limit": 2})
+
+        self.assertFalse(res.data["has_more"])
+        self.assertEqual(
+            [item["id"] for item in res.data["created"]], [job_titles[2].id]
+        )
+
+    def test_description_update_is_a_change(self):
+        job_title = self.create_job_title("Python Developer")
+        since = self.token()
+
+        res = self.client.patch(
+            detail_url(job_title.id),
+            {"job_description": {"description_text": "On site"}},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.get(CHANGES_URL, {"since": since})
+
+        self.assertEqual([item["id"] for item in res.data["updated"]], [job_title.id])
+        job_title.refresh_from_db()
+        self.assertGreater(
+            job_title.last_updated, job_title.job_description.published_date
+        )
+
+    def test_user_row_locked_before_change(self):
+        job_title = self.create_job_title("Python Developer")
+
+        with CaptureQueriesContext(connection) as queries:
+            job_title.delete()
+
+        statements = [query["sql"] for query in queries]
+        lock = next(
+            position
+            for position, sql in enumerate(statements)
+            if sql.startswith("SELECT") and '"core_user"' in sql
+        )
+        insert = next(
+            position
+            for position, sql in enumerate(statements)
+            if sql.startswith('INSERT INTO "core_jobtitlechange"')
+        )
+        self.assertLess(lock, insert)
+
+    def test_invalid_token(self):
+        res = self.client.get(CHANGES_URL, {"since": "abc"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LastUpdatedTests(TestCase):
+    def test_last_updated_advances_on_update(self):
+        user = get_user_model().objects.create_user(
+            email="updated@gmail.com", password="updated@123"
+        )
+        portal = Portal.objects.create(user=user, name="Naukri", description="Jobs")
+        job_title = JobTitle.objects.create(
+            user=user,
+            title="Python Developer",
+            portal=portal,
+            job_description=JobDescription.objects.create(
+                user=user, role="Developer", description_text="Remote"
+            ),
+        )
+        created = job_title.last_updated
+
+        job_title.title = "Django Developer"
+        job_title.save(update_fields=["title"])
+        job_title.refresh_from_db()
+
+        self.assertGreater(job_title.last_updated, created)
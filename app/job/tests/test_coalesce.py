@@ -0,0 +1,186 @@
+"""
+Tests for coalescing of identical concurrent GETs of job titles
+- HTTP GET - /api/jobtitle/jobtitles/
+- HTTP GET - /api/jobtitle/jobtitles/<id>/
+"""
+
+import asyncio
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import metrics
+from core.models import JobDescription, JobTitle, Portal
+from job.coalesce import CoalescedGets
+from job.response_cache import response_cache
+
+
+def outcomes(layer, outcome):
+    return metrics.SINGLE_FLIGHT_REQUESTS.labels(layer, outcome)._value.get()
+
+
+class Application:
+    """
+    ASGI application answering after `release` is set, counting its calls
+    """
+
+    def __init__(self, status=200, headers=()):
+        self.status = status
+        self.headers = list(headers)
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        await self.release.wait()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status,
+                "headers": [(b"content-type", b"application/json"), *self.headers],
+            }
+        )
+        await send({"type": "http.response.body", "body": b'{"id": 1}'})
+
+
+class Client:
+    def __init__(self, path="/api/jobtitle/jobtitles/1/", token="a", method="GET"):
+        self.scope = {
+            "type": "http",
+            "method": method,
+            "path": path,
+            "query_string": b"",
+            "headers": [(b"authorization", f"Token {token}".encode())],
+        }
+        self.messages = []
+
+    async def receive(self):
+        return {"type": "http.request", "body": b""}
+
+    async def send(self, message):
+        self.messages.append(message)
+
+    async def get(self, application):
+        await application(self.scope, self.receive, self.send)
+        return self.messages[0]["status"], self.messages[1]["body"]
+
+
+class CoalescedGetsTests(SimpleTestCase):
+    async def gather(self, application, clients):
+        tasks = [
+            asyncio.create_task(client.get(CoalescedGets(application)))
+            for client in clients
+        ]
+        await asyncio.sleep(0.01)
+        application.release.set()
+        return await asyncio.gather(*tasks)
+
+    async def test_identical_gets_run_once(self):
+        application = Application()
+        shared = outcomes("asgi", "shared")
+
+        responses = await self.gather(application, [Client() for _ in range(5)])
+
+        self.assertEqual(application.calls, 1)
+        self.assertEqual(responses, [(200, b'{"id": 1}')] * 5)
+        self.assertEqual(outcomes("asgi", "shared"), shared + 4)
+
+    async def test_different_credentials_not_joined(self):
+        application = Application()
+
+        await self.gather(application, [Client(token="a"), Client(token="b")])
+
+        self.assertEqual(application.calls, 2)
+
+    async def test_other_paths_and_methods_not_joined(self):
+        application = Application()
+
+        await self.gather(
+            application,
+            [
+                Client(path="/api/jobtitle/jobtitles/export/"),
+                Client(path="/api/jobtitle/jobtitles/export/"),
+                Client(method="HEAD"),
+                Client(method="HEAD"),
+            ],
+        )
+
+        self.assertEqual(application.calls, 4)
+
+    async def test_server_error_not_shared(self):
+        application = Application(status=500)
+
+        responses = await self.gather(application, [Client(), Client()])
+
+        self.assertEqual(application.calls, 2)
+        self.assertEqual([status for status, _ in responses], [500, 500])
+
+    async def test_cookies_not_shared(self):
+        application = Application(headers=[(b"set-cookie", b"csrftoken=abc")])
+
+        await self.gather(application, [Client(), Client()])
+
+        self.assertEqual(application.calls, 2)
+
+    @override_settings(SINGLE_FLIGHT={"TIMEOUT": 0.01})
+    async def test_waiter_times_out(self):
+        application = Application()
+        leader = asyncio.create_task(Client().get(CoalescedGets(application)))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(Client().get(CoalescedGets(application)))
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(application.calls, 2)
+        application.release.set()
+        await asyncio.gather(leader, waiter)
+
+    @override_settings(SINGLE_FLIGHT={"ENABLED": False})
+    async def test_disabled(self):
+        application = Application()
+
+        await self.gather(application, [Client(), Client()])
+
+        self.assertEqual(application.calls, 2)
+
+
+class CoalescedViewTests(TestCase):
+    """
+    The view side (threads) goes through the same flights as cache misses
+    """
+
+    def setUp(self) -> None:
+        response_cache.clear()
+        self.addCleanup(response_cache.clear)
+        self.user = get_user_model().objects.create_user(
+            email="flight@gmail.com", password="flight@123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.job_title = JobTitle.objects.create(
+            user=self.user,
+            title="Python Developer",
+            portal=Portal.objects.create(
+                user=self.user, name="Naukri", description="Jobs"
+            ),
+            job_description=JobDescription.objects.create(
+                user=self.user, role="Developer", description_text="Remote"
+            ),
+        )
+
+    @override_settings(RESPONSE_CACHE={"ENABLED": False})
+    def test_miss_leads_flight(self):
+        leaders = outcomes("view", "leader")
+        url = reverse("jobtitle:jobtitle-detail", args=[self.job_title.id])
+
+        res = self.client.get(url)
+
+        self.assertEqual(res.data["title"], "Python Developer")
+        self.assertEqual(outcomes("view", "leader"), leaders + 1)
+
+    @override_settings(RESPONSE_CACHE={"ENABLED": False})
+    def test_not_found_not_shared(self):
+        url = reverse("jobtitle:jobtitle-detail", args=[self.job_title.id + 1])
+
+        self.assertEqual(self.client.get(url).status_code, 404)
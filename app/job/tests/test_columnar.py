@@ -0,0 +1,148 @@
+"""
+Tests for the columnar JSON media type of job postings
+- HTTP GET - /api/jobtitle/jobtitles/ (Accept: application/vnd.jobs.columnar+json)
+- HTTP GET - /api/jobtitle/jobtitles/export/?format=columnar
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import JobDescription, JobTitle, Portal
+from job import export
+from job.renderers import ColumnarJSONRenderer
+
+JOB_TITLE_URL = reverse("jobtitle:jobtitle-list")
+EXPORT_URL = reverse("jobtitle:jobtitle-export")
+COLUMNAR = "application/vnd.jobs.columnar+json"
+
+
+class ColumnarTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="columnar@gmail.com", password="columnar@123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        portals = [
+            Portal.objects.create(user=self.user, name=name, description="Jobs")
+            for name in ("Naukri", "LinkedIn")
+        ]
+        self.job_titles = [
+            JobTitle.objects.create(
+                user=self.user,
+                title=f"Developer {number}",
+                portal=portals[number % 2],
+                job_description=JobDescription.objects.create(
+                    user=self.user, role="Developer", description_text="Remote"
+                ),
+            )
+            for number in range(5)
+        ]
+
+    def test_list(self):
+        plain = self.client.get(JOB_TITLE_URL, {"page_size": 2}).data
+
+        res = self.client.get(JOB_TITLE_URL, {"page_size": 2}, HTTP_ACCEPT=COLUMNAR)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], f"{COLUMNAR}; charset=utf-8")
+        body = json.loads(res.content)
+        self.assertEqual(
+            body,
+            {
+                "next": plain["next"],
+                "previous": None,
+                "columns": ["id", "title"],
+                "rows": [[item["id"], item["title"]] for item in plain["results"]],
+            },
+        )
+
+    def test_list_dictionary(self):
+        res = self.client.get(
+            JOB_TITLE_URL,
+            {"format": "columnar", "fields": "id,portal.name", "dictionary": "portal"},
+        )
+
+        body = json.loads(res.content)
+        # nested objects aren't dictionary encoded
+        self.assertEqual(body["rows"][0][1], {"name": "Naukri"})
+
+        res = self.client.get(
+            JOB_TITLE_URL,
+            {"format": "columnar", "fields": "id,title", "dictionary": "title"},
+        )
+        body = json.loads(res.content)
+        self.assertEqual([row[1] for row in body["rows"]], [0, 1, 2, 3, 4])
+        self.assertEqual(body["dictionaries"]["title"][0], "Developer 4")
+
+    def test_list_errors_as_json(self):
+        res = self.client.get(JOB_TITLE_URL, {"portal": "x"}, HTTP_ACCEPT=COLUMNAR)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(res.content), {"portal": ["A valid integer is required."]}
+        )
+
+    def test_detail_not_columnar(self):
+        res = self.client.get(
+            reverse("jobtitle:jobtitle-detail", args=[self.job_titles[0].id]),
+            HTTP_ACCEPT=COLUMNAR,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+
+    @override_settings(EXPORT_JOB_TITLES={"BATCH_SIZE": 2})
+    def test_export(self):
+        res = self.client.get(
+            EXPORT_URL, {"dictionary": "portal_name,role"}, HTTP_ACCEPT=COLUMNAR
+        )
+
+        self.assertTrue(res.streaming)
+        body = json.loads(b"".join(res.streaming_content))
+        self.assertEqual(body["columns"], export.NAMES)
+        self.assertEqual(len(body["rows"]), 5)
+        portal_name = export.NAMES.index("portal_name")
+        self.assertEqual([row[portal_name] for row in body["rows"]], [0, 1, 0, 1, 0])
+        self.assertEqual(
+            body["dictionaries"],
+            {"portal_name": ["Naukri", "LinkedIn"], "role": ["Developer"]},
+        )
+        self.assertEqual(body["rows"][0][0], self.job_titles[-1].id)
+
+    def test_export_empty(self):
+        JobTitle.objects.all().delete()
+
+        res = self.client.get(EXPORT_URL, {"format": "columnar"})
+
+        body = json.loads(b"".join(res.streaming_content))
+        self.assertEqual(body, {"columns": export.NAMES, "rows": []})
+
+
+class ColumnarEncoderTests(SimpleTestCase):
+    def test_streamed_batch_by_batch(self):
+        batches = iter([[(1, "a")], [], [(2, "b"), (3, "a")]])
+        chunks = export.columnar(batches, names=["id", "name"], dictionary=["name"])
+
+        first = next(chunks)
+        # nothing read before the first chunk is sent
+        self.assertEqual(first, b'{"columns":["id","name"],"rows":[')
+        self.assertEqual(
+            json.loads(first + b"".join(chunks)),
+            {
+                "columns": ["id", "name"],
+                "rows": [[1, 0], [2, 1], [3, 0]],
+                "dictionaries": {"name": ["a", "b"]},
+            },
+        )
+
+    def test_renderer_of_plain_list(self):
+        rendered = ColumnarJSONRenderer().render([{"id": 1, "title": "Dev"}])
+
+        self.assertEqual(
+            json.loads(rendered), {"columns": ["id", "title"], "rows": [[1, "Dev"]]}
+        )
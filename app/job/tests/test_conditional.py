@@ -0,0 +1,155 @@
+"""
+Tests for conditional GET (ETag & Last-Modified) of job titles
+- HTTP GET - /api/jobtitle/jobtitles/
+- HTTP GET - /api/jobtitle/jobtitles/<id>/
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import JobDescription, JobTitle, Portal
+
+JOB_TITLE_URL = reverse("jobtitle:jobtitle-list")
+
+
+def detail_url(job_title_id):
+    return reverse("jobtitle:jobtitle-detail", args=[job_title_id])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="etag@gmail.com", password="etag@123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.portal = Portal.objects.create(
+            user=self.user, name="Naukri", description="Jobs"
+        )
+        self.job_title = self.create_job_title("Python Developer")
+
+    def create_job_title(self, title):
+        return JobTitle.objects.create(
+            user=self.user,
+            title=title,
+            portal=self.portal,
+            job_description=JobDescription.objects.create(
+                user=self.user, role="Developer", description_text="Remote"
+            ),
+        )
+
+    def test_list_not_modified(self):
+        res = self.client.get(JOB_TITLE_URL)
+        etag = res["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn("Last-Modified", res)
+
+        # only the version lookup, no rows & no serializer
+        with self.assertNumQueries(1):
+            res = self.client.get(JOB_TITLE_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+        self.create_job_title("Java Developer")
+        res = self.client.get(JOB_TITLE_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        self.assertEqual(len(res.data["results"]), 2)
+
+    def test_portal_change_moves_etags(self):
+        other_user = get_user_model().objects.create_user(
+            email="other@gmail.com", password="other@123"
+        )
+        other_client = APIClient()
+        other_client.force_authenticate(other_user)
+        other_job_title = JobTitle.objects.create(
+            user=other_user,
+            title="Java Developer",
+            portal=self.portal,
+            job_description=JobDescription.objects.create(
+                user=other_user, role="Developer", description_text="Remote"
+            ),
+        )
+        params = {"expand": "portal"}
+        requests = [
+            (self.client, JOB_TITLE_URL),
+            (self.client, detail_url(self.job_title.id)),
+            (other_client, JOB_TITLE_URL),
+            (other_client, detail_url(other_job_title.id)),
+        ]
+        etags = [client.get(url, params)["ETag"] for client, url in requests]
+
+        self.portal.name = "LinkedIn"
+        self.portal.save()
+
+        for (client, url), etag in zip(requests, etags):
+            res = client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(res["ETag"], etag)
+        self.assertEqual(res.data["portal"]["name"], "LinkedIn")
+
+    def test_list_etag_depends_on_query(self):
+        etag = self.client.get(JOB_TITLE_URL)["ETag"]
+
+        res = self.client.get(
+            JOB_TITLE_URL, {"portal": self.portal.id}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_list_etag_depends_on_user(self):
+        etag = self.client.get(JOB_TITLE_URL)["ETag"]
+        other_user = get_user_model().objects.create_user(
+            email="other@gmail.com", password="other@123"
+        )
+        self.client.force_authenticate(other_user)
+
+        res = self.client.get(JOB_TITLE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_detail_not_modified(self):
+        url = f"{detail_url(self.job_title.id)}?expand=job_description"
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(1):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        job_description = self.job_title.job_description
+        job_description.description_text = "On site"
+        job_description.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["job_description"]["description_text"], "On site")
+
+    def test_detail_if_modified_since(self):
+        url = detail_url(self.job_title.id)
+        last_modified = self.client.get(url)["Last-Modified"]
+
+        res = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        res = self.client.get(
+            url,
+            HTTP_IF_MODIFIED_SINCE=http_date(
+                self.job_title.last_updated.timestamp() - 60
+            ),
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_detail_of_other_user(self):
+        other_user = get_user_model().objects.create_user(
+            email="other@gmail.com", password="other@123"
+        )
+        self.client.force_authenticate(other_user)
+
+        res = self.client.get(detail_url(self.job_title.id), HTTP_IF_NONE_MATCH="*")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("ETag", res)
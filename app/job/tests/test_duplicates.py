@@ -0,0 +1,206 @@
+"""
+Tests for near-duplicate job descriptions
+- HTTP GET - /api/jobtitle/jobtitles/duplicates/
+- HTTP GET - /api/jobtitle/jobtitles/?collapse=duplicates
+"""
+
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import JobDescription, JobDescriptionSignature, JobTitle, Portal
+from job import duplicates
+
+JOB_TITLE_URL = reverse("jobtitle:jobtitle-list")
+DUPLICATES_URL = reverse("jobtitle:jobtitle-duplicates")
+
+TEXT = " ".join(f"w{number}" for number in range(40))
+
+
+def clusters_of(*job_titles):
+    return [
+        JobDescriptionSignature.objects.get(
+            job_description=job_title.job_description
+        ).cluster
+        for job_title in job_titles
+    ]
+
+
+class DuplicatesTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="duplicates@gmail.com", password="duplicates@123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.portals = [
+            Portal.objects.create(user=self.user, name=name, description="Jobs")
+            for name in ("Naukri", "LinkedIn", "Indeed")
+        ]
+
+    def create_job_title(self, text, portal=0, user=None):
+        user = user or self.user
+        job_description = JobDescription.objects.create(
+            user=user, role="Developer", description_text=text
+        )
+        return JobTitle.objects.create(
+            user=user,
+            title="Python Developer",
+            portal=self.portals[portal],
+            job_description=job_description,
+        )
+
+    def test_signature_estimates_jaccard(self):
+        config = duplicates.get_config()
+        functions = duplicates.hash_functions(config)
+        first = JobDescription(role="", description_text=TEXT)
+        # 2 of 40 words changed: 32 of 38 shingles shared, 44 in the union
+        second = JobDescription(
+            role="", description_text=TEXT.replace("w10", "x").replace("w30", "y")
+        )
+
+        estimate = duplicates.similarity(
+            duplicates.signature(first, config, functions),
+            duplicates.signature(second, config, functions),
+        )
+
+        self.assertAlmostEqual(estimate, 32 / 44, delta=0.1)
+
+    def test_cluster_on_write(self):
+        original = self.create_job_title(TEXT)
+        copy = self.create_job_title(TEXT + " remote", portal=1)
+        other = self.create_job_title("Java developer for spring boot services")
+        other_user = get_user_model().objects.create_user(
+            email="other@gmail.com", password="other@123"
+        )
+        foreign = self.create_job_title(TEXT, user=other_user)
+
+        self.assertEqual(clusters_of(original, copy), [original.job_description_id] * 2)
+        self.assertEqual(clusters_of(other), [other.job_description_id])
+        self.assertEqual(clusters_of(foreign), [foreign.job_description_id])
+
+    def test_each_pair_compared_once(self):
+        job_titles = [self.create_job_title(TEXT, portal) for portal in range(3)]
+
+        # identical, every band is shared, but never similar enough
+        with mock.patch.object(duplicates, "similarity", return_value=0.0) as patched:
+            duplicates.index_descriptions(
+                [job_title.job_description for job_title in job_titles]
+            )
+
+        self.assertEqual(patched.call_count, 3)
+        self.assertEqual(len(set(clusters_of(*job_titles))), 3)
+
+    def test_edit_moves_description_out_of_cluster(self):
+        original = self.create_job_title(TEXT)
+        copies = [self.create_job_title(TEXT, portal=n) for n in (1, 2)]
+
+        job_description = original.job_description
+        job_description.description_text = "Completely different text now"
+        job_description.save()
+
+        self.assertEqual(
+            clusters_of(original, *copies),
+            [job_description.id] + [copies[0].job_description_id] * 2,
+        )
+
+    def test_delete_relabels_cluster(self):
+        original = self.create_job_title(TEXT)
+        copies = [self.create_job_title(TEXT, portal=n) for n in (1, 2)]
+
+        original.job_description.delete()
+
+        self.assertFalse(
+            JobDescriptionSignature.objects.filter(
+                job_description_id=original.job_description_id
+            ).exists()
+        )
+        self.assertEqual(clusters_of(*copies), [copies[0].job_description_id] * 2)
+
+    def test_duplicates_api(self):
+        # description ids apart from job title ids
+        JobDescription.objects.create(user=self.user, role="", description_text="")
+        original = self.create_job_title(TEXT)
+        copy = self.create_job_title(TEXT + " remote", portal=1)
+        self.create_job_title("Java developer for spring boot services")
+
+        res = self.client.get(DUPLICATES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data,
+            [
+                {
+                    "cluster": original.job_description_id,
+                    "job_titles": [
+                        {
+                            "id": original.id,
+                            "title": original.title,
+                            "portal": self.portals[0].id,
+                        },
+                        {
+                            "id": copy.id,
+                            "title": copy.title,
+                            "portal": self.portals[1].id,
+                        },
+                    ],
+                }
+            ],
+        )
+
+    def test_list_collapse_duplicates(self):
+        original = self.create_job_title(TEXT)
+        self.create_job_title(TEXT + " remote", portal=1)
+        other = self.create_job_title("Java developer for spring boot services")
+
+        res = self.client.get(JOB_TITLE_URL, {"collapse": "duplicates"})
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]], [other.id, original.id]
+        )
+
+        original.delete()
+        res = self.client.get(JOB_TITLE_URL, {"collapse": "duplicates"})
+        self.assertEqual(len(res.data["results"]), 2)
+
+        res = self.client.get(JOB_TITLE_URL, {"collapse": "portal"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_collapse_duplicates_keeps_pages_full(self):
+        texts = [TEXT.replace("w", f"v{index}_") for index in range(3)]
+        originals = [self.create_job_title(text) for text in texts]
+        for text in texts:
+            self.create_job_title(text, portal=1)
+        other = self.create_job_title("Java developer for spring boot services")
+
+        seen = []
+        params = {"q": "python", "collapse": "duplicates", "page_size": 2}
+        res = self.client.get(JOB_TITLE_URL, params)
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            seen.extend(item["id"] for item in res.data["results"])
+            if res.data["next"] is None:
+                break
+            self.assertEqual(len(res.data["results"]), 2)
+            res = self.client.get(res.data["next"])
+
+        self.assertEqual(
+            sorted(seen), sorted([other.id] + [row.id for row in originals])
+        )
+
+    def test_find_duplicates_command(self):
+        original = self.create_job_title(TEXT)
+        copy = self.create_job_title(TEXT, portal=1)
+        JobDescriptionSignature.objects.all().delete()
+
+        out = StringIO()
+        call_command("find_duplicates", batch_size=1, stdout=out)
+
+        self.assertIn("Checked 2 job descriptions", out.getvalue())
+        self.assertIn("1 are near-duplicates", out.getvalue())
+        self.assertEqual(clusters_of(original, copy), [original.job_description_id] * 2)
@@ -0,0 +1,111 @@
+"""
+Tests for streaming export of job postings
+- HTTP GET - /api/jobtitle/jobtitles/export/
+"""
+
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import JobDescription, JobTitle, Portal
+
+EXPORT_URL = reverse("jobtitle:jobtitle-export")
+
+
+def content(response):
+    return b"".join(response.streaming_content).decode()
+
+
+class ExportTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="export@gmail.com", password="export@123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.portal = Portal.objects.create(
+            user=self.user, name="Naukri", description="Jobs"
+        )
+
+    def create_job_title(self, title, portal=None, user=None):
+        user = user or self.user
+        job_description = JobDescription.objects.create(
+            user=user, role="Developer", description_text=f"{title}, remote"
+        )
+        return JobTitle.objects.create(
+            user=user,
+            title=title,
+            portal=portal or self.portal,
+            job_description=job_description,
+        )
+
+    @override_settings(EXPORT_JOB_TITLES={"BATCH_SIZE": 2})
+    def test_export_jsonl(self):
+        job_titles = [self.create_job_title(f"Developer {n}") for n in range(5)]
+        other_user = get_user_model().objects.create_user(
+            email="other@gmail.com", password="other@123"
+        )
+        self.create_job_title("Hidden", user=other_user)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res["Content-Type"], "application/x-ndjson; charset=utf-8")
+        rows = [json.loads(line) for line in content(res).splitlines()]
+        self.assertEqual(
+            [row["id"] for row in rows],
+            [job_title.id for job_title in job_titles][::-1],
+        )
+        job_title = job_titles[0]
+        self.assertEqual(
+            rows[-1],
+            {
+                "id": job_title.id,
+                "title": "Developer 0",
+                "last_updated": rows[-1]["last_updated"],
+                "portal": self.portal.id,
+                "portal_name": "Naukri",
+                "job_description": job_title.job_description_id,
+                "role": "Developer",
+                "description_text": "Developer 0, remote",
+                "published_date": rows[-1]["published_date"],
+            },
+        )
+        self.assertTrue(rows[-1]["last_updated"].endswith("Z"))
+
+    def test_export_csv(self):
+        other_portal = Portal.objects.create(
+            user=self.user, name="LinkedIn", description="Jobs"
+        )
+        self.create_job_title("Python Developer")
+        job_title = self.create_job_title("Java Developer", portal=other_portal)
+
+        res = self.client.get(EXPORT_URL, {"format": "csv", "portal": other_portal.id})
+
+        self.assertEqual(res["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn("jobtitles.csv", res["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(content(res))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], str(job_title.id))
+        self.assertEqual(rows[0]["description_text"], "Java Developer, remote")
+        self.assertEqual(rows[0]["portal_name"], "LinkedIn")
+
+    def test_export_negotiation(self):
+        res = self.client.get(EXPORT_URL, HTTP_ACCEPT="text/csv")
+        self.assertEqual(content(res).splitlines()[0].split(",")[:2], ["id", "title"])
+
+        res = self.client.get(EXPORT_URL, HTTP_ACCEPT="application/json")
+        self.assertEqual(res.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+
+    def test_export_auth_required(self):
+        res = APIClient().get(EXPORT_URL, {"format": "csv"})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertTrue(res.content.startswith(b"detail\r\n"))
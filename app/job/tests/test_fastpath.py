@@ -0,0 +1,149 @@
+"""
+Tests for compiled read-only serializers, output must be the serializer's
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.models import JobDescription, JobTitle, Portal
+from job.fastpath import CompiledSerializer, compile_serializer
+from job.serializers import JobDescriptionSerializer, JobTitleSerializer
+
+
+class JobTitleRowSerializer(serializers.ModelSerializer):
+    """
+    Every kind of field the compiler handles
+    """
+
+    portal_name = serializers.CharField(source="portal.name")
+    id_text = serializers.CharField(source="id")
+    role = serializers.CharField(source="job_description.role", write_only=True)
+
+    class Meta:
+        model = JobTitle
+        fields = [
+            "id",
+            "title",
+            "last_updated",
+            "portal",
+            "job_description",
+            "portal_name",
+            "id_text",
+            "role",
+        ]
+
+
+class CompiledSerializerTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="compiled@gmail.com", password="compiled@123"
+        )
+        portals = [
+            Portal.objects.create(user=self.user, name=name, description="Jobs")
+            for name in ("Naukri", "Indeed")
+        ]
+        for number, title in enumerate(
+            ["Python Developer", "Développeur 🐍", 'Quote "title"', ""]
+        ):
+            JobTitle.objects.create(
+                user=self.user,
+                title=title,
+                portal=portals[number % 2],
+                job_description=JobDescription.objects.create(
+                    user=self.user, role="Developer", description_text="Remote"
+                ),
+            )
+        self.queryset = JobTitle.objects.order_by("-id")
+
+    def assertSameOutput(self, serializer_class):
+        compiled = CompiledSerializer(serializer_class)
+        expected = serializer_class(self.queryset, many=True).data
+
+        data = compiled.serialize(compiled.values_list(self.queryset))
+
+        self.assertEqual(data, expected)
+        self.assertEqual(JSONRenderer().render(data), JSONRenderer().render(expected))
+
+    def test_job_title_serializer(self):
+        self.assertSameOutput(JobTitleSerializer)
+
+    def test_every_field_kind(self):
+        self.assertSameOutput(JobTitleRowSerializer)
+
+    @override_settings(USE_TZ=False)
+    def test_naive_datetimes(self):
+        self.assertSameOutput(JobTitleRowSerializer)
+
+    def test_current_time_zone(self):
+        with timezone.override("Asia/Kolkata"):
+            self.assertSameOutput(JobTitleRowSerializer)
+
+    @override_settings(REST_FRAMEWORK={"DATETIME_FORMAT": "%d/%m/%Y %H:%M"})
+    def test_datetime_format(self):
+        self.assertSameOutput(JobTitleRowSerializer)
+
+    def test_columns(self):
+        compiled = CompiledSerializer(JobTitleRowSerializer)
+
+        self.assertEqual(
+            compiled.columns,
+            [
+                "id",
+                "title",
+                "last_updated",
+                "portal",
+                "job_description",
+                "portal__name",
+            ],
+        )
+        # text & ids are copied, datetimes & declared fields converted
+        self.assertIn("'title': row[1]", compiled.source)
+        self.assertIn("convert_0(row[2])", compiled.source)
+        self.assertIn(
+            "'id_text': None if row[0] is None else convert_2(row[0])", compiled.source
+        )
+
+    def test_nested_serializer_not_compiled(self):
+        with self.assertRaises(TypeError):
+            CompiledSerializer(JobDescriptionSerializer)
+
+    def test_compiled_once(self):
+        self.assertIs(
+            compile_serializer(JobTitleSerializer),
+            compile_serializer(JobTitleSerializer),
+        )
+
+
+@override_settings(RESPONSE_CACHE={"ENABLED": False})
+class CompiledListTests(TestCase):
+    def test_list_pages(self):
+        user = get_user_model().objects.create_user(
+            email="pages@gmail.com", password="pages@123"
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        portal = Portal.objects.create(user=user, name="Naukri", description="Jobs")
+        job_titles = [
+            JobTitle.objects.create(
+                user=user,
+                title=f"Developer {number}",
+                portal=portal,
+                job_description=JobDescription.objects.create(
+                    user=user, role="Developer", description_text="Remote"
+                ),
+            )
+            for number in range(5)
+        ]
+
+        res = client.get(reverse("jobtitle:jobtitle-list"), {"page_size": 3})
+        second = client.get(res.data["next"])
+
+        self.assertEqual(
+            res.data["results"] + second.data["results"],
+            JobTitleSerializer(job_titles[::-1], many=True).data,
+        )
@@ -0,0 +1,182 @@
+"""
+Tests for sparse fieldsets & expanded relations of job titles
+- HTTP GET - /api/jobtitle/jobtitles/?fields=...&expand=...
+- HTTP GET - /api/jobtitle/jobtitles/<id>/?fields=...&expand=...
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import JobDescription, JobTitle, Portal
+
+JOB_TITLE_URL = reverse("jobtitle:jobtitle-list")
+
+
+def detail_url(job_title_id):
+    return reverse("jobtitle:jobtitle-detail", args=[job_title_id])
+
+
+@override_settings(RESPONSE_CACHE={"ENABLED": False})
+class FieldSetTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="sparse@gmail.com", password="sparse@123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.portal = Portal.objects.create(
+            user=self.user, name="Naukri", description="Jobs"
+        )
+        self.job_titles = [
+            JobTitle.objects.create(
+                user=self.user,
+                title=f"Developer {number}",
+                portal=self.portal,
+                job_description=JobDescription.objects.create(
+                    user=self.user, role="Developer", description_text="Remote"
+                ),
+            )
+            for number in range(3)
+        ]
+
+    def get_list(self, **params):
+        """
+        Response & the SQL of the query reading the job titles
+        """
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(JOB_TITLE_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        selects = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith('SELECT "core_jobtitle"')
+        ]
+        self.assertEqual(len(selects), 1)
+        return res, selects[0]
+
+    def test_fields(self):
+        res, sql = self.get_list(fields="id,title")
+
+        self.assertEqual(
+            res.data["results"][0],
+            {"id": self.job_titles[-1].id, "title": "Developer 2"},
+        )
+        self.assertNotIn('"core_jobtitle"."portal_id"', sql)
+        self.assertNotIn('"core_jobtitle"."last_updated"', sql)
+
+    def test_related_field(self):
+        res, sql = self.get_list(fields="id,portal.name")
+
+        self.assertEqual(
+            res.data["results"][0],
+            {"id": self.job_titles[-1].id, "portal": {"name": "Naukri"}},
+        )
+        # one JOIN, no query per row & no unused portal column
+        self.assertIn('JOIN "core_portal"', sql)
+        self.assertIn('"core_portal"."name"', sql)
+        self.assertNotIn('"core_portal"."description"', sql)
+        self.assertNotIn('"core_jobtitle"."title"', sql)
+
+    def test_expand(self):
+        # the ETag version & the page with both relations joined
+        with self.assertNumQueries(2):
+            res = self.client.get(JOB_TITLE_URL, {"expand": "job_description,portal"})
+
+        job_title = self.job_titles[-1]
+        self.assertEqual(
+            res.data["results"][0],
+            {
+                "id": job_title.id,
+                "title": "Developer 2",
+                # same as the detail view expands it
+                "job_description": self.client.get(
+                    detail_url(job_title.id), {"expand": "job_description"}
+                ).data["job_description"],
+                "portal": {
+                    "id": self.portal.id,
+                    "name": "Naukri",
+                    "description": "Jobs",
+                },
+            },
+        )
+
+    def test_relation_not_expanded_is_id(self):
+        res, sql = self.get_list(fields="id,portal")
+
+        self.assertEqual(
+            res.data["results"][0],
+            {"id": self.job_titles[-1].id, "portal": self.portal.id},
+        )
+        self.assertNotIn("JOIN", sql)
+
+    def test_detail(self):
+        job_title = self.job_titles[0]
+
+        with self.assertNumQueries(2):
+            # the ETag version & the row
+            res = self.client.get(
+                detail_url(job_title.id),
+                {"fields": "title,job_description.role", "expand": "portal"},
+            )
+
+        self.assertEqual(
+            res.data,
+            {
+                "title": "Developer 0",
+                "job_description": {"role": "Developer"},
+                "portal": {
+                    "id": self.portal.id,
+                    "name": "Naukri",
+                    "description": "Jobs",
+                },
+            },
+        )
+
+    def test_detail_job_description_is_id(self):
+        job_title = self.job_titles[0]
+
+        res = self.client.get(detail_url(job_title.id), {"expand": "portal"})
+
+        default = self.client.get(detail_url(job_title.id)).data
+        self.assertEqual(default["job_description"], job_title.job_description_id)
+        self.assertEqual(res.data["job_description"], job_title.job_description_id)
+        self.assertEqual(res.data["portal"]["name"], "Naukri")
+
+    def test_search_results(self):
+        res = self.client.get(JOB_TITLE_URL, {"q": "developer", "fields": "title"})
+
+        self.assertEqual(
+            sorted(item["title"] for item in res.data["results"]),
+            ["Developer 0", "Developer 1", "Developer 2"],
+        )
+        self.assertEqual(list(res.data["results"][0]), ["title"])
+
+    def test_unknown_field(self):
+        for params in (
+            {"fields": "id,salary"},
+            {"fields": "title.name"},
+            {"fields": "portal.owner"},
+            {"fields": ","},
+            {"expand": "user"},
+        ):
+            res = self.client.get(JOB_TITLE_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_update_ignores_fieldset(self):
+        job_title = self.job_titles[0]
+
+        res = self.client.patch(
+            detail_url(job_title.id) + "?fields=id",
+            {"title": "Architect"},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["title"], "Architect")
+        self.assertEqual(res.data["portal"], self.portal.id)
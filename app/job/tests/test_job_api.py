@@ -156,8 +156,8 @@ class TestPrivateJobTitleAPI(TestCase):
 
         res = self.client.get(JOB_TITLE_URL)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        # solve error
-        # self.assertEqual(res.data, serialized_data.data)
+        # List endpoint is paginated so job-titles are under `results`
+        self.assertEqual(res.data["results"], serialized_data.data)
 
     def test_job_title_list_limited_to_user(self):
         """
@@ -190,12 +190,11 @@ class TestPrivateJobTitleAPI(TestCase):
 
         res = self.client.get(JOB_TITLE_URL)
         job_title = JobTitle.objects.all()
-        job_title_ = job_title.filter(user=self.user).order_by("id")
+        job_title_ = job_title.filter(user=self.user).order_by("-id")
 
         serialized_data = JobTitleSerializer(job_title_, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        # solve error
-        # self.assertEqual(res.data, serialized_data.data)
+        self.assertEqual(res.data["results"], serialized_data.data)
 
     def test_get_job_title_detail(self):
         """
@@ -354,23 +353,16 @@ class TestPrivateJobTitleAPI(TestCase):
         """
         Test trying to delete another user job-title gives error
         """
-        pass
-
-    #
-    #     new_user = create_user(
-    #         email="newuser@gmail.com",
-    #         password="newuser@123"
-    #     )
-    #     job_title = create_job_title(
-    #         user=new_user,
-    #         title="Random",
-    #         portal=self.portal,
-    #         job_description=create_job_description(self.user)
-    #     )
-    #
-    #     url = detail_url(job_title.id)
-    #     res = self.client.delete(url)
-    #
-    #     self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
-    #
-    #     self.assertFalse(JobTitle.objects.filter(id=job_title.id).exists())
+        new_user = create_user(email="newuser@gmail.com", password="newuser@123")
+        job_title = create_job_title(
+            user=new_user,
+            title="Random",
+            portal=self.portal,
+            job_description=create_job_description(new_user),
+        )
+
+        url = detail_url(job_title.id)
+        res = self.client.delete(url)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(JobTitle.objects.filter(id=job_title.id).exists())
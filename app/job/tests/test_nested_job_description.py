@@ -0,0 +1,147 @@
+"""
+Tests for writing JobTitle & JobDescription together
+- HTTP POST - /api/jobtitle/jobtitles/
+- HTTP PUT/PATCH - /api/jobtitle/jobtitles/<id>/
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import JobDescription, JobTitle, Portal
+
+JOB_TITLE_URL = reverse("jobtitle:jobtitle-list")
+
+
+def detail_url(job_title_id):
+    return reverse("jobtitle:jobtitle-detail", args=[job_title_id])
+
+
+class TestNestedJobDescriptionAPI(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="nested@gmail.com", password="nested@123"
+        )
+        self.portal = Portal.objects.create(
+            user=self.user, name="Naukri", description="Jobs"
+        )
+        self.job_description = JobDescription.objects.create(
+            user=self.user, role="Python Developer", description_text="Django"
+        )
+        self.job_title = JobTitle.objects.create(
+            user=self.user,
+            title="Developer",
+            portal=self.portal,
+            job_description=self.job_description,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_create_with_inline_description(self):
+        payload = {
+            "title": "Backend",
+            "portal": self.portal.id,
+            "job_description": {"role": "Go Developer", "description_text": "gRPC"},
+        }
+
+        res = self.client.post(JOB_TITLE_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        job_title = JobTitle.objects.get(id=res.data["id"])
+        self.assertEqual(job_title.job_description.role, "Go Developer")
+        self.assertEqual(job_title.job_description.user, self.user)
+        # rendered as the primary key, like a job_description given by id
+        self.assertEqual(res.data["job_description"], job_title.job_description_id)
+
+    def test_failed_create_leaves_no_orphan_description(self):
+        payload = {
+            "title": "Backend",
+            "portal": self.portal.id,
+            "job_description": {"role": "Go Developer", "description_text": "gRPC"},
+        }
+
+        with patch.object(
+            JobTitle.objects, "create", side_effect=RuntimeError("boom")
+        ), self.assertRaises(RuntimeError):
+            self.client.post(JOB_TITLE_URL, payload, format="json")
+
+        self.assertEqual(JobDescription.objects.count(), 1)
+
+    def test_description_already_linked(self):
+        payload = {
+            "title": "Backend",
+            "portal": self.portal.id,
+            "job_description": self.job_description.id,
+        }
+
+        res = self.client.post(JOB_TITLE_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("job_description", res.data)
+
+    def test_partial_update_of_description(self):
+        payload = {"job_description": {"role": "Senior Python Developer"}}
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.patch(
+                detail_url(self.job_title.id), payload, format="json"
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.job_description.refresh_from_db()
+        self.assertEqual(self.job_description.role, "Senior Python Developer")
+        self.assertEqual(self.job_description.description_text, "Django")
+
+        # Only the changed column is written, JobTitle row only gets its
+        # `last_updated` moved (search index bookkeeping aside, see job/search.py)
+        updates = [
+            q["sql"]
+            for q in queries
+            if q["sql"].startswith("UPDATE") and "search" not in q["sql"]
+        ]
+        self.assertEqual(len(updates), 2)
+        self.assertIn("role", updates[0])
+        self.assertNotIn("description_text", updates[0])
+        self.assertIn("last_updated", updates[1])
+        self.assertNotIn("title", updates[1].split(" SET ")[1].split(" WHERE ")[0])
+
+    def test_full_update(self):
+        payload = {
+            "title": "Architect",
+            "portal": self.portal.id,
+            "job_description": {
+                "role": "Python Architect",
+                "description_text": "Design",
+                "published_date": timezone.now().isoformat(),
+            },
+        }
+
+        res = self.client.put(detail_url(self.job_title.id), payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.job_title.refresh_from_db()
+        self.assertEqual(self.job_title.title, "Architect")
+        # Description is updated in place, not replaced
+        self.assertEqual(self.job_title.job_description_id, self.job_description.id)
+        self.assertEqual(self.job_title.job_description.role, "Python Architect")
+
+    def test_unchanged_update_writes_nothing(self):
+        payload = {
+            "title": "Developer",
+            "job_description": {"role": "Python Developer"},
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.patch(
+                detail_url(self.job_title.id), payload, format="json"
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse([q for q in queries if q["sql"].startswith("UPDATE")])
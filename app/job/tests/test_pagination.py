@@ -0,0 +1,119 @@
+"""
+Tests for cursor pagination of JobTitle list endpoint
+"""
+
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import JobTitle, JobDescription, Portal
+from job.pagination import JobTitleCursorPagination
+
+JOB_TITLE_URL = reverse("jobtitle:jobtitle-list")
+
+
+class TestJobTitleCursorPagination(TestCase):
+    """
+    Test list endpoint pages through job titles with opaque cursors
+    """
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="cursor@gmail.com", password="cursor@123"
+        )
+        self.portal = Portal.objects.create(
+            user=self.user, name="Indeed", description="Job searching platform"
+        )
+        self.client.force_authenticate(self.user)
+
+    def create_job_titles(self, count):
+        """
+        Creates `count` job titles and returns them ordered by newest first
+        """
+        job_titles = []
+        for index in range(count):
+            job_description = JobDescription.objects.create(
+                user=self.user, role="Developer", description_text=f"Job {index}"
+            )
+            job_titles.append(
+                JobTitle.objects.create(
+                    user=self.user,
+                    title=f"Job {index}",
+                    portal=self.portal,
+                    job_description=job_description,
+                )
+            )
+        return list(reversed(job_titles))
+
+    def test_list_is_paginated(self):
+        """
+        Test list returns a single page with cursor links
+        """
+        job_titles = self.create_job_titles(3)
+
+        res = self.client.get(JOB_TITLE_URL, {"page_size": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]],
+            [job_title.id for job_title in job_titles[:2]],
+        )
+        self.assertIsNotNone(res.data["next"])
+        self.assertIsNone(res.data["previous"])
+
+    def test_following_cursors_returns_every_row_once(self):
+        """
+        Test walking `next` links visits every job title exactly once in `-id` order
+        """
+        job_titles = self.create_job_titles(7)
+
+        seen = []
+        url, params = JOB_TITLE_URL, {"page_size": 3}
+        while url:
+            res = self.client.get(url, params)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            seen.extend(item["id"] for item in res.data["results"])
+            # `next` already carries the cursor & page size in its query string
+            url, params = res.data["next"], None
+
+        self.assertEqual(seen, [job_title.id for job_title in job_titles])
+
+    def test_cursor_is_stable_when_rows_are_added(self):
+        """
+        Test rows created while paging don't shift the next page
+        """
+        job_titles = self.create_job_titles(4)
+
+        first_page = self.client.get(JOB_TITLE_URL, {"page_size": 2})
+        self.create_job_titles(2)
+        second_page = self.client.get(first_page.data["next"])
+
+        self.assertEqual(
+            [item["id"] for item in second_page.data["results"]],
+            [job_title.id for job_title in job_titles[2:]],
+        )
+
+    @patch.object(JobTitleCursorPagination, "max_page_size", 2)
+    def test_page_size_is_capped(self):
+        """
+        Test client can't ask for more than `max_page_size` rows at once
+        """
+        self.create_job_titles(3)
+
+        res = self.client.get(JOB_TITLE_URL, {"page_size": 10_000})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 2)
+
+    def test_invalid_cursor_returns_error(self):
+        """
+        Test a tampered cursor is rejected
+        """
+        res = self.client.get(JOB_TITLE_URL, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
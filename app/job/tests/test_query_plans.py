@@ -0,0 +1,141 @@
+"""
+Query-plan checks for JobTitle list endpoint
+
+Runs EXPLAIN on the exact SQL the list endpoint executes and makes sure
+the database uses the composite (user_id, -id) index: no full table scan
+and no filesort, while the table keeps growing.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import JobTitle, JobDescription, Portal
+
+JOB_TITLE_URL = reverse("jobtitle:jobtitle-list")
+
+
+def explain(sql):
+    """
+    Returns the query plan of `sql` as list of strings (one per plan row)
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return [row[-1] for row in cursor.fetchall()]
+
+        # MySQL - traditional EXPLAIN, columns like `table`, `type`, `key`, `Extra`
+        cursor.execute(f"EXPLAIN {sql}")
+        columns = [column[0] for column in cursor.description]
+        return [
+            " ".join(f"{key}={value}" for key, value in zip(columns, row))
+            for row in cursor.fetchall()
+        ]
+
+
+# rows are added with bulk_create (no signals), every request must hit the database
+@override_settings(RESPONSE_CACHE={"ENABLED": False})
+class TestJobTitleListQueryPlan(TestCase):
+    """
+    Test list query keeps using the index as the table grows
+    """
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="plan@gmail.com", password="plan@123"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            email="other-plan@gmail.com", password="plan@123"
+        )
+        self.portal = Portal.objects.create(
+            user=self.user, name="LinkedIn", description="Professional network"
+        )
+        self.client.force_authenticate(self.user)
+
+    def grow(self, count):
+        """
+        Add `count` job titles split between two users
+        """
+        for user in (self.user, self.other_user):
+            JobDescription.objects.bulk_create(
+                JobDescription(user=user, role="Developer", description_text="Plan")
+                for _ in range(count // 2)
+            )
+            # MySQL doesn't return ids from bulk_create, so read them back
+            free_descriptions = JobDescription.objects.filter(
+                user=user, jobtitle__isnull=True
+            ).values_list("id", flat=True)
+            JobTitle.objects.bulk_create(
+                JobTitle(
+                    user=user,
+                    title="Plan",
+                    portal=self.portal,
+                    job_description_id=job_description_id,
+                )
+                for job_description_id in free_descriptions
+            )
+
+    def list_queries(self, url=JOB_TITLE_URL, params=None):
+        """
+        SQL statements the list endpoint ran against `core_jobtitle`
+        """
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(url, params or {})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        table = connection.ops.quote_name(JobTitle._meta.db_table)
+        return res, [q["sql"] for q in context.captured_queries if table in q["sql"]]
+
+    def assert_uses_index(self, sql):
+        plan = explain(sql)
+        detail = "\n".join(plan)
+
+        if connection.vendor == "sqlite":
+            self.assertNotIn("USE TEMP B-TREE", detail)  # sqlite's filesort
+            for row in plan:
+                if "core_jobtitle" in row and row.startswith("SCAN"):
+                    self.assertIn("USING", row, msg=detail)
+        elif connection.vendor == "mysql":
+            self.assertNotIn("filesort", detail)
+            self.assertNotIn("type=ALL", detail)
+        else:
+            self.skipTest(f"No query plan check for {connection.vendor}")
+
+    def test_list_query_uses_index_as_table_grows(self):
+        """
+        Test first page & a deep cursor page never filesort or full scan
+        """
+        for size in (10, 200, 2000):
+            self.grow(size)
+
+            res, queries = self.list_queries(params={"page_size": 2})
+            self.assertEqual(len(queries), 1)
+            self.assert_uses_index(queries[0])
+
+            # Page 2 adds ``id < cursor`` which must still be an index range
+            _, queries = self.list_queries(res.data["next"])
+            self.assertEqual(len(queries), 1)
+            self.assert_uses_index(queries[0])
+
+    def test_list_query_is_scoped_to_user(self):
+        """
+        Test the list SQL filters by the requesting user
+        """
+        self.grow(10)
+
+        res, queries = self.list_queries()
+
+        self.assertIn("user_id", queries[0])
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]],
+            list(
+                JobTitle.objects.filter(user=self.user)
+                .order_by("-id")
+                .values_list("id", flat=True)
+            ),
+        )
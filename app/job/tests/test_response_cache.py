@@ -0,0 +1,160 @@
+"""
+Tests for the cache of rendered job title responses
+- HTTP GET - /api/jobtitle/jobtitles/
+- HTTP GET - /api/jobtitle/jobtitles/<id>/
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import metrics
+from core.models import JobDescription, JobTitle, Portal
+from job.response_cache import response_cache, user_version_key
+
+JOB_TITLE_URL = reverse("jobtitle:jobtitle-list")
+
+
+def detail_url(job_title_id):
+    return reverse("jobtitle:jobtitle-detail", args=[job_title_id])
+
+
+def lookups(tier, result):
+    return metrics.RESPONSE_CACHE_LOOKUPS.labels(tier, result)._value.get()
+
+
+@override_settings(RESPONSE_CACHE={"ENABLED": True})
+class ResponseCacheTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        response_cache.clear()
+        self.addCleanup(response_cache.clear)
+        self.user = get_user_model().objects.create_user(
+            email="cached@gmail.com", password="cached@123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.portal = Portal.objects.create(
+            user=self.user, name="Naukri", description="Jobs"
+        )
+        self.job_title = self.create_job_title("Python Developer")
+
+    def create_job_title(self, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            return JobTitle.objects.create(
+                user=self.user,
+                title=title,
+                portal=self.portal,
+                job_description=JobDescription.objects.create(
+                    user=self.user, role="Developer", description_text="Remote"
+                ),
+            )
+
+    def test_list_served_from_cache(self):
+        first = self.client.get(JOB_TITLE_URL)
+
+        # the ETag version only, no rows & no serializer
+        with self.assertNumQueries(1):
+            second = self.client.get(JOB_TITLE_URL)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["Content-Type"], "application/json")
+        self.assertEqual(
+            second.data["results"],
+            [{"id": self.job_title.id, "title": "Python Developer"}],
+        )
+
+    def test_new_job_title_invalidates_list(self):
+        self.client.get(JOB_TITLE_URL)
+
+        job_title = self.create_job_title("Java Developer")
+        res = self.client.get(JOB_TITLE_URL)
+
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]],
+            [job_title.id, self.job_title.id],
+        )
+
+    def test_description_update_invalidates_detail(self):
+        url = detail_url(self.job_title.id)
+        params = {"expand": "job_description"}
+        self.client.get(url, params)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.patch(
+                url, {"job_description": {"role": "Architect"}}, format="json"
+            )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.get(url, params)
+
+        self.assertEqual(res.data["job_description"]["role"], "Architect")
+
+    def test_delete_invalidates_detail(self):
+        url = detail_url(self.job_title.id)
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job_title.delete()
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_portal_change_bumps_user_version(self):
+        before = cache.get(user_version_key(self.user.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.portal.description = "More jobs"
+            self.portal.save()
+
+        self.assertGreater(cache.get(user_version_key(self.user.id)), before)
+
+    def test_portal_change_invalidates_expanded_responses(self):
+        params = {"expand": "portal"}
+        url = detail_url(self.job_title.id)
+        self.client.get(JOB_TITLE_URL, params)
+        self.client.get(url, params)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.portal.name = "LinkedIn"
+            self.portal.save()
+
+        res = self.client.get(JOB_TITLE_URL, params)
+        self.assertEqual(res.data["results"][0]["portal"]["name"], "LinkedIn")
+        res = self.client.get(url, params)
+        self.assertEqual(res.data["portal"]["name"], "LinkedIn")
+
+    def test_shared_tier(self):
+        url = detail_url(self.job_title.id)
+        self.client.get(url)
+        # another process: empty local tier, same shared cache
+        response_cache.clear()
+        shared_hits = lookups("shared", "hit")
+
+        with self.assertNumQueries(1):
+            res = self.client.get(url)
+
+        self.assertEqual(res.data["title"], "Python Developer")
+        self.assertEqual(lookups("shared", "hit"), shared_hits + 1)
+
+    @override_settings(
+        RESPONSE_CACHE={"ENABLED": True, "SHARED": False, "MAX_BYTES": 100}
+    )
+    def test_local_tier_byte_cap(self):
+        response_cache.clear()
+        evictions = metrics.RESPONSE_CACHE_EVICTIONS._value.get()
+        job_title = self.create_job_title("Java Developer")
+
+        self.client.get(detail_url(self.job_title.id))
+        self.client.get(detail_url(job_title.id))
+
+        self.assertEqual(response_cache.stats()["size"], 1)
+        self.assertLessEqual(response_cache.stats()["total_size"], 100)
+        self.assertEqual(metrics.RESPONSE_CACHE_EVICTIONS._value.get(), evictions + 1)
+
+    def test_browsable_api_not_cached(self):
+        self.client.get(JOB_TITLE_URL, HTTP_ACCEPT="text/html")
+
+        self.assertEqual(response_cache.stats()["size"], 0)
@@ -0,0 +1,341 @@
+"""
+Tests for full-text search of job titles
+- HTTP GET - /api/jobtitle/jobtitles/?q=...
+"""
+
+import math
+import random
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    JobDescription,
+    JobTitle,
+    JobTitleSearchStats,
+    JobTitleSearchTerm,
+    Portal,
+)
+from job import search
+
+JOB_TITLE_URL = reverse("jobtitle:jobtitle-list")
+
+
+class SearchTestMixin:
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="search@gmail.com", password="search@123"
+        )
+        self.portal = Portal.objects.create(
+            user=self.user, name="Naukri", description="Jobs"
+        )
+        search.clear_cache()
+        self.addCleanup(search.clear_cache)
+
+    def create_job_title(
+        self, title, role="Developer", text="", portal=None, user=None
+    ):
+        user = user or self.user
+        job_description = JobDescription.objects.create(
+            user=user, role=role, description_text=text
+        )
+        return JobTitle.objects.create(
+            user=user,
+            title=title,
+            portal=portal or self.portal,
+            job_description=job_description,
+        )
+
+
+class SearchIndexTests(SearchTestMixin, TestCase):
+    def test_tokenize(self):
+        self.assertEqual(
+            search.tokenize("Build the REST APIs, with Django-4!"),
+            ["build", "rest", "apis", "django", "4"],
+        )
+
+    def test_ranking(self):
+        weak = self.create_job_title("Tester", text="some python scripts")
+        strong = self.create_job_title("Python Developer", role="Python Developer")
+        self.create_job_title("Java Developer", text="Spring")
+
+        ranked = search.search(self.user, "python")
+
+        self.assertEqual([pk for _, pk in ranked], [strong.id, weak.id])
+        self.assertGreater(ranked[0][0], ranked[1][0])
+
+    def test_index_follows_updates(self):
+        job_title = self.create_job_title("Java Developer")
+
+        job_title.title = "Golang Developer"
+        job_title.save()
+
+        self.assertEqual(search.search(self.user, "java"), [])
+        self.assertEqual(len(search.search(self.user, "golang")), 1)
+
+    def test_index_follows_description_updates(self):
+        job_title = self.create_job_title("Developer", text="Django")
+
+        job_title.job_description.description_text = "Flask"
+        job_title.job_description.save(update_fields=["description_text"])
+
+        self.assertEqual(search.search(self.user, "django"), [])
+        self.assertEqual(len(search.search(self.user, "flask")), 1)
+
+    def test_delete_removes_from_index(self):
+        job_title = self.create_job_title("Python Developer")
+        self.create_job_title("Java Developer")
+
+        job_title.delete()
+
+        self.assertEqual(search.search(self.user, "python"), [])
+        stats = JobTitleSearchStats.objects.get(user=self.user)
+        self.assertEqual(stats.documents, 1)
+
+    def test_scoped_to_user(self):
+        other = get_user_model().objects.create_user(
+            email="other@gmail.com", password="other@123"
+        )
+        self.create_job_title("Python Developer", user=other)
+
+        self.assertEqual(search.search(self.user, "python"), [])
+
+    def test_rebuild_matches_incremental_index(self):
+        for index in range(5):
+            self.create_job_title(f"Python Developer {index}", text="python " * index)
+        incremental = search.search(self.user, "python developer")
+
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertEqual(search.search(self.user, "python developer"), incremental)
+
+    def exhaustive(self, query, portal_id=None, after=None, limit=50):
+        """
+        BM25 ranking reading every posting of the query words
+        """
+        terms = list(dict.fromkeys(search.tokenize(query)))
+        stats = JobTitleSearchStats.objects.get(user=self.user)
+        average_length = stats.total_length / stats.documents
+        postings = JobTitleSearchTerm.objects.filter(user=self.user, term__in=terms)
+        weights = {}
+        for job_title_id, term, frequency, length, portal in postings.values_list(
+            "job_title_id", "term", "frequency", "document_length", "portal_id"
+        ):
+            weights.setdefault(term, []).append(
+                (job_title_id, portal, frequency, length)
+            )
+        scores = {}
+        for term in terms:
+            count = len(weights.get(term, []))
+            idf = math.log(1 + (stats.documents - count + 0.5) / (count + 0.5))
+            for job_title_id, portal, frequency, length in weights.get(term, []):
+                if portal_id is None or portal == portal_id:
+                    scores[job_title_id] = scores.get(
+                        job_title_id, 0
+                    ) + idf * search.weight(frequency, length, average_length)
+        ranked = sorted(((score, pk) for pk, score in scores.items()), reverse=True)
+        if after is not None:
+            ranked = [item for item in ranked if item < after]
+        return ranked[:limit]
+
+    @mock.patch("job.search.MAX_LOOKUPS", 3)
+    @mock.patch("job.search.BLOCK_SIZE", 4)
+    def test_early_termination_matches_exhaustive_ranking(self):
+        words = ["python", "django", "rest", "apis", "aws", "rust", "remote"]
+        other = Portal.objects.create(user=self.user, name="Indeed", description="")
+        rng = random.Random(12)
+        for index in range(120):
+            self.create_job_title(
+                " ".join(rng.choices(words[:4], k=rng.randint(1, 3))),
+                text=" ".join(rng.choices(words, k=rng.randint(0, 30))),
+                portal=other if index % 3 else self.portal,
+            )
+
+        for query in ["python", "python django", "aws rust remote", "rest nothing"]:
+            for limit in (1, 5, 50):
+                for portal_id in (None, other.id):
+                    with self.subTest(query=query, limit=limit, portal=portal_id):
+                        expected = self.exhaustive(query, portal_id, limit=limit)
+                        ranked = search.search(
+                            self.user, query, portal_id=portal_id, limit=limit
+                        )
+                        self.assertEqual(ranked, expected)
+                        if not ranked:
+                            continue
+                        self.assertEqual(
+                            search.search(
+                                self.user, query, portal_id, ranked[-1], limit
+                            ),
+                            self.exhaustive(query, portal_id, ranked[-1], limit),
+                        )
+
+    @mock.patch("job.search.BLOCK_SIZE", 4)
+    def test_common_word_not_read_whole(self):
+        for index in range(40):
+            self.create_job_title("Developer", text="python " * (index % 7))
+
+        with CaptureQueriesContext(connection) as queries:
+            search.search(self.user, "developer", limit=2)
+
+        # two blocks (4 + 16 of the 40 postings) were enough
+        reads = [query["sql"] for query in queries if "density" in query["sql"]]
+        self.assertEqual(len(reads), 2)
+        self.assertTrue(reads[-1].endswith("LIMIT 16"))
+
+    @mock.patch("job.search.BLOCK_SIZE", 4)
+    def test_rare_word_looks_other_words_up(self):
+        for index in range(40):
+            text = "remote " * (index % 9) + ("rust" if index % 13 == 5 else "")
+            self.create_job_title("Engineer", text=text)
+
+        with CaptureQueriesContext(connection) as queries:
+            ranked = search.search(self.user, "rust remote", limit=2)
+
+        # one block of each term, "remote" of the "rust" postings read by id
+        reads = [query["sql"] for query in queries if "density" in query["sql"]]
+        self.assertEqual(len(reads), 2)
+        lookups = [query for query in queries if '"job_title_id" IN' in query["sql"]]
+        self.assertEqual(len(lookups), 1)
+        self.assertEqual(ranked, self.exhaustive("rust remote", limit=2))
+
+    @mock.patch("job.search.MAX_TERM_POSTINGS", 8)
+    @mock.patch("job.search.BLOCK_SIZE", 4)
+    def test_long_list_read_whole_and_cached(self):
+        for index in range(40):
+            self.create_job_title("Developer", text="remote " * (index % 9))
+
+        with CaptureQueriesContext(connection) as queries:
+            ranked = search.search(self.user, "developer", limit=2)
+
+        # 4 + 4 postings, then the other 32 at once (all tied)
+        reads = [query["sql"] for query in queries if "density" in query["sql"]]
+        self.assertEqual(len(reads), 3)
+        self.assertNotIn("LIMIT", reads[-1])
+        self.assertEqual(ranked, self.exhaustive("developer", limit=2))
+
+        with CaptureQueriesContext(connection) as queries:
+            ranked = search.search(self.user, "developer remote", limit=2)
+
+        # "developer" comes from the cache, only "remote" is read
+        reads = [query["sql"] for query in queries if "density" in query["sql"]]
+        self.assertTrue(reads)
+        self.assertFalse([sql for sql in reads if "'developer'" in sql])
+        self.assertEqual(ranked, self.exhaustive("developer remote", limit=2))
+
+    @mock.patch("job.search.MAX_TERM_POSTINGS", 8)
+    @mock.patch("job.search.BLOCK_SIZE", 4)
+    def test_cached_list_follows_updates(self):
+        job_titles = [self.create_job_title("Developer") for _ in range(20)]
+        search.search(self.user, "developer", limit=2)
+
+        job_titles[0].title = "Developer Developer"
+        job_titles[0].save()
+
+        ranked = search.search(self.user, "developer", limit=2)
+        self.assertEqual(ranked[0][1], job_titles[0].id)
+        self.assertEqual(ranked, self.exhaustive("developer", limit=2))
+
+
+class SearchAPITests(SearchTestMixin, TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_search(self):
+        job_title = self.create_job_title("Python Developer")
+        self.create_job_title("Java Developer")
+
+        res = self.client.get(JOB_TITLE_URL, {"q": "python"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["results"], [{"id": job_title.id, "title": job_title.title}]
+        )
+
+    def test_search_with_portal_filter(self):
+        other_portal = Portal.objects.create(
+            user=self.user, name="LinkedIn", description="Jobs"
+        )
+        self.create_job_title("Python Developer")
+        job_title = self.create_job_title("Python Engineer", portal=other_portal)
+
+        res = self.client.get(JOB_TITLE_URL, {"q": "python", "portal": other_portal.id})
+
+        self.assertEqual([row["id"] for row in res.data["results"]], [job_title.id])
+
+    def test_portal_filter_without_search(self):
+        other_portal = Portal.objects.create(
+            user=self.user, name="LinkedIn", description="Jobs"
+        )
+        self.create_job_title("Python Developer")
+        job_title = self.create_job_title("Java Developer", portal=other_portal)
+
+        res = self.client.get(JOB_TITLE_URL, {"portal": other_portal.id})
+
+        self.assertEqual([row["id"] for row in res.data["results"]], [job_title.id])
+
+    def test_invalid_portal_filter(self):
+        res = self.client.get(JOB_TITLE_URL, {"portal": "abc"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_cursor_paging(self):
+        for index in range(5):
+            self.create_job_title("Python Developer", text="python " * index)
+        expected = [pk for _, pk in search.search(self.user, "python")]
+
+        seen = []
+        res = self.client.get(JOB_TITLE_URL, {"q": "python", "page_size": 2})
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            seen.extend(row["id"] for row in res.data["results"])
+            if res.data["next"] is None:
+                break
+            res = self.client.get(res.data["next"])
+
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(seen), 5)
+
+    @mock.patch("job.search.MAX_TERM_POSTINGS", 8)
+    @mock.patch("job.search.BLOCK_SIZE", 4)
+    def test_search_cursor_paging_of_ties(self):
+        # more equally scored postings than are read block by block
+        job_titles = [self.create_job_title("Python Developer") for _ in range(30)]
+
+        seen = []
+        res = self.client.get(JOB_TITLE_URL, {"q": "python", "page_size": 4})
+        while True:
+            seen.extend(row["id"] for row in res.data["results"])
+            if res.data["next"] is None:
+                break
+            res = self.client.get(res.data["next"])
+
+        self.assertEqual(seen, sorted((row.id for row in job_titles), reverse=True))
+
+    def test_invalid_search_cursor(self):
+        res = self.client.get(JOB_TITLE_URL, {"q": "python", "cursor": "bad"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_created_rows_are_searchable(self):
+        payload = [
+            {
+                "title": "Rust Developer",
+                "portal": self.portal.id,
+                "job_description": {"role": "Rust", "description_text": "Tokio"},
+            }
+        ]
+
+        self.client.post(reverse("jobtitle:jobtitle-bulk"), payload, format="json")
+
+        res = self.client.get(JOB_TITLE_URL, {"q": "tokio"})
+        self.assertEqual(len(res.data["results"]), 1)
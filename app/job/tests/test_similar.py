@@ -0,0 +1,192 @@
+"""
+Tests for "similar jobs" recommendations
+- HTTP GET - /api/jobtitle/jobtitles/<id>/similar/
+"""
+
+import threading
+import time
+from collections import Counter
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import JobDescription, JobTitle, Portal
+from job import similar
+
+DOCUMENTS = [
+    (1, 1, Counter({"python": 2, "developer": 1})),
+    (2, 1, Counter({"python": 1, "django": 3})),
+    (3, 2, Counter({"java": 2, "developer": 1})),
+    (5, 1, Counter({"rust": 1})),
+]
+
+
+def similar_url(job_title_id):
+    return reverse("jobtitle:jobtitle-similar", args=[job_title_id])
+
+
+def dense(matrix):
+    vectors = np.zeros((len(matrix), len(matrix.vocabulary)))
+    for column in range(len(matrix.vocabulary)):
+        start, end = matrix.indptr[column], matrix.indptr[column + 1]
+        vectors[matrix.rows[start:end], column] = matrix.values[start:end]
+    return vectors
+
+
+class MatrixTests(TestCase):
+    def test_scores_are_cosine_similarities(self):
+        matrix = similar.Matrix.build(DOCUMENTS)
+        vectors = dense(matrix)
+        columns, weights = matrix.vector(Counter({"python": 1, "developer": 1}))
+        query = np.zeros(len(matrix.vocabulary))
+        query[columns] = weights
+
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1, rtol=1e-6)
+        np.testing.assert_allclose(
+            matrix.scores(columns, weights), vectors @ query, rtol=1e-6
+        )
+
+    def test_words_of_most_postings_ignored(self):
+        matrix = similar.Matrix.build(
+            [(pk, 1, Counter({"engineer": 1, f"word{pk}": 1})) for pk in range(4)]
+        )
+
+        columns, weights = matrix.vector(Counter({"engineer": 1}))
+        self.assertFalse(matrix.scores(columns, weights).any())
+
+    def test_merge(self):
+        matrix = similar.Matrix.build(DOCUMENTS)
+        similar.kill(matrix, 2)
+        delta = {2: (1, Counter({"golang": 1})), 4: (2, Counter({"python": 1}))}
+
+        merged = similar.merge(matrix, delta)
+
+        self.assertEqual(list(merged.ids), [1, 2, 3, 4, 5])
+        self.assertEqual(list(merged.owners), [1, 1, 2, 2, 1])
+        columns, weights = merged.vector(Counter({"python": 1}))
+        scores = merged.scores(columns, weights)
+        self.assertEqual(list(np.flatnonzero(scores)), [0, 3])
+        np.testing.assert_allclose(scores[3], 1, rtol=1e-6)
+        columns, weights = merged.vector(Counter({"golang": 1}))
+        self.assertEqual(list(np.flatnonzero(merged.scores(columns, weights))), [1])
+
+
+@override_settings(SIMILAR_JOBS={"BACKGROUND": False, "MAX_DELTA": 3, "MAX_DF": 1})
+class SimilarApiTests(TestCase):
+    def setUp(self) -> None:
+        # fresh matrix, not the one of the process
+        patcher = mock.patch.object(
+            similar, "similar_jobs", similar.SimilarJobs(similar.job_title_documents)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = get_user_model().objects.create_user(
+            email="similar@gmail.com", password="similar@123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.portal = Portal.objects.create(
+            user=self.user, name="Naukri", description="Jobs"
+        )
+
+    def create_job_title(self, title, text="", user=None):
+        user = user or self.user
+        job_description = JobDescription.objects.create(
+            user=user, role="", description_text=text
+        )
+        return JobTitle.objects.create(
+            user=user, title=title, portal=self.portal, job_description=job_description
+        )
+
+    def test_similar_ranked(self):
+        job_title = self.create_job_title("Python Developer", "django rest apis")
+        close = self.create_job_title("Python Engineer", "django apis")
+        far = self.create_job_title("Java Developer", "spring")
+        self.create_job_title("Chef", "cooking")
+        other_user = get_user_model().objects.create_user(
+            email="other@gmail.com", password="other@123"
+        )
+        self.create_job_title("Python Developer", "django rest apis", user=other_user)
+
+        res = self.client.get(similar_url(job_title.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in res.data], [close.id, far.id])
+        self.assertEqual(res.data[0]["title"], "Python Engineer")
+        self.assertGreater(res.data[0]["score"], res.data[1]["score"])
+
+    def test_follows_writes(self):
+        job_title = self.create_job_title("Python Developer")
+        other = self.create_job_title("Java Developer")
+        self.client.get(similar_url(job_title.id))
+
+        new = self.create_job_title("Python Developer", "python")
+        other.title = "Chef"
+        other.save()
+        res = self.client.get(similar_url(job_title.id))
+        self.assertEqual([item["id"] for item in res.data], [new.id])
+
+        new.delete()
+        res = self.client.get(similar_url(job_title.id))
+        self.assertEqual(res.data, [])
+
+        # past MAX_DELTA the delta is merged into the matrix
+        created = [self.create_job_title(f"Python {n}") for n in range(2)]
+        self.assertEqual(similar.similar_jobs.delta, {})
+        res = self.client.get(similar_url(job_title.id), {"limit": 2})
+        self.assertEqual(len(res.data), 2)
+        self.assertTrue({item["id"] for item in res.data} <= {j.id for j in created})
+
+    @override_settings(SIMILAR_JOBS={"BACKGROUND": True})
+    def test_not_ready_while_first_build_runs(self):
+        job_title = self.create_job_title("Python Developer")
+        started, release = threading.Event(), threading.Event()
+
+        def load_documents():
+            started.set()
+            release.wait(5)
+            return iter([])
+
+        with mock.patch.object(similar.similar_jobs, "load_documents", load_documents):
+            res = self.client.get(similar_url(job_title.id))
+            self.assertTrue(started.wait(5))
+            self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            # one build at a time
+            self.assertEqual(
+                self.client.get(similar_url(job_title.id)).status_code,
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+            release.set()
+            while similar.similar_jobs._rebuilding:
+                time.sleep(0.01)
+
+        res = self.client.get(similar_url(job_title.id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_inline_rebuild_keeps_the_connection(self):
+        similar_jobs = similar.SimilarJobs(lambda: iter(DOCUMENTS))
+
+        # e.g. a request thread of a threaded WSGI server
+        with mock.patch.object(similar, "connection") as patched_connection:
+            thread = threading.Thread(target=similar_jobs.rebuild)
+            thread.start()
+            thread.join()
+
+        patched_connection.close.assert_not_called()
+        self.assertEqual(len(similar_jobs.matrix), len(DOCUMENTS))
+
+    def test_other_users_posting_not_found(self):
+        other_user = get_user_model().objects.create_user(
+            email="other@gmail.com", password="other@123"
+        )
+        job_title = self.create_job_title("Python Developer", user=other_user)
+
+        res = self.client.get(similar_url(job_title.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
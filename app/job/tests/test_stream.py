@@ -0,0 +1,240 @@
+"""
+Tests for the Server-Sent Events stream of job titles (ASGI)
+- HTTP GET - /api/jobtitle/stream/
+"""
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import JobDescription, JobTitle, Portal
+from job import stream
+
+
+async def not_found(scope, receive, send):
+    await send({"type": "http.response.start", "status": 404, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def events(body):
+    """
+    ``[(event, data), ...]`` of SSE frames, comments left out
+    """
+    parsed = []
+    for block in body.decode().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.splitlines() if ": " in line
+        )
+        if "event" in fields:
+            parsed.append((fields["event"], json.loads(fields["data"])))
+    return parsed
+
+
+class Client:
+    """
+    Drives `stream.JobTitleStream` like an ASGI server would
+    """
+
+    def __init__(self, query="", token=None):
+        headers = [(b"authorization", f"Token {token}".encode())] if token else []
+        self.scope = {
+            "type": "http",
+            "method": "GET",
+            "path": stream.PATH,
+            "query_string": query.encode(),
+            "headers": headers,
+        }
+        self.messages = []
+        self.disconnected = asyncio.Event()
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        self.messages.append(message)
+
+    def start(self):
+        self.task = asyncio.create_task(
+            stream.JobTitleStream(not_found)(self.scope, self.receive, self.send)
+        )
+
+    @property
+    def status(self):
+        return self.messages[0]["status"]
+
+    @property
+    def body(self):
+        return b"".join(message.get("body", b"") for message in self.messages[1:])
+
+    async def wait_for(self, condition):
+        for _ in range(200):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError("timed out")
+
+    async def close(self):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, 1)
+
+
+class HubTests(TestCase):
+    def test_filter_and_drop_oldest(self):
+        async def scenario():
+            hub = stream.Hub()
+            everything = hub.subscribe(user_id=1)
+            portal = hub.subscribe(user_id=1, portal_id=2)
+            hub.subscribe(user_id=3)
+
+            for number in range(5):
+                hub.publish(1, 2 if number % 2 else 4, str(number).encode())
+            await asyncio.sleep(0)
+
+            return await everything.get(0), await portal.get(0)
+
+        with override_settings(JOB_TITLE_STREAM={"MAX_QUEUED": 3}):
+            everything, portal = asyncio.run(scenario())
+
+        self.assertEqual(everything[1:], [b"2", b"3", b"4"])
+        self.assertEqual(events(everything[0]), [("dropped", {"count": 2})])
+        self.assertEqual(portal, [b"1", b"3"])
+
+
+@override_settings(JOB_TITLE_STREAM={"HEARTBEAT": 0.05})
+class StreamTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="stream@gmail.com", password="stream@123"
+        )
+        self.token = Token.objects.create(user=self.user).key
+        self.portals = [
+            Portal.objects.create(user=self.user, name=name, description="Jobs")
+            for name in ("Naukri", "LinkedIn")
+        ]
+
+    def create_job_title(self, title, portal):
+        with self.captureOnCommitCallbacks(execute=True):
+            return JobTitle.objects.create(
+                user=self.user,
+                title=title,
+                portal=self.portals[portal],
+                job_description=JobDescription.objects.create(
+                    user=self.user, role="Developer", description_text="Remote"
+                ),
+            )
+
+    def update_job_title(self, job_title, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            job_title.title = title
+            job_title.save()
+
+    async def test_stream_job_titles_of_portal(self):
+        client = Client(f"portal={self.portals[1].id}", token=self.token)
+        client.start()
+        await client.wait_for(lambda: stream.hub.subscribers)
+
+        await sync_to_async(self.create_job_title)("Python Developer", 0)
+        job_title = await sync_to_async(self.create_job_title)("Java Developer", 1)
+        await sync_to_async(self.update_job_title)(job_title, "Kotlin Developer")
+        await client.wait_for(lambda: len(events(client.body)) == 2)
+        await client.close()
+
+        self.assertEqual(client.status, 200)
+        self.assertEqual(
+            client.messages[0]["headers"][0],
+            (b"content-type", b"text/event-stream; charset=utf-8"),
+        )
+        received = events(client.body)
+        self.assertEqual(
+            [(event, data["id"], data["title"]) for event, data in received],
+            [
+                ("created", job_title.id, "Java Developer"),
+                ("updated", job_title.id, "Kotlin Developer"),
+            ],
+        )
+        self.assertEqual(received[0][1]["portal"], self.portals[1].id)
+        self.assertEqual(stream.hub.subscribers, set())
+
+    async def test_stream_job_description_updates(self):
+        job_title = await sync_to_async(self.create_job_title)("Python Developer", 0)
+        client = Client(token=self.token)
+        client.start()
+        await client.wait_for(lambda: stream.hub.subscribers)
+
+        def update_description():
+            with self.captureOnCommitCallbacks(execute=True):
+                job_description = JobDescription.objects.get(jobtitle=job_title)
+                job_description.description_text = "On site"
+                job_description.save()
+
+        await sync_to_async(update_description)()
+        await client.wait_for(lambda: events(client.body))
+        await client.close()
+
+        [(event, data)] = events(client.body)
+        self.assertEqual((event, data["id"]), ("updated", job_title.id))
+        self.assertGreater(data["last_updated"], job_title.last_updated.isoformat())
+
+    async def test_stream_bulk_created_job_titles(self):
+        client = Client(token=self.token)
+        client.start()
+        await client.wait_for(lambda: stream.hub.subscribers)
+
+        def bulk_create():
+            api = APIClient()
+            api.force_authenticate(self.user)
+            with self.captureOnCommitCallbacks(execute=True):
+                return api.post(
+                    reverse("jobtitle:jobtitle-bulk"),
+                    [
+                        {
+                            "title": title,
+                            "portal": self.portals[0].id,
+                            "job_description": {
+                                "role": "Developer",
+                                "description_text": "Remote",
+                            },
+                        }
+                        for title in ("Python Developer", "Java Developer")
+                    ],
+                    format="json",
+                )
+
+        res = await sync_to_async(bulk_create)()
+        await client.wait_for(lambda: len(events(client.body)) == 2)
+        await client.close()
+
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(
+            [(event, data["title"]) for event, data in events(client.body)],
+            [("created", "Python Developer"), ("created", "Java Developer")],
+        )
+
+    async def test_heartbeat(self):
+        client = Client(token=self.token)
+        client.start()
+        await client.wait_for(lambda: b": ping" in client.body)
+        await client.close()
+
+    async def test_authentication_required(self):
+        client = Client()
+        client.start()
+        await asyncio.wait_for(client.task, 1)
+
+        self.assertEqual(client.status, 401)
+        self.assertEqual(stream.hub.subscribers, set())
+
+    async def test_other_paths_go_to_django(self):
+        client = Client(token=self.token)
+        client.scope["path"] = "/api/jobtitle/jobtitles/"
+        client.start()
+        await asyncio.wait_for(client.task, 1)
+
+        self.assertEqual(client.status, 404)
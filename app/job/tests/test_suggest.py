@@ -0,0 +1,308 @@
+"""
+Tests for autocomplete of job titles & portal names
+- HTTP GET - /api/jobtitle/suggest/?prefix=...
+"""
+
+import fcntl
+import os
+from contextlib import contextmanager
+import tempfile
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import JobDescription, JobTitle, Portal
+from job import suggest
+
+SUGGEST_URL = reverse("jobtitle:suggest")
+
+SUGGEST_INDEX = {"PATH": None, "BACKGROUND": False, "CHECK_INTERVAL": 0}
+
+
+class PrefixIndexTests(TestCase):
+    def build(self, entries, top_k=5, scan_limit=2):
+        data = suggest.build(
+            {suggest.normalize(label): (label, count) for label, count in entries},
+            top_k,
+            scan_limit,
+            0.0,
+        )
+        return suggest.PrefixIndex(data)
+
+    def test_top_by_count(self):
+        index = self.build(
+            [("Python Developer", 3), ("Python Tester", 7), ("PHP Developer", 5)]
+        )
+
+        self.assertEqual(
+            index.top("python", 5),
+            [
+                (7, "python tester", "Python Tester"),
+                (3, "python developer", "Python Developer"),
+            ],
+        )
+        self.assertEqual(index.top("ruby", 5), [])
+
+    def test_precomputed_prefixes_match_a_scan(self):
+        entries = [(f"Role {number}", number % 13) for number in range(200)]
+        entries += [(f"Rust {number}", number) for number in range(20)]
+        index = self.build(entries, top_k=10, scan_limit=8)
+
+        self.assertGreater(index.heavy_size, 0)
+        for prefix in ("r", "ro", "role 1", "ru", "rust 1"):
+            expected = sorted(
+                (-count, label.lower())
+                for label, count in entries
+                if label.lower().startswith(prefix)
+            )[:10]
+            self.assertEqual(
+                [(-count, key) for count, key, _ in index.top(prefix, 10)],
+                expected,
+            )
+
+    def test_snapshot_is_mapped_from_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config = {**SUGGEST_INDEX, "PATH": directory}
+            with override_settings(SUGGEST_INDEX=config):
+                writer = suggest.Suggester("titles", lambda: [(1, "Data Engineer", 4)])
+                writer.rebuild()
+                # e.g. another worker process
+                reader = suggest.Suggester("titles", lambda: [])
+
+                self.assertTrue(os.path.exists(os.path.join(directory, "titles.idx")))
+                self.assertEqual(
+                    reader.complete(1, "data", 5),
+                    [{"text": "Data Engineer", "count": 4}],
+                )
+
+    def test_one_worker_rebuilds_a_snapshot_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config = {**SUGGEST_INDEX, "PATH": directory}
+            with override_settings(SUGGEST_INDEX=config):
+                load_entries = mock.Mock(return_value=[(1, "Data Engineer", 4)])
+                suggester = suggest.Suggester("titles", load_entries)
+                # e.g. another worker process rebuilding it
+                with open(os.path.join(directory, "titles.idx.lock"), "a") as lock:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                    suggester.rebuild()
+
+                load_entries.assert_not_called()
+                self.assertFalse(os.path.exists(os.path.join(directory, "titles.idx")))
+
+                suggester.rebuild()
+                load_entries.assert_called_once()
+
+    @override_settings(SUGGEST_INDEX={**SUGGEST_INDEX, "BACKGROUND": True})
+    def test_first_lookup_does_not_wait_for_the_build(self):
+        suggester = suggest.Suggester("titles", mock.Mock())
+
+        with mock.patch.object(suggest.threading, "Thread") as thread:
+            self.assertEqual(suggester.complete(1, "data", 5), [])
+
+        thread.assert_called_once_with(
+            target=suggester.rebuild_in_background, daemon=True
+        )
+        thread.return_value.start.assert_called_once()
+        suggester.load_entries.assert_not_called()
+
+    def test_inline_rebuild_keeps_the_connection(self):
+        suggester = suggest.Suggester("titles", lambda: [(1, "Data Engineer", 4)])
+
+        # e.g. a request thread of a threaded WSGI server
+        with mock.patch.object(suggest, "connection") as patched_connection:
+            thread = threading.Thread(target=suggester.rebuild)
+            thread.start()
+            thread.join()
+
+        patched_connection.close.assert_not_called()
+        self.assertEqual(len(suggester.base), 1)
+
+
+@override_settings(SUGGEST_INDEX=SUGGEST_INDEX)
+class SuggestApiTests(TestCase):
+    def setUp(self) -> None:
+        # fresh indexes, not the ones of the process
+        titles = suggest.Suggester("titles", suggest.title_entries)
+        portals = suggest.Suggester("portals", suggest.portal_entries, min_count=0)
+        for name, value in (("titles", titles), ("portals", portals)):
+            patcher = mock.patch.object(suggest, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.user = get_user_model().objects.create_user(
+            email="suggest@gmail.com", password="suggest@123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.portal = Portal.objects.create(
+            user=self.user, name="Naukri", description="Jobs"
+        )
+
+    def create_job_title(self, title, portal=None):
+        job_description = JobDescription.objects.create(
+            user=self.user, role="Developer", description_text=""
+        )
+        return JobTitle.objects.create(
+            user=self.user,
+            title=title,
+            portal=portal or self.portal,
+            job_description=job_description,
+        )
+
+    @contextmanager
+    def assertNoSuggestQueries(self):
+        """
+        No previous title nor portal name read for the suggestions
+        """
+        with CaptureQueriesContext(connection) as queries:
+            yield
+        for query in queries:
+            self.assertNotRegex(
+                query["sql"], r'^SELECT .*"core_(jobtitle|portal)"\."(title|name)"'
+            )
+
+    def test_suggest_ranked_by_frequency(self):
+        self.create_job_title("Python Developer")
+        for _ in range(2):
+            self.create_job_title("python tester")
+
+        res = self.client.get(SUGGEST_URL, {"prefix": "PY"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["titles"],
+            [
+                {"text": "python tester", "count": 2},
+                {"text": "Python Developer", "count": 1},
+            ],
+        )
+        self.assertEqual(res.data["portals"], [])
+
+    def test_writes_update_index_without_queries(self):
+        job_title = self.create_job_title("Java Developer")
+        self.client.get(SUGGEST_URL, {"prefix": "j"})
+
+        job_title.title = "Golang Developer"
+        job_title.save()
+        self.create_job_title("Java Architect")
+        Portal.objects.create(user=self.user, name="Naukri Gulf", description="")
+
+        with self.assertNumQueries(0):
+            res = self.client.get(SUGGEST_URL, {"prefix": "ja"})
+        self.assertEqual(res.data["titles"], [{"text": "Java Architect", "count": 1}])
+
+        res = self.client.get(SUGGEST_URL, {"prefix": "nau"})
+        self.assertEqual(
+            res.data["portals"],
+            [
+                {"text": "Naukri", "count": 2},
+                {"text": "Naukri Gulf", "count": 0},
+            ],
+        )
+
+        job_title.delete()
+        res = self.client.get(SUGGEST_URL, {"prefix": "g"})
+        self.assertEqual(res.data["titles"], [])
+
+    def test_renamed_portal_rebuilds_index(self):
+        self.create_job_title("Python Developer")
+        self.client.get(SUGGEST_URL, {"prefix": "n"})
+
+        self.portal.name = "LinkedIn"
+        self.portal.save()
+
+        res = self.client.get(SUGGEST_URL, {"prefix": "n"})
+        self.assertEqual(res.data["portals"], [])
+        res = self.client.get(SUGGEST_URL, {"prefix": "link"})
+        self.assertEqual(res.data["portals"], [{"text": "LinkedIn", "count": 1}])
+
+    def test_counts_of_requester_only(self):
+        self.create_job_title("Python Developer")
+        other = get_user_model().objects.create_user(
+            email="other@gmail.com", password="other@123"
+        )
+        other_portal = Portal.objects.create(
+            user=other, name="Indeed", description="Jobs"
+        )
+        JobTitle.objects.create(
+            user=other,
+            title="Python Tester",
+            portal=self.portal,
+            job_description=JobDescription.objects.create(
+                user=other, role="Tester", description_text=""
+            ),
+        )
+
+        res = self.client.get(SUGGEST_URL, {"prefix": "p"})
+        self.assertEqual(res.data["titles"], [{"text": "Python Developer", "count": 1}])
+        res = self.client.get(SUGGEST_URL, {"prefix": "n"})
+        self.assertEqual(res.data["portals"], [{"text": "Naukri", "count": 1}])
+        # portals of another user aren't suggested
+        res = self.client.get(SUGGEST_URL, {"prefix": "ind"})
+        self.assertEqual(res.data["portals"], [])
+
+        other_portal.delete()
+        self.create_job_title("Python Architect")
+        res = self.client.get(SUGGEST_URL, {"prefix": "py"})
+        self.assertEqual(
+            [item["text"] for item in res.data["titles"]],
+            ["Python Architect", "Python Developer"],
+        )
+
+    def test_no_queries_before_first_lookup(self):
+        job_title = self.create_job_title("Python Developer")
+
+        job_title.title = "Python Tester"
+        with self.assertNoSuggestQueries():
+            job_title.save()
+            job_title.delete()
+        with self.assertNumQueries(0):
+            suggest.record([job_title], change=-1)
+
+    def test_update_of_loaded_job_title(self):
+        self.create_job_title("Java Developer")
+        self.client.get(SUGGEST_URL, {"prefix": "j"})
+
+        job_title = JobTitle.objects.get()
+        job_title.title = "Golang Developer"
+        with self.assertNoSuggestQueries():
+            job_title.save()
+        job_title.title = "Rust Developer"
+        job_title.save()
+
+        res = self.client.get(SUGGEST_URL, {"prefix": "j"})
+        self.assertEqual(res.data["titles"], [])
+        res = self.client.get(SUGGEST_URL, {"prefix": "g"})
+        self.assertEqual(res.data["titles"], [])
+        res = self.client.get(SUGGEST_URL, {"prefix": "r"})
+        self.assertEqual(res.data["titles"], [{"text": "Rust Developer", "count": 1}])
+
+    def test_limit(self):
+        for number in range(5):
+            self.create_job_title(f"Developer {number}")
+
+        res = self.client.get(SUGGEST_URL, {"prefix": "dev", "limit": 2})
+
+        self.assertEqual(len(res.data["titles"]), 2)
+
+    def test_invalid_params(self):
+        for params in (
+            {},
+            {"prefix": " "},
+            {"prefix": "a", "limit": "x"},
+            {"prefix": "a", "limit": 0},
+        ):
+            res = self.client.get(SUGGEST_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_auth_required(self):
+        res = APIClient().get(SUGGEST_URL, {"prefix": "py"})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -21,7 +21,11 @@ app_name = "jobtitle"
 router.register("jobtitles", views.JobTitleViewSet)
 
 # we also can add url suffix here ``urlpatterns = [path("job/", include(router.urls))]``
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    # `/api/jobtitle/suggest/?prefix=py` autocomplete
+    path("suggest/", views.SuggestView.as_view(), name="suggest"),
+    path("", include(router.urls)),
+]
 
 
 # Without Regex (Manually)
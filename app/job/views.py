@@ -1,10 +1,46 @@
+import functools
+
 from django.shortcuts import render
 
 # Create your views here.
-from rest_framework import viewsets
-from job.serializers import JobTitleSerializer, JobDescriptionSerializer
-from core.models import JobTitle
-from rest_framework import authentication, permissions
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from job.serializers import (
+    BulkJobTitleSerializer,
+    JobTitleSerializer,
+    JobDescriptionSerializer,
+    SparseJobTitleSerializer,
+)
+from job.pagination import JobTitleCursorPagination, SearchCursorPagination
+from job import (
+    changes,
+    conditional,
+    duplicates,
+    export,
+    fieldsets,
+    search,
+    similar,
+    suggest,
+)
+from job.fastpath import compile_serializer
+from job.response_cache import cache_response
+from job.renderers import (
+    ColumnarJSONRenderer,
+    CSVRenderer,
+    JSONLinesRenderer,
+    dictionary_columns,
+)
+from core.models import JobDescriptionSignature, JobTitle
+from django.db.models import Exists, OuterRef
+from rest_framework.exceptions import ValidationError
+from rest_framework import permissions
+from user.authentication import CachedTokenAuthentication, SignedTokenAuthentication
 
 
 class JobTitleViewSet(viewsets.ModelViewSet):
@@ -23,10 +59,25 @@ class JobTitleViewSet(viewsets.ModelViewSet):
     # so we need to write methods corresponding to this
 
     # To define any view as a private view we have to over-ride this two directives from parent classes
-    # This is for TokenAuthentication
-    authentication_classes = [authentication.TokenAuthentication]
+    # This is for TokenAuthentication (resolved tokens are cached, see user/authentication.py)
+    # or stateless signed ``Bearer`` tokens (see user/tokens.py)
+    authentication_classes = [CachedTokenAuthentication, SignedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
+    # List endpoint is paginated with opaque cursors instead of returning every row
+    # ``{"next": "...?cursor=cD0xMjM%3D", "previous": null, "results": [...]}``
+    pagination_class = JobTitleCursorPagination
+
+    def get_renderers(self):
+        """
+        The list can also be rendered as columns & rows
+        (``Accept: application/vnd.jobs.columnar+json``, job/renderers.py)
+        """
+        renderers = super().get_renderers()
+        if self.action == "list":
+            renderers.append(ColumnarJSONRenderer())
+        return renderers
+
     def get_serializer_class(self):
         """
         If user hits list(Plural) endpoint which is list so user get the list of JobTitles
@@ -38,10 +89,17 @@ class JobTitleViewSet(viewsets.ModelViewSet):
         Plural - localhost/api/job/job-title/
         Singular - localhost/api/job/job-title/15
         """
+        # ``?fields=`` / ``?expand=`` of list & detail
+        if self.get_fieldset() is not None:
+            return SparseJobTitleSerializer
+
         # self.action == "post", etc for all types of HTTP methods
-        if self.action == "list":
+        if self.action in ("list", "similar"):
             return JobTitleSerializer
 
+        if self.action == "bulk":
+            return BulkJobTitleSerializer
+
         return self.serializer_class
 
     def get_queryset(self):
@@ -53,8 +111,147 @@ class JobTitleViewSet(viewsets.ModelViewSet):
                 order_by("-id")
         And if we need data in ascending order we do
                 order_by("id")
+
+        ``WHERE user_id = ? ORDER BY id DESC`` is served by the
+        `core_jobtitle_user_id_desc` composite index (see JobTitle.Meta)
+        """
+        queryset = self.queryset.filter(user=self.request.user).order_by("-id")
+
+        if self.action in ("list", "export"):
+            # ``?portal=<id>`` uses `core_jobtitle_user_portal_id` index
+            portal_id = self.get_portal_id()
+            if portal_id is not None:
+                queryset = queryset.filter(portal_id=portal_id)
+            if self.collapse_duplicates():
+                queryset = queryset.exclude(Exists(older_duplicates()))
+        elif self.action in ("update", "partial_update"):
+            # an inline job_description updates the loaded description
+            queryset = queryset.select_related("job_description")
+
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            queryset = fieldsets.shape(queryset, fieldset)
+
+        return queryset
+
+    def get_fieldset(self):
+        """
+        ``?fields=id,title,portal.name`` & ``?expand=job_description,portal``
+        of list & detail GETs (see job/fieldsets.py), None without them
+        """
+        if self.action not in ("list", "retrieve"):
+            return None
+        if not hasattr(self, "_fieldset"):
+            if self.action == "list":
+                self._fieldset = fieldsets.parse(
+                    self.request.query_params, JobTitleSerializer.Meta.fields
+                )
+            else:
+                self._fieldset = fieldsets.parse(
+                    self.request.query_params, JobDescriptionSerializer.Meta.fields
+                )
+        return self._fieldset
+
+    def get_serializer(self, *args, **kwargs):
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            kwargs["fieldset"] = fieldset
+        return super().get_serializer(*args, **kwargs)
+
+    def get_portal_id(self):
+        portal_id = self.request.query_params.get("portal")
+        if portal_id is None:
+            return None
+        try:
+            return int(portal_id)
+        except ValueError:
+            raise ValidationError({"portal": ["A valid integer is required."]})
+
+    def collapse_duplicates(self):
+        """
+        ``?collapse=duplicates`` lists only the oldest posting of every
+        near-duplicate cluster (see job/duplicates.py)
+        """
+        collapse = self.request.query_params.get("collapse")
+        if collapse not in (None, "duplicates"):
+            raise ValidationError({"collapse": ['Only "duplicates" is supported.']})
+        return collapse is not None
+
+    @method_decorator(
+        condition(
+            etag_func=conditional.list_etag,
+            last_modified_func=conditional.list_last_modified,
+        )
+    )
+    @cache_response("list")
+    def list(self, request, *args, **kwargs):
+        """
+        ``?q=python developer`` returns postings ranked by relevance
+        (see job/search.py), without it the newest postings first
+
+        Unchanged pages are answered ``304 Not Modified`` (job/conditional.py),
+        rendered pages are cached until the user's postings change
+        (job/response_cache.py)
+
+        Plain pages are serialized from ``values_list()`` rows by the
+        compiled serializer (job/fastpath.py), no model instances
         """
-        return self.queryset
+        query = request.query_params.get("q", "").strip()
+        if not query and self.get_fieldset() is not None:
+            return super().list(request, *args, **kwargs)
+        if not query:
+            compiled = compile_serializer(self.get_serializer_class())
+            page = self.paginate_queryset(
+                compiled.values_list(self.filter_queryset(self.get_queryset()))
+            )
+            return self.get_paginated_response(compiled.serialize(page))
+
+        portal_id = self.get_portal_id()
+        exclude = ()
+        if self.collapse_duplicates():
+            # dropped while ranking, pages stay full & the cursor follows them
+            exclude = JobTitle.objects.filter(
+                Exists(older_duplicates()), user=request.user
+            ).values_list("id", flat=True)
+        paginator = SearchCursorPagination()
+        ranked = paginator.paginate_ranked(
+            lambda after, limit: search.search(
+                request.user,
+                query,
+                portal_id=portal_id,
+                after=after,
+                limit=limit,
+                exclude=exclude,
+            ),
+            request,
+        )
+
+        queryset = JobTitle.objects.all()
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            queryset = fieldsets.shape(queryset, fieldset)
+        job_titles = queryset.in_bulk([pk for _, pk in ranked])
+        serializer = self.get_serializer(
+            # an id may just have been deleted
+            [job_titles[pk] for _, pk in ranked if pk in job_titles],
+            many=True,
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+    @method_decorator(
+        condition(
+            etag_func=conditional.detail_etag,
+            last_modified_func=conditional.detail_last_modified,
+        )
+    )
+    @cache_response("detail")
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Same as parent class method, answered ``304 Not Modified`` without
+        reading the row when it didn't change (job/conditional.py) and
+        served from the cache of rendered responses (job/response_cache.py)
+        """
+        return super().retrieve(request, *args, **kwargs)
 
     def perform_create(self, serializer_obj):
         """
@@ -62,3 +259,197 @@ class JobTitleViewSet(viewsets.ModelViewSet):
         """
 
         serializer_obj.save(user=self.request.user)
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Create many job titles with nested descriptions in one transaction
+        POST /api/jobtitle/jobtitles/bulk/
+        TODO - Refer
+        https://www.django-rest-framework.org/api-guide/viewsets/#marking-extra-actions-for-routing
+        """
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.BULK_JOB_TITLES["MAX_ITEMS"],
+        )
+        serializer.is_valid(raise_exception=True)
+        job_titles = serializer.save(user=request.user)
+
+        return Response({"created": len(job_titles)}, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=["get"])
+    def similar(self, request, pk=None):
+        """
+        Most similar postings of the user (TF-IDF cosine, see job/similar.py)
+        GET /api/jobtitle/jobtitles/<id>/similar/?limit=10
+        ``[{"id": 7, "title": "Python Developer", "score": 0.8123}, ...]``
+        """
+        job_title = self.get_object()
+        limit = get_limit(request, 10, 50)
+
+        ranked = similar.similar_jobs.similar(job_title, k=limit)
+        job_titles = JobTitle.objects.in_bulk([pk for _, pk in ranked])
+        return Response(
+            [
+                {**self.get_serializer(job_titles[pk]).data, "score": round(score, 4)}
+                for score, pk in ranked
+                # an id may just have been deleted
+                if pk in job_titles
+            ]
+        )
+
+    @action(detail=False, methods=["get"])
+    def duplicates(self, request):
+        """
+        Postings of the user with near-duplicate descriptions, grouped
+        GET /api/jobtitle/jobtitles/duplicates/?limit=50
+        ``[{"cluster": 3, "job_titles": [{"id": 7, "title": "..", "portal": 1}, ..]}]``
+        ``cluster`` is the id of one of the job descriptions of the cluster
+        """
+        clusters = duplicates.clusters(request.user, limit=get_limit(request, 50, 500))
+        job_titles = {
+            row["job_description"]: row
+            for row in self.get_queryset()
+            .filter(job_description__in=[pk for _, group in clusters for pk in group])
+            .values("id", "title", "portal", "job_description")
+        }
+        results = []
+        for label, group in clusters:
+            members = [
+                {key: job_titles[pk][key] for key in ("id", "title", "portal")}
+                for pk in group
+                # a description may have lost its job title
+                if pk in job_titles
+            ]
+            if len(members) > 1:
+                results.append({"cluster": label, "job_titles": members})
+        return Response(results)
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        """
+        What changed after a change token (see job/changes.py)
+        GET /api/jobtitle/jobtitles/changes/?since=41&limit=500
+        ``{"next": 52, "has_more": false, "created": [{..}], "updated": [{..}],
+        "deleted": [12]}``, created & updated postings like the detail view.
+        Without ``?since=`` only the token to start from.
+        """
+        config = changes.get_config()
+        since = request.query_params.get("since")
+        if since is None:
+            return Response(
+                {
+                    "next": changes.latest_token(request.user),
+                    "has_more": False,
+                    "created": [],
+                    "updated": [],
+                    "deleted": [],
+                }
+            )
+        try:
+            since = int(since)
+        except ValueError:
+            raise ValidationError({"since": ["A valid integer is required."]})
+
+        result = changes.changes(
+            request.user,
+            since,
+            limit=get_limit(request, config["LIMIT"], config["MAX_LIMIT"]),
+        )
+        job_titles = self.get_queryset().in_bulk(result["created"] + result["updated"])
+        for key in ("created", "updated"):
+            result[key] = [
+                self.get_serializer(job_titles[pk]).data
+                for pk in result[key]
+                # deleted since, it's in a later page of changes
+                if pk in job_titles
+            ]
+        return Response(result)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[JSONLinesRenderer, CSVRenderer, ColumnarJSONRenderer],
+    )
+    def export(self, request):
+        """
+        Every posting of the user with its description & portal, streamed
+        GET /api/jobtitle/jobtitles/export/?format=jsonl|csv|columnar
+        (or ``Accept: application/x-ndjson`` / ``text/csv`` /
+        ``application/vnd.jobs.columnar+json``), same ``?portal=``
+        and ``?collapse=`` filters as the list
+        """
+        renderer = request.accepted_renderer
+        batches = export.rows(
+            self.get_queryset(), batch_size=settings.EXPORT_JOB_TITLES["BATCH_SIZE"]
+        )
+        encode = export.ENCODERS[renderer.format]
+        if renderer.format == "columnar":
+            encode = functools.partial(encode, dictionary=dictionary_columns(request))
+        response = StreamingHttpResponse(
+            encode(batches),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="jobtitles.{renderer.format}"'
+        return response
+
+
+def older_duplicates():
+    """
+    Near-duplicates of the outer job title's description which are older
+    and still posted
+    """
+    return JobDescriptionSignature.objects.filter(
+        user=OuterRef("user"),
+        cluster=OuterRef("job_description__duplicate_signature__cluster"),
+        job_description_id__lt=OuterRef("job_description_id"),
+        job_description__jobtitle__isnull=False,
+    )
+
+
+def get_limit(request, default, maximum):
+    """
+    ``?limit=`` between 1 and `maximum`
+    """
+    try:
+        limit = int(request.query_params.get("limit", default))
+    except ValueError:
+        raise ValidationError({"limit": ["A valid integer is required."]})
+    if not 1 <= limit <= maximum:
+        raise ValidationError(
+            {"limit": [f"Ensure this value is between 1 and {maximum}."]}
+        )
+    return limit
+
+
+class SuggestView(APIView):
+    """
+    Autocomplete of job titles & portal names, most used first
+    GET /api/jobtitle/suggest/?prefix=pyth&limit=10
+    ``{"titles": [{"text": "Python Developer", "count": 120}], "portals": [...]}``
+
+    Served from an in-memory index (see job/suggest.py) without any query,
+    counts are the ones of the requester's postings.
+    """
+
+    authentication_classes = [CachedTokenAuthentication, SignedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    default_limit = 10
+
+    def get(self, request):
+        prefix = request.query_params.get("prefix", "").strip()
+        if not prefix:
+            raise ValidationError({"prefix": ["This field is required."]})
+
+        limit = get_limit(request, self.default_limit, suggest.get_config()["TOP_K"])
+        return Response(
+            {
+                "titles": suggest.titles.complete(request.user.pk, prefix, limit),
+                "portals": suggest.portals.complete(request.user.pk, prefix, limit),
+            }
+        )
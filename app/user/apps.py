@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class UserConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "user"
+
+    def ready(self):
+        """
+        Connect signal receivers & register system checks once app registry
+        is ready
+        """
+        from user import checks, signals  # noqa
@@ -0,0 +1,127 @@
+"""
+Async versions of CreateUserView & CreateTokenView
+
+Served only by the ASGI application (see app/asgi.py & app/urls_asgi.py).
+Password hashing is awaited on the hashing pool (core/hashing.py) and ORM calls
+use the async queryset API, so a burst of signups/logins never blocks the
+event loop or the thread that runs other (sync) views.
+
+DRF views are sync only, that's why these are plain Django async views
+returning the same payloads & status codes as their DRF counterparts.
+TODO - Refer
+https://docs.djangoproject.com/en/4.1/topics/async/#async-views
+"""
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from core import hashing
+from user import tokens
+from user.serializers import AsyncAuthTokenSerializer, UserSerializer
+
+
+def request_data(request):
+    """
+    Payload of a JSON or form encoded request
+    """
+    if request.content_type == "application/json":
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError:
+            return {}
+    return request.POST
+
+
+def saturated(exc):
+    """
+    Same 503 DRF renders for `HashingPoolSaturated` on the sync views
+    """
+    return JsonResponse({"detail": str(exc.detail)}, status=exc.status_code)
+
+
+async def authenticate(email, password):
+    """
+    Async `ModelBackend.authenticate`, returns active user or None
+    """
+    User = get_user_model()
+    user = await User._default_manager.filter(**{User.USERNAME_FIELD: email}).afirst()
+
+    if user is None:
+        # Hash anyway so response time doesn't tell if the email exists
+        await hashing.amake_password(password)
+        return None
+
+    if not await hashing.acheck_password(password, user.password):
+        return None
+
+    return user if user.is_active else None
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncCreateUserView(View):
+    """
+    Async `/api/user/create/`
+    """
+
+    async def post(self, request, *args, **kwargs):
+        serializer = UserSerializer(data=request_data(request))
+
+        # unique email validation runs a query, keep it off the event loop
+        if not await sync_to_async(serializer.is_valid)():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        User = get_user_model()
+        data = dict(serializer.validated_data)
+        data["email"] = User.objects.normalize_email(data["email"])
+        try:
+            data["password"] = await hashing.amake_password(data["password"])
+        except hashing.HashingPoolSaturated as exc:
+            return saturated(exc)
+
+        # Same as UserManager.create_user with the password already hashed
+        user = await User.objects.acreate(**data)
+
+        return JsonResponse(UserSerializer(user).data, status=status.HTTP_201_CREATED)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncCreateTokenView(View):
+    """
+    Async `/api/user/token/`
+    """
+
+    async def post(self, request, *args, **kwargs):
+        serializer = AsyncAuthTokenSerializer(data=request_data(request))
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            user = await authenticate(
+                serializer.validated_data["email"],
+                serializer.validated_data["password"],
+            )
+        except hashing.HashingPoolSaturated as exc:
+            return saturated(exc)
+        if user is None:
+            return JsonResponse(
+                {
+                    "non_field_errors": [
+                        "Unable to authenticate user with given credentials"
+                    ]
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if tokens.is_enabled():
+            return JsonResponse(tokens.issue_tokens(user))
+
+        token, created = await Token.objects.aget_or_create(user=user)
+        return JsonResponse({"token": token.key})
@@ -0,0 +1,174 @@
+"""
+Authentication classes for user-API & job-API
+
+TODO - Refer
+https://www.django-rest-framework.org/api-guide/authentication/#custom-authentication
+"""
+
+import copy
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    BaseAuthentication,
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.authtoken.models import Token
+
+from core.lru import LRUCache
+from user import tokens
+
+
+class TokenCache:
+    """
+    token-key --> (user, token) cache with two tiers
+
+    1) per-process LRU (no network hop at all)
+    2) optional shared Django cache (`TOKEN_AUTH_CACHE["CACHE_ALIAS"]`) so a
+       token resolved by one worker process is reused by the others. It only
+       holds the user id of the token, the user is built from the cached user
+       state (`tokens.get_user_state`, no password hash) and must be active.
+
+    Entries expire after `TOKEN_AUTH_CACHE["TTL"]` seconds and are deleted
+    explicitly by signals (see user/signals.py) when the token is deleted or
+    the user is saved.
+    """
+
+    def __init__(self):
+        self._local = None
+
+    @property
+    def config(self):
+        return {
+            "MAX_ENTRIES": 10_000,
+            "TTL": 60,
+            "CACHE_ALIAS": None,
+            **getattr(settings, "TOKEN_AUTH_CACHE", {}),
+        }
+
+    @property
+    def local(self):
+        if self._local is None:
+            config = self.config
+            self._local = LRUCache(max_entries=config["MAX_ENTRIES"], ttl=config["TTL"])
+        return self._local
+
+    @property
+    def shared(self):
+        alias = self.config["CACHE_ALIAS"]
+        return caches[alias] if alias else None
+
+    @staticmethod
+    def shared_key(key):
+        # Never put the raw token (a credential) into cache key names
+        return "auth-token:" + hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key):
+        cached = self.local.get(key)
+        if cached is None and self.shared is not None:
+            cached = self.get_shared(key)
+            if cached is not None:
+                self.local.set(key, cached)
+        if cached is None:
+            return None
+
+        # Hand out copies so a view mutating `request.user` never touches
+        # the cached object
+        user, token = cached
+        return copy.copy(user), token
+
+    def get_shared(self, key):
+        """
+        ``(user, token)`` of the shared tier, None when missing or inactive
+        """
+        entry = self.shared.get(self.shared_key(key))
+        if entry is None:
+            return None
+        user_id, created = entry
+        state = tokens.get_user_state(user_id)
+        if state is None or not state["is_active"]:
+            return None
+        return (
+            tokens.user_from_state(state),
+            Token(key=key, user_id=user_id, created=created),
+        )
+
+    def set(self, key, user, token):
+        self.local.set(key, (user, token))
+        if self.shared is not None:
+            self.shared.set(
+                self.shared_key(key), (user.pk, token.created), self.config["TTL"]
+            )
+            tokens.remember_user_state(user)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.local.delete(key)
+        if self.shared is not None and keys:
+            self.shared.delete_many([self.shared_key(key) for key in keys])
+
+    def clear(self):
+        """
+        Drops the local tier and re-reads settings on next use
+        """
+        self._local = None
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for DRF `TokenAuthentication`
+
+    The `Token` + `User` query runs only on a cache miss, so authenticating a
+    request with a recently used token costs zero database queries.
+    Clients keep sending ``Authorization: Token <key>``.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Raises AuthenticationFailed for unknown tokens & inactive users,
+        # those are never cached
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, user, token)
+        return user, token
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    Authenticates stateless signed access tokens (see user/tokens.py)
+        Authorization: Bearer <access token>
+
+    Signature & expiry are verified locally and revocation is a cache lookup,
+    so no database query is needed. Works side by side with token
+    authentication because both look for their own keyword.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(
+                "Invalid token header. Token string should not contain spaces."
+            )
+
+        try:
+            token = auth[1].decode()
+            return tokens.verify(token), token
+        except (UnicodeError, tokens.InvalidToken) as error:
+            raise exceptions.AuthenticationFailed(str(error))
+
+    def authenticate_header(self, request):
+        return self.keyword
@@ -0,0 +1,19 @@
+"""
+System checks of user application, registered in `UserConfig.ready()`
+"""
+
+from django.core import checks
+
+from core.checks import check_shared_cache
+from user import tokens
+
+
+@checks.register(checks.Tags.caches)
+def check_signed_tokens_cache(app_configs, **kwargs):
+    """
+    Tokens revoked in one process must be rejected by every other one
+    """
+    config = tokens.get_config()
+    if not config["ENABLED"]:
+        return []
+    return check_shared_cache("SIGNED_AUTH_TOKENS", config["CACHE_ALIAS"], "user.E001")
@@ -2,6 +2,7 @@ from rest_framework import serializers
 
 # from app.core.models import User
 from django.contrib.auth import get_user_model, authenticate
+from user import tokens
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -50,6 +51,8 @@ class UserSerializer(serializers.ModelSerializer):
         ):  # If password then update from here otherwise update everything from parent class
             user.set_password(password)
             user.save()
+            # Changing password logs out every signed token issued so far
+            tokens.revoke_tokens(user)
 
         return user
 
@@ -92,3 +95,37 @@ class AuthTokenSerializer(serializers.Serializer):
 
         data["user"] = user
         return data
+
+
+class AsyncAuthTokenSerializer(AuthTokenSerializer):
+    """
+    AuthTokenSerializer for async views
+
+    Only validates the payload, credentials are verified by the async view
+    itself so the event loop never blocks on password hashing
+    """
+
+    def validate(self, data):
+        if data.get("email").isupper():
+            raise serializers.ValidationError("Email is not as per standards")
+
+        return data
+
+
+class RefreshTokenSerializer(serializers.Serializer):
+    """
+    Serializer to exchange a signed refresh token for a new access token
+    """
+
+    refresh = serializers.CharField(trim_whitespace=False)
+
+    def validate(self, data):
+        """
+        Validate refresh token is correctly signed, not expired and not revoked
+        """
+        try:
+            data["user"] = tokens.verify(data.get("refresh"), tokens.REFRESH_SALT)
+        except tokens.InvalidToken as error:
+            raise serializers.ValidationError(str(error), code="authorization")
+
+        return data
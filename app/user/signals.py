@@ -0,0 +1,39 @@
+"""
+Signal receivers of user application
+
+Connected in `UserConfig.ready()`
+TODO - Refer
+https://docs.djangoproject.com/en/4.1/topics/signals/
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from user import tokens
+from user.authentication import token_cache
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    """
+    Deleted token must stop authenticating immediately
+    """
+    token_cache.delete(instance.key)
+
+
+@receiver(post_save)
+def forget_tokens_of_changed_user(sender, instance, created, **kwargs):
+    """
+    User was edited or deactivated, cached copy of that user is stale now
+
+    Not filtered by sender, saving a subclass (`Applicant`) sends its own class
+    """
+    if created or not isinstance(instance, get_user_model()):
+        return
+
+    tokens.forget_user_state(instance.pk)
+
+    keys = Token.objects.filter(user_id=instance.pk).values_list("key", flat=True)
+    token_cache.delete(*keys)
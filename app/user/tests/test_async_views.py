@@ -0,0 +1,109 @@
+"""
+Tests for async signup & login views served by the ASGI application
+
+- HTTP POST - /api/user/create/
+- HTTP POST - /api/user/token/
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+CREATE_USER_URL = "/api/user/create/"
+TOKEN_URL = "/api/user/token/"
+
+
+@override_settings(ROOT_URLCONF="app.urls_asgi")
+class TestAsyncUserAPI(TestCase):
+    async def test_create_user_success(self):
+        payload = {
+            "email": "async@gmail.com",
+            "password": "async@123",
+            "name": "Async",
+        }
+
+        res = await self.async_client.post(
+            CREATE_USER_URL, payload, content_type="application/json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("password", res.json())
+        user = await get_user_model().objects.aget(email=payload["email"])
+        self.assertTrue(user.check_password(payload["password"]))
+
+    async def test_create_user_with_short_password(self):
+        payload = {"email": "async@gmail.com", "password": "as", "name": "Async"}
+
+        res = await self.async_client.post(
+            CREATE_USER_URL, payload, content_type="application/json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_create_token_for_user(self):
+        payload = {"email": "async@gmail.com", "password": "async@123"}
+        user = await get_user_model().objects.acreate(email=payload["email"])
+        user.set_password(payload["password"])
+        await get_user_model().objects.filter(pk=user.pk).aupdate(
+            password=user.password
+        )
+
+        res = await self.async_client.post(
+            TOKEN_URL, payload, content_type="application/json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        token = await Token.objects.aget(user=user)
+        self.assertEqual(res.json()["token"], token.key)
+
+    async def test_create_token_bad_credentials(self):
+        payload = {"email": "async@gmail.com", "password": "async@123"}
+        await get_user_model().objects.acreate(email=payload["email"])
+
+        res = await self.async_client.post(
+            TOKEN_URL,
+            {**payload, "password": "wrong@123"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn("token", res.json())
+
+    async def test_create_token_email_not_found(self):
+        payload = {"email": "hughes@gmail.com", "password": "qwert@123"}
+
+        res = await self.async_client.post(
+            TOKEN_URL, payload, content_type="application/json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(PASSWORD_HASHING_POOL={"MAX_QUEUE": 0})
+    async def test_create_user_saturated_pool(self):
+        payload = {"email": "busy@gmail.com", "password": "busy@123", "name": "Busy"}
+
+        res = await self.async_client.post(
+            CREATE_USER_URL, payload, content_type="application/json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn("detail", res.json())
+        self.assertFalse(
+            await get_user_model().objects.filter(email=payload["email"]).aexists()
+        )
+
+    async def test_create_token_saturated_pool(self):
+        payload = {"email": "busy@gmail.com", "password": "busy@123"}
+        await get_user_model().objects.acreate(
+            email=payload["email"], password=make_password(payload["password"])
+        )
+
+        with override_settings(PASSWORD_HASHING_POOL={"MAX_QUEUE": 0}):
+            res = await self.async_client.post(
+                TOKEN_URL, payload, content_type="application/json"
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertNotIn("token", res.json())
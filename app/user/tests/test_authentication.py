@@ -0,0 +1,165 @@
+"""
+Tests for CachedTokenAuthentication
+
+- repeated requests with the same token don't query the database
+- deleting the token / deactivating or editing the user invalidates the cache
+- cached entries expire after TTL
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.shortcuts import reverse
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Applicant, JobDescription, JobTitle, Portal
+from user import tokens
+from user.authentication import token_cache
+
+ME_URL = reverse("me")
+
+
+class TestCachedTokenAuthentication(TestCase):
+    """
+    Test token -> user cache on `/api/user/me/`
+    """
+
+    def setUp(self) -> None:
+        token_cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="cached@gmail.com", password="cached@123", name="Cached"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def tearDown(self) -> None:
+        token_cache.clear()
+
+    def test_cached_token_needs_no_queries(self):
+        """
+        Test only the first request resolves the token from the database
+        """
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+
+    def test_invalid_token_is_rejected(self):
+        """
+        Test unknown token still returns 401
+        """
+        self.client.credentials(HTTP_AUTHORIZATION="Token not-a-real-token")
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_is_invalidated(self):
+        """
+        Test deleting a token stops it from authenticating straight away
+        """
+        self.client.get(ME_URL)
+
+        self.token.delete()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_invalidated(self):
+        """
+        Test deactivated user can't keep using a cached token
+        """
+        self.client.get(ME_URL)
+
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_edited_user_is_invalidated(self):
+        """
+        Test changes to the user are visible on the next request
+        """
+        self.client.get(ME_URL)
+
+        self.user.name = "Renamed"
+        self.user.save()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data["name"], "Renamed")
+
+    def test_cached_entry_expires_after_ttl(self):
+        """
+        Test token is resolved again from the database once TTL passed
+        """
+        with patch("core.lru.time.monotonic", return_value=1000.0):
+            self.client.get(ME_URL)
+
+        ttl = token_cache.config["TTL"]
+        with patch("core.lru.time.monotonic", return_value=1000.0 + ttl + 1):
+            with self.assertNumQueries(1):
+                self.client.get(ME_URL)
+
+    @override_settings(TOKEN_AUTH_CACHE={"CACHE_ALIAS": "default"})
+    def test_shared_cache_serves_other_processes(self):
+        """
+        Test a token resolved once is served from the shared cache
+        when the local tier is empty (like in another worker process)
+        """
+        token_cache.clear()
+        self.client.get(ME_URL)
+
+        token_cache.clear()
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        # no user (password hash) is pickled into the shared tier
+        entry = token_cache.shared.get(token_cache.shared_key(self.token.key))
+        self.assertEqual(entry, (self.user.pk, self.token.created))
+        token_cache.shared.clear()
+
+    @override_settings(TOKEN_AUTH_CACHE={"CACHE_ALIAS": "default"})
+    def test_shared_cache_of_deactivated_user(self):
+        self.client.get(ME_URL)
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+        tokens.forget_user_state(self.user.pk)
+
+        token_cache.clear()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        token_cache.shared.clear()
+
+    def test_edited_applicant_is_invalidated(self):
+        """
+        Test saving a user subclass (own signal sender) drops the cache too
+        """
+        portal = Portal.objects.create(user=self.user, name="Naukri")
+        job_title = JobTitle.objects.create(
+            user=self.user,
+            title="Python Developer",
+            portal=portal,
+            job_description=JobDescription.objects.create(user=self.user),
+        )
+        applicant = Applicant.objects.create(
+            email="applicant@gmail.com", name="Applicant", applied_for=job_title
+        )
+        token = Token.objects.create(user_id=applicant.pk)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.client.get(ME_URL)
+
+        applicant.name = "Renamed"
+        applicant.save()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data["name"], "Renamed")
@@ -0,0 +1,190 @@
+"""
+Tests for stateless signed access & refresh tokens
+
+- HTTP POST - /api/user/token/          issues signed tokens when enabled
+- HTTP POST - /api/user/token/refresh/  exchanges refresh token for access token
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.shortcuts import reverse
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from user import tokens
+
+TOKEN_URL = reverse("token")
+REFRESH_URL = reverse("token-refresh")
+ME_URL = reverse("me")
+JOB_TITLE_URL = reverse("jobtitle:jobtitle-list")
+
+
+@override_settings(SIGNED_AUTH_TOKENS={"ENABLED": True, "ACCESS_TTL": 60})
+class TestSignedTokens(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.payload = {"email": "signed@gmail.com", "password": "signed@123"}
+        self.user = get_user_model().objects.create_user(**self.payload)
+
+    def obtain_tokens(self):
+        res = self.client.post(TOKEN_URL, self.payload)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def authenticate(self, access_token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+    def test_token_endpoint_issues_signed_tokens(self):
+        """
+        Test access & refresh tokens are returned when signed tokens are enabled
+        """
+        data = self.obtain_tokens()
+
+        self.assertIn("token", data)
+        self.assertIn("refresh", data)
+        self.assertEqual(data["expires_in"], 60)
+
+    @override_settings(SIGNED_AUTH_TOKENS={"ENABLED": False})
+    def test_token_endpoint_issues_db_token_when_disabled(self):
+        """
+        Test default behaviour is unchanged
+        """
+        data = self.obtain_tokens()
+
+        self.assertNotIn("refresh", data)
+        self.assertEqual(data["token"], self.user.auth_token.key)
+
+    @override_settings(RESPONSE_CACHE={"ENABLED": True})
+    def test_access_token_needs_no_auth_queries(self):
+        """
+        Test job list only runs its own query once revocation state is cached
+        """
+        self.authenticate(self.obtain_tokens()["token"])
+        self.client.get(JOB_TITLE_URL)
+
+        # The one query left is the version of the list (ETag, see
+        # job/conditional.py), the page itself comes from job/response_cache.py
+        with self.assertNumQueries(1):
+            res = self.client.get(JOB_TITLE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_user_fields_are_loaded(self):
+        """
+        Test views needing more than the user id see the real user
+        without querying it field by field
+        """
+        access_token = self.obtain_tokens()["token"]
+        self.authenticate(access_token)
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+        with self.assertNumQueries(0):
+            user = tokens.verify(access_token)
+            self.assertEqual(
+                (user.email, user.name, user.is_staff),
+                (self.user.email, self.user.name, False),
+            )
+        # the password hash isn't cached
+        self.assertEqual(user.get_deferred_fields(), {"password"})
+        self.assertNotIn("password", tokens.get_user_state(self.user.pk))
+
+    def test_payload_not_a_dict_is_invalid(self):
+        token = signing.dumps([1, 2], salt=tokens.ACCESS_SALT)
+
+        with self.assertRaisesMessage(tokens.InvalidToken, "Invalid token"):
+            tokens.decode(token, tokens.ACCESS_SALT)
+
+    def test_tampered_token_is_rejected(self):
+        access_token = self.obtain_tokens()["token"]
+        self.authenticate(access_token[:-2] + "xx")
+
+        res = self.client.get(JOB_TITLE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_token_is_not_an_access_token(self):
+        self.authenticate(self.obtain_tokens()["refresh"])
+
+        res = self.client.get(JOB_TITLE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_expired_token_is_rejected(self):
+        access_token = self.obtain_tokens()["token"]
+        self.authenticate(access_token)
+
+        with patch("user.tokens.time.time", return_value=10**12):
+            res = self.client.get(JOB_TITLE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_flow(self):
+        """
+        Test refresh token returns a new working access token
+        """
+        refresh_token = self.obtain_tokens()["refresh"]
+
+        res = self.client.post(REFRESH_URL, {"refresh": refresh_token})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.authenticate(res.data["token"])
+        res = self.client.get(JOB_TITLE_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @override_settings(SIGNED_AUTH_TOKENS={"ENABLED": False})
+    def test_refresh_not_found_when_disabled(self):
+        with override_settings(SIGNED_AUTH_TOKENS={"ENABLED": True}):
+            refresh_token = self.obtain_tokens()["refresh"]
+
+        res = self.client.post(REFRESH_URL, {"refresh": refresh_token})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("token", res.data)
+
+    def test_invalid_refresh_token(self):
+        res = self.client.post(REFRESH_URL, {"refresh": "not-a-token"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn("token", res.data)
+
+    def test_revoked_tokens_are_rejected(self):
+        """
+        Test bumping the revocation generation invalidates access & refresh tokens
+        """
+        data = self.obtain_tokens()
+        self.authenticate(data["token"])
+        self.client.get(JOB_TITLE_URL)
+
+        tokens.revoke_tokens(self.user)
+
+        res = self.client.get(JOB_TITLE_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        res = self.client.post(REFRESH_URL, {"refresh": data["refresh"]})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_password_change_revokes_tokens(self):
+        self.authenticate(self.obtain_tokens()["token"])
+
+        res = self.client.patch(ME_URL, {"password": "changed@123"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        self.authenticate(self.obtain_tokens()["token"])
+        self.client.get(JOB_TITLE_URL)
+
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(JOB_TITLE_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
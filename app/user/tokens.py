@@ -0,0 +1,194 @@
+"""
+Stateless HMAC-signed access & refresh tokens
+
+Alternative to DB-backed `rest_framework.authtoken` tokens, enabled with
+``SIGNED_AUTH_TOKENS["ENABLED"] = True``.
+
+A token is ``signing.dumps(payload)`` - base64 JSON + HMAC-SHA256 over it with
+SECRET_KEY - where payload carries
+    uid - user id
+    act - user.is_active when the token was issued
+    gen - user.auth_generation when the token was issued
+    exp - unix timestamp after which the token is rejected
+
+Verifying an access token needs no database query: signature & expiry are
+checked locally and the user's current row (generation, is_active & every
+other field views read) comes from the Django cache, all but the password
+hash which is never cached. Bumping `auth_generation` (``revoke_tokens``)
+revokes every token issued before.
+
+TODO - Refer
+https://docs.djangoproject.com/en/4.1/topics/signing/
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import caches
+from django.db import router
+from django.db.models import F
+
+ACCESS_SALT = "user.tokens.access"
+REFRESH_SALT = "user.tokens.refresh"
+# columns left out of the cached user state, loaded on access if ever needed
+SECRET_FIELDS = frozenset(["password"])
+
+
+class InvalidToken(Exception):
+    """
+    Token is malformed, tampered with, expired or revoked
+    """
+
+
+def get_config():
+    return {
+        "ENABLED": False,
+        "ACCESS_TTL": 5 * 60,
+        "REFRESH_TTL": 7 * 24 * 60 * 60,
+        "CACHE_ALIAS": "default",
+        "STATE_TTL": 30,
+        **getattr(settings, "SIGNED_AUTH_TOKENS", {}),
+    }
+
+
+def is_enabled():
+    return get_config()["ENABLED"]
+
+
+def _sign(user, salt, ttl):
+    payload = {
+        "uid": user.pk,
+        "act": user.is_active,
+        "gen": user.auth_generation,
+        "exp": int(time.time()) + ttl,
+    }
+    return signing.dumps(payload, salt=salt)
+
+
+def issue_tokens(user):
+    """
+    Returns response payload with fresh access & refresh tokens for `user`
+    `token` key is same as DB-token response so clients don't need to change
+    """
+    config = get_config()
+    return {
+        "token": _sign(user, ACCESS_SALT, config["ACCESS_TTL"]),
+        "refresh": _sign(user, REFRESH_SALT, config["REFRESH_TTL"]),
+        "expires_in": config["ACCESS_TTL"],
+    }
+
+
+def issue_access_token(user):
+    config = get_config()
+    return {
+        "token": _sign(user, ACCESS_SALT, config["ACCESS_TTL"]),
+        "expires_in": config["ACCESS_TTL"],
+    }
+
+
+def decode(token, salt):
+    """
+    Returns payload of a validly signed & not expired token
+    """
+    try:
+        payload = signing.loads(token, salt=salt)
+    except signing.BadSignature:
+        raise InvalidToken("Invalid token")
+
+    if not isinstance(payload, dict) or not isinstance(payload.get("exp"), int):
+        raise InvalidToken("Invalid token")
+    if payload["exp"] < time.time():
+        raise InvalidToken("Token has expired")
+    if not payload.get("act"):
+        raise InvalidToken("User inactive or deleted")
+    return payload
+
+
+def _state_key(user_id):
+    return f"auth-state:{user_id}"
+
+
+def _state_cache():
+    return caches[get_config()["CACHE_ALIAS"]]
+
+
+def _state_names():
+    return [
+        field.attname
+        for field in get_user_model()._meta.concrete_fields
+        if field.attname not in SECRET_FIELDS
+    ]
+
+
+def get_user_state(user_id):
+    """
+    Returns ``{attname: value}`` of the columns of the user's row but the
+    password hash
+
+    Read from the cache, only a cache miss costs one (primary key) query.
+    Returns None for a deleted user.
+    """
+    cache = _state_cache()
+    state = cache.get(_state_key(user_id))
+    if state is None:
+        state = (
+            get_user_model().objects.filter(pk=user_id).values(*_state_names()).first()
+        )
+        if state is None:
+            return None
+        cache.set(_state_key(user_id), state, get_config()["STATE_TTL"])
+    return state
+
+
+def remember_user_state(user):
+    """
+    Cache the state of a `user` just read from the database, unless cached
+    """
+    state = {name: getattr(user, name) for name in _state_names()}
+    _state_cache().add(_state_key(user.pk), state, get_config()["STATE_TTL"])
+
+
+def user_from_state(state):
+    """
+    User instance of a cached state, the password is loaded on access
+    """
+    User = get_user_model()
+    return User.from_db(router.db_for_read(User), list(state), list(state.values()))
+
+
+def forget_user_state(user_id):
+    """
+    Drop the cached row so the next check reads it from DB
+    """
+    _state_cache().delete(_state_key(user_id))
+
+
+def revoke_tokens(user):
+    """
+    Revoke every signed token issued to `user` so far
+    """
+    get_user_model().objects.filter(pk=user.pk).update(
+        auth_generation=F("auth_generation") + 1
+    )
+    user.refresh_from_db(fields=["auth_generation"])
+    forget_user_state(user.pk)
+
+
+def verify(token, salt=ACCESS_SALT):
+    """
+    Returns user of a valid, not revoked token
+
+    The user is built from the cached row (`get_user_state`) with every
+    field but the password loaded, reading one of them never costs a query.
+    """
+    payload = decode(token, salt)
+
+    state = get_user_state(payload["uid"])
+    if state is None or not state["is_active"]:
+        raise InvalidToken("User inactive or deleted")
+    if state["auth_generation"] != payload["gen"]:
+        raise InvalidToken("Token has been revoked")
+
+    return user_from_state(state)
@@ -4,6 +4,7 @@ URL mapping for user-API
 1) /api/user/           --> To get list of users
 2) /api/user/create/    --> To create new user
 3) /api/user/me/        --> To get description of the user
+4) /api/user/token/refresh/ --> To get new signed access token from refresh token
 """
 
 from django.urls import path
@@ -12,5 +13,6 @@ from . import views
 urlpatterns = [
     path("create/", views.CreateUserView.as_view(), name="create"),
     path("token/", views.CreateTokenView.as_view(), name="token"),
+    path("token/refresh/", views.RefreshTokenView.as_view(), name="token-refresh"),
     path("me/", views.ManageUserView.as_view(), name="me"),
 ]
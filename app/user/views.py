@@ -6,12 +6,15 @@ from rest_framework.generics import (
 from .serializers import (
     UserSerializer,
     AuthTokenSerializer,
+    RefreshTokenSerializer,
 )  # Custom serializers (ModelSerializers)
 from rest_framework.authtoken.views import ObtainAuthToken  # For TokenAuthentication
-from rest_framework import (
-    authentication,
-    permissions,
-)  # This is authentication for any specific view
+from rest_framework import permissions
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .authentication import CachedTokenAuthentication, SignedTokenAuthentication
+from . import tokens
 
 # Create your views here.
 
@@ -37,6 +40,35 @@ class CreateTokenView(ObtainAuthToken):
     # Over-riding serializer_class variable with our custom serializer
     serializer_class = AuthTokenSerializer
 
+    def post(self, request, *args, **kwargs):
+        """
+        Issue short-lived signed tokens instead of a DB token
+        when ``SIGNED_AUTH_TOKENS["ENABLED"]`` (see user/tokens.py)
+        """
+        if not tokens.is_enabled():
+            return super().post(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(tokens.issue_tokens(serializer.validated_data["user"]))
+
+
+class RefreshTokenView(APIView):
+    """
+    View to get a new signed access token for a valid refresh token
+    payload - ``{"refresh": "<refresh token>"}``
+    """
+
+    serializer_class = RefreshTokenSerializer
+
+    def post(self, request, *args, **kwargs):
+        if not tokens.is_enabled():
+            # DB tokens have nothing to refresh
+            raise NotFound()
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(tokens.issue_access_token(serializer.validated_data["user"]))
+
 
 class ManageUserView(RetrieveUpdateAPIView):
     """
@@ -57,7 +89,9 @@ class ManageUserView(RetrieveUpdateAPIView):
     # Here we are over-riding `authentication_classes` directive for which type of authentication we need
     # TODO - Refer
     # https://www.django-rest-framework.org/api-guide/authentication/#tokenauthentication
-    authentication_classes = [authentication.TokenAuthentication]
+    # CachedTokenAuthentication is TokenAuthentication without the per-request DB lookup
+    # SignedTokenAuthentication accepts stateless ``Bearer`` tokens
+    authentication_classes = [CachedTokenAuthentication, SignedTokenAuthentication]
 
     # Over-riding `permission_classes` directive for permission to authenticate the given
     # TODO - refer